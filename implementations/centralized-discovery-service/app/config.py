@@ -1,5 +1,7 @@
 # app/config.py
 
+from typing import List
+
 from pydantic_settings import BaseSettings
 
 
@@ -7,10 +9,75 @@ class Settings(BaseSettings):
     """Configuration settings for the application."""
 
     DATABASE_URL: str
+    # Comma separated read replica URLs used by the read-only endpoints
+    DATABASE_REPLICA_URLS: str = ""
+    # Seconds between health checks of a read replica
+    REPLICA_HEALTH_CHECK_INTERVAL: float = 10.0
     LOG_LEVEL: str = "INFO"
+    # Create missing tables on startup; prefer `python scripts/provision.py`
+    AUTO_PROVISION: bool = False
+    # Queries slower than this are logged with their parameters (0 disables)
+    SLOW_QUERY_THRESHOLD_MS: float = 500.0
+    # Discovery responses at least this large are gzip/brotli compressed
+    COMPRESSION_MIN_SIZE: int = 1024
+    # Maximum number of UIDs accepted by POST /api/intents/batch
+    BATCH_MAX_UIDS: int = 100
+    # Admission control for the search routes (0 disables the timeout/limit)
+    SEARCH_STATEMENT_TIMEOUT_MS: int = 2000
+    SEARCH_MAX_CONCURRENCY: int = 16
+    SEARCH_MAX_QUEUE: int = 64
+    SEARCH_QUEUE_TIMEOUT: float = 2.0
+    SEARCH_MAX_TERMS: int = 8
+    RATE_LIMIT_PER_SECOND: float = 20.0
+    RATE_LIMIT_BURST: int = 40
+    # Total intent IDs held by the natural language search cache (0 disables)
+    SEARCH_CACHE_MAX_IDS: int = 100000
+    # Directory for caches and the catalog revision shared by all workers on a
+    # host; empty keeps every cache private to its process
+    CACHE_DIR: str = ""
+    SHARED_CACHE_MAX_ENTRIES: int = 100000
+    # Seconds between reads of the catalog change log by the in-memory indexes
+    # when the catalog revision has not moved; bounds how long writes by other
+    # hosts (or by other workers without CACHE_DIR) take to show up
+    INDEX_SYNC_INTERVAL: float = 1.0
+    # Search index snapshot loaded at startup (see scripts/snapshot.py)
+    INDEX_SNAPSHOT_PATH: str = ""
+    # Seconds between writes of the intent popularity counters used to rank
+    # search results (0 disables counting)
+    POPULARITY_FLUSH_INTERVAL: float = 10.0
+    # Estimated Jaccard similarity from which intents count as near-duplicates
+    # (0 disables signing intents at ingest)
+    DEDUP_THRESHOLD: float = 0.8
+    # Key expected in the X-Admin-Key header of explained (explain=true)
+    # searches; empty disables explaining
+    ADMIN_API_KEY: str = ""
+    # Secret from which the key of every service pushing its agents.json to
+    # /api/services/push is derived; empty disables pushed registration
+    WEBHOOK_SECRET: str = ""
+    # Seconds pushes are coalesced per service before they are written
+    PUSH_BATCH_INTERVAL: float = 5.0
+    # Services with a pending push; further services get 503 until written
+    PUSH_QUEUE_MAX_SERVICES: int = 1000
+    # Largest accepted push body in bytes
+    PUSH_MAX_BYTES: int = 1048576
+    # Seconds a push timestamp may differ from the server clock
+    PUSH_MAX_SKEW: int = 300
+    # Fraction of their interval by which background task runs are spread
+    TASK_JITTER: float = 0.1
+    # Seconds running background tasks get to finish on shutdown
+    TASK_SHUTDOWN_TIMEOUT: float = 10.0
+    # Seconds between index snapshots written to INDEX_SNAPSHOT_PATH by one
+    # worker at a time (0 leaves snapshots to scripts/snapshot.py)
+    SNAPSHOT_INTERVAL: float = 0.0
 
     class Config:
         env_file = ".env"
 
+    @property
+    def replica_urls(self) -> List[str]:
+        """Return the configured read replica URLs."""
+        urls = self.DATABASE_REPLICA_URLS.split(",")
+        return [url.strip() for url in urls if url.strip()]
+
 
 settings = Settings()
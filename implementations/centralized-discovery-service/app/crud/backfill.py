@@ -0,0 +1,21 @@
+# app/crud/backfill.py
+
+from app.crud.document import backfill_intent_documents
+from app.crud.parameter import backfill_intent_parameters
+from app.crud.signature import backfill_intent_signatures
+from app.crud.terms import backfill_intent_terms
+from app.crud.version import backfill_intent_versions
+from sqlalchemy.orm import Session
+
+
+def backfill_read_models(db: Session):
+    """Fill the read models of intents written before their tables existed.
+
+    Each backfill only touches intents it has no row for, so this is cheap on
+    an up to date catalog.
+    """
+    backfill_intent_documents(db)
+    backfill_intent_parameters(db)
+    backfill_intent_versions(db)
+    backfill_intent_signatures(db)
+    backfill_intent_terms(db)
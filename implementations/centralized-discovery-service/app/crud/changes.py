@@ -0,0 +1,91 @@
+# app/crud/changes.py
+
+from typing import Iterator, Optional
+
+from app import models
+from app.crud.hooks import IntentSnapshot
+from app.utils.locks import advisory_lock_key
+from sqlalchemy import func, text
+from sqlalchemy.orm import Session
+
+
+def _to_json(snapshot: Optional[IntentSnapshot]) -> Optional[dict]:
+    if snapshot is None:
+        return None
+    data = snapshot._asdict()
+    data["tags"] = list(snapshot.tags)
+    return data
+
+
+def _from_json(data: Optional[dict]) -> Optional[IntentSnapshot]:
+    if data is None:
+        return None
+    return IntentSnapshot(**{**data, "tags": tuple(data["tags"])})
+
+
+def record_intent_change(
+    db: Session,
+    current: Optional[IntentSnapshot],
+    previous: Optional[IntentSnapshot] = None,
+) -> int:
+    """Append an intent change to the log in the current transaction.
+
+    Returns the revision of the change.
+    """
+    if db.get_bind().dialect.name == "postgresql":
+        # IDs come from a sequence, so two transactions could otherwise commit
+        # them out of order and an index that has read the later one would
+        # never read the earlier one. The lock is held until commit.
+        db.execute(
+            text("SELECT pg_advisory_xact_lock(:key)"),
+            {"key": advisory_lock_key("catalog_changes")},
+        )
+    intent_id = current.id if current is not None else previous.id
+    change = models.CatalogChange(
+        intent_id=intent_id,
+        previous=_to_json(previous),
+        current=_to_json(current),
+    )
+    db.add(change)
+    db.flush()
+    return change.id
+
+
+def latest_change_revision(db: Session) -> int:
+    """Return the revision of the most recent logged change, or 0."""
+    return db.query(func.max(models.CatalogChange.id)).scalar() or 0
+
+
+def oldest_change_revision(db: Session) -> int:
+    """Return the revision of the oldest logged change, or 0."""
+    return db.query(func.min(models.CatalogChange.id)).scalar() or 0
+
+
+def iter_changes_since(
+    db: Session, revision: int, batch_size: int = 1000
+) -> Iterator[tuple]:
+    """Yield ``(revision, current, previous)`` for changes after ``revision``."""
+    while True:
+        rows = (
+            db.query(models.CatalogChange)
+            .filter(models.CatalogChange.id > revision)
+            .order_by(models.CatalogChange.id)
+            .limit(batch_size)
+            .all()
+        )
+        if not rows:
+            return
+        for row in rows:
+            yield row.id, _from_json(row.current), _from_json(row.previous)
+        revision = rows[-1].id
+
+
+def prune_changes(db: Session, revision: int) -> int:
+    """Delete logged changes up to and including ``revision``."""
+    deleted = (
+        db.query(models.CatalogChange)
+        .filter(models.CatalogChange.id <= revision)
+        .delete(synchronize_session=False)
+    )
+    db.commit()
+    return deleted
@@ -0,0 +1,104 @@
+# app/crud/document.py
+
+import logging
+from typing import Dict, List, Optional, Tuple
+
+from app import models
+from app.utils.responses import dumps
+from app.utils.serialization import serialize_intent
+from sqlalchemy.orm import Session, selectinload
+
+logger = logging.getLogger(__name__)
+
+
+def _document_values(intent: models.Intent, service_name: str) -> dict:
+    return {
+        "intent_uid": intent.intent_uid,
+        "service_id": intent.service_id,
+        "service_name": service_name,
+        "tag_names": [tag.name for tag in intent.tags],
+        "document": dumps(serialize_intent(intent)).decode("utf-8"),
+    }
+
+
+def refresh_intent_document(db: Session, intent: models.Intent):
+    """Render ``intent`` into its read model row in the current transaction.
+
+    The intent must have been flushed so that it has an ID; the caller commits.
+    """
+    service_name = (
+        db.query(models.Service.name).filter_by(id=intent.service_id).scalar()
+    )
+    values = _document_values(intent, service_name)
+    document = db.get(models.IntentDocument, intent.id)
+    if document is None:
+        db.add(models.IntentDocument(intent_id=intent.id, **values))
+    else:
+        for key, value in values.items():
+            setattr(document, key, value)
+
+
+def get_intent_document_entry(
+    db: Session, intent_uid: str
+) -> Optional[Tuple[int, str]]:
+    """Return the intent ID and rendered JSON document of an intent, if any."""
+    return (
+        db.query(models.IntentDocument.intent_id, models.IntentDocument.document)
+        .filter(models.IntentDocument.intent_uid == intent_uid)
+        .first()
+    )
+
+
+def get_intent_document(db: Session, intent_uid: str) -> Optional[str]:
+    """Return the rendered JSON document of an intent, if there is one."""
+    entry = get_intent_document_entry(db, intent_uid)
+    return entry[1] if entry is not None else None
+
+
+def get_intent_documents_by_uids(db: Session, intent_uids: List[str]) -> Dict[str, str]:
+    """Return the rendered JSON documents of ``intent_uids`` keyed by UID."""
+    rows = db.query(
+        models.IntentDocument.intent_uid, models.IntentDocument.document
+    ).filter(models.IntentDocument.intent_uid.in_(intent_uids))
+    return dict(rows)
+
+
+def backfill_intent_documents(db: Session, batch_size: int = 500) -> int:
+    """Render documents for intents that do not have one yet.
+
+    Used after provisioning to populate the read model for existing catalogs.
+    Returns the number of documents written.
+    """
+    written = 0
+    while True:
+        intents = (
+            db.query(models.Intent)
+            .outerjoin(
+                models.IntentDocument,
+                models.IntentDocument.intent_id == models.Intent.id,
+            )
+            .filter(models.IntentDocument.intent_id.is_(None))
+            .options(selectinload(models.Intent.tags))
+            .order_by(models.Intent.id)
+            .limit(batch_size)
+            .all()
+        )
+        if not intents:
+            break
+        service_names = dict(
+            db.query(models.Service.id, models.Service.name).filter(
+                models.Service.id.in_({intent.service_id for intent in intents})
+            )
+        )
+        db.add_all(
+            models.IntentDocument(
+                intent_id=intent.id,
+                **_document_values(intent, service_names[intent.service_id]),
+            )
+            for intent in intents
+        )
+        db.commit()
+        written += len(intents)
+    if written:
+        logger.info(f"Backfilled {written} intent documents")
+    return written
@@ -0,0 +1,130 @@
+# app/crud/hooks.py
+
+import logging
+import os
+from typing import List, NamedTuple, Optional, Tuple
+
+from app.config import settings
+from app.utils.cache import SharedCounter
+
+logger = logging.getLogger(__name__)
+
+
+class IntentSnapshot(NamedTuple):
+    """Indexable state of an intent at the time of a change."""
+
+    id: int
+    service_id: int
+    intent_uid: str
+    intent_name: str
+    description: Optional[str]
+    tags: Tuple[str, ...]
+
+
+class IntentListener:
+    """Receives intent changes committed through the CRUD layer.
+
+    In-memory indexes subclass this and register themselves with
+    ``register_listener``. ``previous`` is the state before an update, or
+    ``None`` for a newly created intent. ``revision`` is the ID of the
+    change in ``catalog_changes``.
+    """
+
+    def intent_saved(
+        self,
+        intent: IntentSnapshot,
+        previous: Optional[IntentSnapshot],
+        revision: Optional[int] = None,
+    ) -> None:
+        """Handle a created or updated intent."""
+
+    def intent_deleted(
+        self, intent: IntentSnapshot, revision: Optional[int] = None
+    ) -> None:
+        """Handle a deleted intent."""
+
+
+_listeners: List[IntentListener] = []
+
+# Incremented on every committed intent change. With CACHE_DIR set the
+# revision lives in a memory-mapped file shared by all processes on the host,
+# so a write in one worker or the crawler expires the query caches and makes
+# the in-memory indexes read the change log on their next lookup everywhere.
+# Without it other processes' writes reach the indexes within
+# INDEX_SYNC_INTERVAL seconds (see CatalogIndex.ensure_ready).
+_revision = 0
+_shared_revision = (
+    SharedCounter(os.path.join(settings.CACHE_DIR, "catalog.revision"))
+    if settings.CACHE_DIR
+    else None
+)
+
+
+def snapshot_intent(intent) -> IntentSnapshot:
+    """Capture the indexable state of an intent row."""
+    return IntentSnapshot(
+        id=intent.id,
+        service_id=intent.service_id,
+        intent_uid=intent.intent_uid,
+        intent_name=intent.intent_name,
+        description=intent.description,
+        tags=tuple(tag.name for tag in intent.tags),
+    )
+
+
+def register_listener(listener: IntentListener):
+    """Subscribe ``listener`` to intent changes."""
+    if listener not in _listeners:
+        _listeners.append(listener)
+
+
+def unregister_listener(listener: IntentListener):
+    """Unsubscribe ``listener`` from intent changes."""
+    if listener in _listeners:
+        _listeners.remove(listener)
+
+
+def catalog_revision() -> int:
+    """Return the current catalog revision.
+
+    The revision changes whenever an intent is saved or deleted, so caches of
+    derived results can compare it to detect that they are stale.
+    """
+    if _shared_revision is not None:
+        return _shared_revision.value
+    return _revision
+
+
+def _bump_revision():
+    global _revision
+    _revision += 1
+    if _shared_revision is not None:
+        _shared_revision.increment()
+
+
+def notify_intent_saved(
+    intent,
+    previous: Optional[IntentSnapshot] = None,
+    revision: Optional[int] = None,
+):
+    """Tell listeners that ``intent`` was created or updated and committed.
+
+    ``revision`` is the ID returned by ``record_intent_change``.
+    """
+    _bump_revision()
+    snapshot = snapshot_intent(intent)
+    for listener in list(_listeners):
+        try:
+            listener.intent_saved(snapshot, previous, revision)
+        except Exception as e:
+            logger.error(f"Intent listener {listener!r} failed: {e}")
+
+
+def notify_intent_deleted(snapshot: IntentSnapshot, revision: Optional[int] = None):
+    """Tell listeners that the intent captured in ``snapshot`` was deleted."""
+    _bump_revision()
+    for listener in list(_listeners):
+        try:
+            listener.intent_deleted(snapshot, revision)
+        except Exception as e:
+            logger.error(f"Intent listener {listener!r} failed: {e}")
@@ -1,14 +1,51 @@
 # app/crud/intent.py
 
 import logging
+from typing import List, Optional, Tuple
 
 from app import models, schemas
+from app.crud.changes import record_intent_change
+from app.crud.document import refresh_intent_document
+from app.crud.hooks import (
+    IntentSnapshot,
+    notify_intent_deleted,
+    notify_intent_saved,
+    snapshot_intent,
+)
+from app.crud.parameter import (
+    INPUT,
+    OUTPUT,
+    parameter_filter,
+    refresh_intent_parameters,
+)
+from app.crud.signature import (
+    canonical_filter,
+    delete_intent_signatures,
+    refresh_intent_signature,
+)
+from app.crud.terms import refresh_intent_terms
+from app.crud.version import refresh_intent_version
+from app.utils.profiling import phase
+from app.utils.serialization import INTENT_FIELDS
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, load_only, selectinload
 
 logger = logging.getLogger(__name__)
 
 
+def intent_load_options(fields: Tuple[str, ...] = INTENT_FIELDS) -> list:
+    """Return loader options that fetch only the columns in ``fields``.
+
+    Unrequested columns are deferred and tags are eager loaded in one extra
+    query only when requested, so neither is fetched for sparse fieldsets.
+    """
+    columns = [getattr(models.Intent, f) for f in fields if f != "tags"]
+    options = [load_only(*(columns or [models.Intent.id]))]
+    if "tags" in fields:
+        options.append(selectinload(models.Intent.tags))
+    return options
+
+
 def get_intent_by_uid(db: Session, intent_uid: str):
     """Retrieve an intent by its unique identifier."""
     return (
@@ -16,6 +53,35 @@ def get_intent_by_uid(db: Session, intent_uid: str):
     )
 
 
+def get_intents_by_uids(
+    db: Session, intent_uids: List[str], fields: Tuple[str, ...] = INTENT_FIELDS
+):
+    """Retrieve the intents matching any of ``intent_uids`` in one query."""
+    return (
+        db.query(models.Intent)
+        .options(*intent_load_options(fields))
+        .filter(models.Intent.intent_uid.in_(intent_uids))
+        .all()
+    )
+
+
+def get_intents_by_ids(
+    db: Session, intent_ids: List[int], fields: Tuple[str, ...] = INTENT_FIELDS
+):
+    """Retrieve the intents with ``intent_ids`` in one query, in that order."""
+    if not intent_ids:
+        return []
+    with phase("fetch"):
+        intents = (
+            db.query(models.Intent)
+            .options(*intent_load_options(fields))
+            .filter(models.Intent.id.in_(intent_ids))
+            .all()
+        )
+    by_id = {intent.id: intent for intent in intents}
+    return [by_id[i] for i in intent_ids if i in by_id]
+
+
 def get_intents_by_filters(
     db: Session,
     intent_name: str = None,
@@ -24,89 +90,201 @@ def get_intents_by_filters(
     tags: list = None,
     skip: int = 0,
     limit: int = 10,
+    fields: Tuple[str, ...] = INTENT_FIELDS,
+    tags_all: list = None,
+    input_param: str = None,
+    input_type: str = None,
+    output_param: str = None,
+    output_type: str = None,
+    collapse: bool = False,
 ):
-    """Retrieve intents based on filters."""
-    query = db.query(models.Intent)
-    if intent_name:
-        query = query.filter(models.Intent.intent_name.ilike(f"%{intent_name}%"))
-    if uid:
-        query = query.filter(models.Intent.intent_uid == uid)
-    if description:
-        query = query.filter(models.Intent.description.ilike(f"%{description}%"))
-    if tags:
-        query = query.join(models.Intent.tags).filter(models.Tag.name.in_(tags))
-    return query.offset(skip).limit(limit).all()
+    """Retrieve intents based on filters, loading only the requested fields.
 
+    ``tags`` matches intents with any of the tags and ``tags_all`` intents
+    with every one of them; each intent is returned once. ``input_param`` and
+    ``input_type`` match the name and type of one input parameter, and
+    ``output_param`` and ``output_type`` those of one output parameter.
+    ``collapse`` keeps one intent per near-duplicate cluster.
+    """
+    with phase("build"):
+        query = db.query(models.Intent).options(*intent_load_options(fields))
+        if intent_name:
+            query = query.filter(models.Intent.intent_name.ilike(f"%{intent_name}%"))
+        if uid:
+            query = query.filter(models.Intent.intent_uid == uid)
+        if description:
+            query = query.filter(models.Intent.description.ilike(f"%{description}%"))
+        if tags:
+            query = query.filter(models.Intent.tags.any(models.Tag.name.in_(tags)))
+        for tag in tags_all or []:
+            query = query.filter(models.Intent.tags.any(models.Tag.name == tag))
+        if input_param or input_type:
+            query = query.filter(parameter_filter(INPUT, input_param, input_type))
+        if output_param or output_type:
+            query = query.filter(parameter_filter(OUTPUT, output_param, output_type))
+        if collapse:
+            query = query.filter(canonical_filter())
+        query = query.order_by(models.Intent.id).offset(skip).limit(limit)
+    with phase("fetch"):
+        return query.all()
 
-def create_intent(db: Session, intent_data: schemas.IntentCreate, service_id: int):
-    """Create a new intent associated with a service."""
+
+def _get_or_create_tags(db: Session, tag_items) -> List[models.Tag]:
+    """Return tag rows for names or tag objects, creating missing ones."""
+    tags = []
+    for tag_item in tag_items:
+        # Handle both string tags and TagCreate objects
+        if isinstance(tag_item, str):
+            tag_name = tag_item
+        else:
+            tag_name = tag_item.name
+
+        # Check if the tag already exists
+        tag = db.query(models.Tag).filter_by(name=tag_name).first()
+        if not tag:
+            tag = models.Tag(name=tag_name)
+            db.add(tag)
+            db.flush()  # To get the tag ID
+        tags.append(tag)
+    return tags
+
+
+def _refresh_read_models(db: Session, intent: models.Intent):
+    """Bring the read models of a flushed intent up to date; the caller commits."""
+    refresh_intent_document(db, intent)
+    refresh_intent_parameters(db, intent)
+    refresh_intent_terms(db, intent)
+    refresh_intent_signature(db, intent)
+
+
+def _add_intent(db: Session, intent_data: schemas.IntentCreate, service_id: int):
+    """Add and index a new intent without committing; returns it and its revision."""
     db_intent = models.Intent(
         service_id=service_id,
         intent_uid=intent_data.intent_uid,
         intent_name=intent_data.intent_name,
         description=intent_data.description,
-        input_parameters=intent_data.input_parameters,
-        output_parameters=intent_data.output_parameters,
+        input_parameters=[p.model_dump() for p in intent_data.input_parameters],
+        output_parameters=[p.model_dump() for p in intent_data.output_parameters],
         endpoint=intent_data.endpoint,
     )
     # Handle tags
     if intent_data.tags:
-        tags = []
-        for tag_item in intent_data.tags:
-            # Handle both string tags and TagCreate objects
-            if isinstance(tag_item, str):
-                tag_name = tag_item
-            else:
-                tag_name = tag_item.name
-
-            # Check if the tag already exists
-            tag = db.query(models.Tag).filter_by(name=tag_name).first()
-            if not tag:
-                tag = models.Tag(name=tag_name)
-                db.add(tag)
-                db.flush()  # To get the tag ID
-            tags.append(tag)
-        db_intent.tags = tags
+        db_intent.tags = _get_or_create_tags(db, intent_data.tags)
+    db.add(db_intent)
+    db.flush()
+    _refresh_read_models(db, db_intent)
+    # Only on creation: updates keep the UID the version is parsed from
+    refresh_intent_version(db, db_intent)
+    return db_intent, record_intent_change(db, snapshot_intent(db_intent))
+
+
+def create_intent(db: Session, intent_data: schemas.IntentCreate, service_id: int):
+    """Create a new intent associated with a service."""
     try:
-        db.add(db_intent)
+        db_intent, revision = _add_intent(db, intent_data, service_id)
         db.commit()
         db.refresh(db_intent)
     except IntegrityError as e:
         db.rollback()
         logger.error(f"Integrity error creating intent: {e}")
         raise
+    notify_intent_saved(db_intent, revision=revision)
     return db_intent
 
 
 def update_intent(db: Session, intent: models.Intent, updates: schemas.IntentUpdate):
     """Update an existing intent."""
+    previous = snapshot_intent(intent)
     for key, value in updates.dict(exclude_unset=True).items():
         if key == "tags" and value is not None:
             # Update tags
-            tags = []
-            for tag_item in value:
-                # Handle both string tags and Tag objects
-                if isinstance(tag_item, str):
-                    tag_name = tag_item
-                else:
-                    tag_name = tag_item.name
-
-                tag = db.query(models.Tag).filter(models.Tag.name == tag_name).first()
-                if not tag:
-                    tag = models.Tag(name=tag_name)
-                    db.add(tag)
-                    db.commit()
-                    db.refresh(tag)
-                tags.append(tag)
-            intent.tags = tags
+            intent.tags = _get_or_create_tags(db, value)
         else:
             setattr(intent, key, value)
+    db.flush()
+    _refresh_read_models(db, intent)
+    revision = record_intent_change(db, snapshot_intent(intent), previous)
     db.commit()
     db.refresh(intent)
+    notify_intent_saved(intent, previous, revision)
     return intent
 
 
+def _replace_intent(
+    db: Session,
+    intent: models.Intent,
+    intent_data: schemas.IntentCreate,
+    service_id: int,
+):
+    """Overwrite and reindex an intent without committing.
+
+    Returns its snapshot from before the change and the change's revision.
+    """
+    previous = snapshot_intent(intent)
+    intent.service_id = service_id
+    intent.intent_name = intent_data.intent_name
+    intent.description = intent_data.description
+    intent.input_parameters = [p.model_dump() for p in intent_data.input_parameters]
+    intent.output_parameters = [p.model_dump() for p in intent_data.output_parameters]
+    intent.endpoint = intent_data.endpoint
+    intent.tags = _get_or_create_tags(db, intent_data.tags or [])
+    db.flush()
+    _refresh_read_models(db, intent)
+    return previous, record_intent_change(db, snapshot_intent(intent), previous)
+
+
+def upsert_intent(db: Session, intent_data: schemas.IntentCreate, service_id: int):
+    """Create an intent or bring an existing one with the same UID up to date."""
+    return upsert_intents(db, [intent_data], service_id)[0]
+
+
+def stage_intents(
+    db: Session, intents: List[schemas.IntentCreate], service_id: int
+) -> List[Tuple[models.Intent, Optional[IntentSnapshot], int]]:
+    """Create or update the intents of a service without committing.
+
+    Returns each intent with its snapshot from before the change (``None``
+    when created) and the change's revision, to notify once committed.
+    """
+    staged = []
+    for intent_data in intents:
+        intent = get_intent_by_uid(db, intent_data.intent_uid)
+        if intent is None:
+            intent, revision = _add_intent(db, intent_data, service_id)
+            previous = None
+        else:
+            previous, revision = _replace_intent(db, intent, intent_data, service_id)
+        staged.append((intent, previous, revision))
+    return staged
+
+
+def upsert_intents(
+    db: Session, intents: List[schemas.IntentCreate], service_id: int
+) -> List[models.Intent]:
+    """Create or update the intents of a service in one transaction.
+
+    Re-adding an intent refreshes it instead of failing on the unique UID,
+    and the intents are written either all or not at all.
+    """
+    try:
+        staged = stage_intents(db, intents, service_id)
+        db.commit()
+    except IntegrityError as e:
+        db.rollback()
+        logger.error(f"Integrity error upserting intents: {e}")
+        raise
+    for intent, previous, revision in staged:
+        notify_intent_saved(intent, previous, revision)
+    return [intent for intent, _, _ in staged]
+
+
 def delete_intent(db: Session, intent: models.Intent):
-    """Delete an intent."""
+    """Delete an intent; ``ON DELETE CASCADE`` removes its read model rows."""
+    snapshot = snapshot_intent(intent)
+    # Hands its cluster over first; cascading would delete every member
+    delete_intent_signatures(db, [intent.id])
+    revision = record_intent_change(db, None, snapshot)
     db.delete(intent)
     db.commit()
+    notify_intent_deleted(snapshot, revision)
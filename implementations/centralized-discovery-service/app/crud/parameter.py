@@ -0,0 +1,112 @@
+# app/crud/parameter.py
+
+import logging
+from typing import Iterable, Optional
+
+from app import models
+from sqlalchemy import exists
+from sqlalchemy.orm import Session, load_only
+
+logger = logging.getLogger(__name__)
+
+INPUT = "input"
+OUTPUT = "output"
+
+
+def _parameter_rows(intent: models.Intent) -> list:
+    rows = []
+    for direction, parameters in (
+        (INPUT, intent.input_parameters),
+        (OUTPUT, intent.output_parameters),
+    ):
+        for parameter in parameters or []:
+            name = parameter.get("name")
+            if not name:
+                continue
+            parameter_type = parameter.get("type")
+            rows.append(
+                models.IntentParameter(
+                    intent_id=intent.id,
+                    direction=direction,
+                    name=name.lower(),
+                    type=parameter_type.lower() if parameter_type else None,
+                    required=parameter.get("required"),
+                )
+            )
+    return rows
+
+
+def refresh_intent_parameters(db: Session, intent: models.Intent):
+    """Replace the indexed parameters of a flushed intent; the caller commits."""
+    delete_intent_parameters(db, [intent.id])
+    db.add_all(_parameter_rows(intent))
+
+
+def delete_intent_parameters(db: Session, intent_ids: Iterable[int]):
+    """Delete the indexed parameters of ``intent_ids``; the caller commits."""
+    intent_ids = list(intent_ids)
+    if intent_ids:
+        db.query(models.IntentParameter).filter(
+            models.IntentParameter.intent_id.in_(intent_ids)
+        ).delete(synchronize_session=False)
+
+
+def parameter_filter(
+    direction: str, name: Optional[str] = None, type_: Optional[str] = None
+):
+    """Return a filter for intents with a parameter matching ``name`` and ``type_``.
+
+    Both are matched case-insensitively against the same parameter.
+    """
+    conditions = [
+        models.IntentParameter.intent_id == models.Intent.id,
+        models.IntentParameter.direction == direction,
+    ]
+    if name:
+        conditions.append(models.IntentParameter.name == name.lower())
+    if type_:
+        conditions.append(models.IntentParameter.type == type_.lower())
+    return exists().where(*conditions)
+
+
+def backfill_intent_parameters(db: Session, batch_size: int = 500) -> int:
+    """Index the parameters of intents that have none indexed yet.
+
+    Scans the intents in ID order; used after provisioning for existing
+    catalogs. Returns the number of intents indexed.
+    """
+    indexed = 0
+    last_id = 0
+    while True:
+        intents = (
+            db.query(models.Intent)
+            .options(
+                load_only(
+                    models.Intent.id,
+                    models.Intent.input_parameters,
+                    models.Intent.output_parameters,
+                )
+            )
+            .filter(models.Intent.id > last_id)
+            .order_by(models.Intent.id)
+            .limit(batch_size)
+            .all()
+        )
+        if not intents:
+            break
+        last_id = intents[-1].id
+        done = {
+            intent_id
+            for (intent_id,) in db.query(models.IntentParameter.intent_id)
+            .filter(models.IntentParameter.intent_id.in_([i.id for i in intents]))
+            .distinct()
+        }
+        for intent in intents:
+            rows = _parameter_rows(intent) if intent.id not in done else []
+            if rows:
+                db.add_all(rows)
+                indexed += 1
+        db.commit()
+    if indexed:
+        logger.info(f"Indexed the parameters of {indexed} intents")
+    return indexed
@@ -1,8 +1,15 @@
 # app/crud/service.py
 
 import logging
+from typing import Dict, List, Optional, Tuple
 
 from app import models, schemas
+from app.crud.changes import record_intent_change
+from app.crud.hooks import notify_intent_deleted, notify_intent_saved, snapshot_intent
+from app.crud.intent import stage_intents
+from app.crud.signature import delete_intent_signatures
+from app.models.intent import intent_tags
+from sqlalchemy import func
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
@@ -14,8 +21,53 @@ def get_service_by_name(db: Session, name: str):
     return db.query(models.Service).filter(models.Service.name == name).first()
 
 
-def create_service(db: Session, service_info: schemas.ServiceCreate):
-    """Create a new service."""
+def list_services(
+    db: Session, after_id: Optional[int] = None, limit: int = 20, top_tags: int = 5
+) -> List[Tuple[models.Service, int, List[Tuple[str, int]]]]:
+    """Return a page of services with their intent count and most used tags.
+
+    Pages are keyed on ``Service.id``: pass the last ID of a page as
+    ``after_id`` to get the next one, which stays an index range scan however
+    deep the page is. Intent counts come from one grouped query and the tag
+    summaries of the whole page from a second one, both looking the page's
+    intents up through the ``intents.service_id`` index.
+    """
+    query = (
+        db.query(models.Service, func.count(models.Intent.id))
+        .outerjoin(models.Intent, models.Intent.service_id == models.Service.id)
+        .group_by(models.Service.id)
+        .order_by(models.Service.id)
+    )
+    if after_id is not None:
+        query = query.filter(models.Service.id > after_id)
+    rows = query.limit(limit).all()
+    if not rows:
+        return []
+
+    tag_counts: Dict[int, List[Tuple[str, int]]] = {}
+    tag_rows = (
+        db.query(models.Intent.service_id, models.Tag.name, func.count())
+        .join(intent_tags, intent_tags.c.intent_id == models.Intent.id)
+        .join(models.Tag, models.Tag.id == intent_tags.c.tag_id)
+        .filter(models.Intent.service_id.in_([service.id for service, _ in rows]))
+        .group_by(models.Intent.service_id, models.Tag.name)
+    )
+    for service_id, name, count in tag_rows:
+        tag_counts.setdefault(service_id, []).append((name, count))
+    return [
+        (
+            service,
+            intent_count,
+            sorted(tag_counts.get(service.id, []), key=lambda t: (-t[1], t[0]))[
+                :top_tags
+            ],
+        )
+        for service, intent_count in rows
+    ]
+
+
+def _add_service(db: Session, service_info: schemas.ServiceCreate):
+    """Add a new service without committing."""
     db_service = models.Service(
         name=service_info.name,
         description=service_info.description,
@@ -24,8 +76,24 @@ def create_service(db: Session, service_info: schemas.ServiceCreate):
         service_terms_of_service_url=service_info.service_terms_of_service_url,
         service_privacy_policy_url=service_info.service_privacy_policy_url,
     )
+    db.add(db_service)
+    db.flush()
+    return db_service
+
+
+def _apply_service_updates(
+    service: models.Service, updates: schemas.ServiceUpdate
+) -> models.Service:
+    """Set the given fields of a service without committing."""
+    for key, value in updates.dict(exclude_unset=True).items():
+        setattr(service, key, value)
+    return service
+
+
+def create_service(db: Session, service_info: schemas.ServiceCreate):
+    """Create a new service."""
     try:
-        db.add(db_service)
+        db_service = _add_service(db, service_info)
         db.commit()
         db.refresh(db_service)
     except IntegrityError as e:
@@ -39,14 +107,52 @@ def update_service(
     db: Session, service: models.Service, updates: schemas.ServiceUpdate
 ):
     """Update an existing service."""
-    for key, value in updates.dict(exclude_unset=True).items():
-        setattr(service, key, value)
+    _apply_service_updates(service, updates)
     db.commit()
     db.refresh(service)
     return service
 
 
+def upsert_service(
+    db: Session,
+    service_info: schemas.ServiceCreate,
+    intents: List[schemas.IntentCreate],
+) -> models.Service:
+    """Create or update a service and its intents in one transaction.
+
+    Used by the crawler and pushed registrations, so that an agents.json is
+    written either whole or not at all: a failing intent leaves neither a new
+    service nor updated service info behind.
+    """
+    try:
+        service = get_service_by_name(db, service_info.name)
+        if service is None:
+            service = _add_service(db, service_info)
+        else:
+            updates = schemas.ServiceUpdate(**service_info.model_dump(exclude={"name"}))
+            _apply_service_updates(service, updates)
+        staged = stage_intents(db, intents, service.id)
+        db.commit()
+    except IntegrityError as e:
+        db.rollback()
+        logger.error(f"Integrity error upserting service: {e}")
+        raise
+    for intent, previous, revision in staged:
+        notify_intent_saved(intent, previous, revision)
+    return service
+
+
 def delete_service(db: Session, service: models.Service):
-    """Delete a service and its associated intents."""
+    """Delete a service and its associated intents.
+
+    The read model rows of the intents go with them through ``ON DELETE
+    CASCADE``.
+    """
+    snapshots = [snapshot_intent(intent) for intent in service.intents]
+    # Hands their clusters over first; cascading would delete every member
+    delete_intent_signatures(db, [snapshot.id for snapshot in snapshots])
+    revisions = [record_intent_change(db, None, snapshot) for snapshot in snapshots]
     db.delete(service)
     db.commit()
+    for snapshot, revision in zip(snapshots, revisions):
+        notify_intent_deleted(snapshot, revision)
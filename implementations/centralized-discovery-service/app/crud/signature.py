@@ -0,0 +1,257 @@
+# app/crud/signature.py
+
+import logging
+from collections import Counter
+from typing import Iterable, List, Optional
+
+from app import models
+from app.config import settings
+from app.utils.minhash import BANDS, band_keys, intent_shingles, minhash, similarity
+from sqlalchemy import and_, bindparam, exists, or_, select
+from sqlalchemy.orm import Session, load_only
+
+logger = logging.getLogger(__name__)
+
+# Candidates verified per intent, those sharing the most LSH bands first
+MAX_CANDIDATES = 50
+# Band rows read per lookup, however crowded the intent's buckets are
+MAX_BAND_ROWS = 1000
+
+_bands = models.intent_signature_bands.c
+# Built once: one (band, bucket) index search per band. SQLite scans the whole
+# table for the equivalent row-value IN.
+_CANDIDATE_BANDS = (
+    select(_bands.intent_id)
+    .where(
+        or_(
+            *(
+                and_(_bands.band == band, _bands.bucket == bindparam(f"bucket{band}"))
+                for band in range(BANDS)
+            )
+        ),
+        _bands.intent_id != bindparam("intent_id"),
+    )
+    .limit(MAX_BAND_ROWS)
+)
+
+
+def _intent_signature(intent: models.Intent) -> Optional[bytes]:
+    parameter_names = [
+        parameter.get("name") or ""
+        for parameter in (intent.input_parameters or [])
+        + (intent.output_parameters or [])
+    ]
+    return minhash(
+        intent_shingles(intent.intent_name, intent.description, parameter_names)
+    )
+
+
+def _find_cluster(
+    db: Session, intent_id: int, signature: bytes, keys: List[int]
+) -> int:
+    """Return the cluster of the most similar earlier canonical intent, if any.
+
+    Only canonical intents have LSH bands, so a bucket holds one intent per
+    cluster rather than every duplicate, and at most ``MAX_BAND_ROWS`` band
+    rows are read.
+    """
+    params = {f"bucket{band}": key for band, key in enumerate(keys)}
+    rows = db.execute(_CANDIDATE_BANDS, {"intent_id": intent_id, **params})
+    shared = Counter(rows.scalars())
+    if not shared:
+        return intent_id
+    candidates = sorted(shared, key=lambda candidate: (-shared[candidate], candidate))
+    rows = (
+        db.query(
+            models.IntentSignature.cluster_id, models.IntentSignature.signature
+        ).filter(models.IntentSignature.intent_id.in_(candidates[:MAX_CANDIDATES]))
+        # The earliest of equally similar candidates wins
+        .order_by(models.IntentSignature.intent_id)
+    )
+    best, best_score = intent_id, None
+    for row in rows:
+        score = similarity(signature, row.signature)
+        if score >= settings.DEDUP_THRESHOLD and (
+            best_score is None or score > best_score
+        ):
+            best, best_score = row.cluster_id, score
+    return best
+
+
+def _fits_cluster(
+    db: Session, intent_id: int, cluster_id: int, signature: bytes
+) -> bool:
+    """Return whether ``signature`` is similar to another intent of the cluster."""
+    signatures = models.IntentSignature
+    others = (
+        db.query(signatures.signature)
+        .filter(signatures.cluster_id == cluster_id, signatures.intent_id != intent_id)
+        .order_by(signatures.intent_id)
+        .limit(MAX_CANDIDATES)
+    )
+    return any(
+        similarity(signature, other) >= settings.DEDUP_THRESHOLD for (other,) in others
+    )
+
+
+def _insert_bands(db: Session, intent_id: int, keys: List[int]):
+    db.execute(
+        models.intent_signature_bands.insert(),
+        [
+            {"intent_id": intent_id, "band": band, "bucket": key}
+            for band, key in enumerate(keys)
+        ],
+    )
+
+
+def refresh_intent_signature(db: Session, intent: models.Intent):
+    """Sign a flushed intent and assign it to a near-duplicate cluster.
+
+    An intent whose signature did not change is left alone, and one still
+    similar to another intent of its cluster stays in it, so re-ingesting a
+    service does not reshuffle clusters or their canonical intents. The
+    caller commits. Does nothing when deduplication is disabled.
+    """
+    if settings.DEDUP_THRESHOLD <= 0:
+        return
+    signatures = models.IntentSignature
+    signature = _intent_signature(intent)
+    existing = (
+        db.query(signatures.cluster_id, signatures.signature)
+        .filter(signatures.intent_id == intent.id)
+        .first()
+    )
+    if existing is not None and signature is not None:
+        if signature == existing.signature:
+            return
+        if _fits_cluster(db, intent.id, existing.cluster_id, signature):
+            db.query(signatures).filter(signatures.intent_id == intent.id).update(
+                {"signature": signature}, synchronize_session=False
+            )
+            if existing.cluster_id == intent.id:
+                db.execute(
+                    models.intent_signature_bands.delete().where(
+                        models.intent_signature_bands.c.intent_id == intent.id
+                    )
+                )
+                _insert_bands(db, intent.id, band_keys(signature))
+            return
+    if existing is not None:
+        delete_intent_signatures(db, [intent.id])
+    else:
+        # Bands left over by a signature deleted on its own
+        db.execute(
+            models.intent_signature_bands.delete().where(
+                models.intent_signature_bands.c.intent_id == intent.id
+            )
+        )
+    if signature is None:
+        return
+    keys = band_keys(signature)
+    cluster_id = _find_cluster(db, intent.id, signature, keys)
+    db.add(signatures(intent_id=intent.id, cluster_id=cluster_id, signature=signature))
+    if cluster_id == intent.id:
+        _insert_bands(db, intent.id, keys)
+
+
+def delete_intent_signatures(db: Session, intent_ids: Iterable[int]):
+    """Delete the signatures of ``intent_ids``; the caller commits.
+
+    Clusters whose canonical intent is among them are handed over to their
+    lowest remaining member, which gets the LSH bands, so every cluster keeps
+    an existing canonical.
+    """
+    intent_ids = list(intent_ids)
+    if not intent_ids:
+        return
+    signatures = models.IntentSignature
+    canonical = [
+        cluster_id
+        for (cluster_id,) in db.query(signatures.intent_id).filter(
+            signatures.intent_id.in_(intent_ids),
+            signatures.cluster_id == signatures.intent_id,
+        )
+    ]
+    for cluster_id in canonical:
+        members = db.query(signatures).filter(
+            signatures.cluster_id == cluster_id,
+            signatures.intent_id.notin_(intent_ids),
+        )
+        successor = (
+            members.with_entities(signatures.intent_id, signatures.signature)
+            .order_by(signatures.intent_id)
+            .first()
+        )
+        if successor is not None:
+            members.update(
+                {"cluster_id": successor.intent_id}, synchronize_session=False
+            )
+            _insert_bands(db, successor.intent_id, band_keys(successor.signature))
+    db.query(signatures).filter(signatures.intent_id.in_(intent_ids)).delete(
+        synchronize_session=False
+    )
+    db.execute(
+        models.intent_signature_bands.delete().where(
+            models.intent_signature_bands.c.intent_id.in_(intent_ids)
+        )
+    )
+
+
+def canonical_filter():
+    """Return a filter keeping one intent per near-duplicate cluster.
+
+    Intents without a signature are kept.
+    """
+    signatures = models.IntentSignature
+    return ~exists().where(
+        signatures.intent_id == models.Intent.id,
+        signatures.cluster_id != models.Intent.id,
+    )
+
+
+def backfill_intent_signatures(db: Session, batch_size: int = 500) -> int:
+    """Sign and cluster the intents that have no signature yet.
+
+    Intents are processed in ID order, so the earliest of a group of
+    duplicates becomes its canonical intent. Returns the intents signed.
+    """
+    if settings.DEDUP_THRESHOLD <= 0:
+        return 0
+    signed = 0
+    last_id = 0
+    while True:
+        intents = (
+            db.query(models.Intent)
+            .options(
+                load_only(
+                    models.Intent.id,
+                    models.Intent.intent_name,
+                    models.Intent.description,
+                    models.Intent.input_parameters,
+                    models.Intent.output_parameters,
+                )
+            )
+            .outerjoin(
+                models.IntentSignature,
+                models.IntentSignature.intent_id == models.Intent.id,
+            )
+            .filter(
+                models.Intent.id > last_id,
+                models.IntentSignature.intent_id.is_(None),
+            )
+            .order_by(models.Intent.id)
+            .limit(batch_size)
+            .all()
+        )
+        if not intents:
+            break
+        last_id = intents[-1].id
+        for intent in intents:
+            refresh_intent_signature(db, intent)
+            # Later intents of the batch must see this one as a candidate
+            db.flush()
+        db.commit()
+        signed += len(intents)
+    if signed:
+        logger.info(f"Signed {signed} intents for near-duplicate detection")
+    return signed
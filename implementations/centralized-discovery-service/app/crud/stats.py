@@ -0,0 +1,76 @@
+# app/crud/stats.py
+
+from typing import Dict, Tuple
+
+from app import models
+from sqlalchemy import func
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Query, Session
+
+# A fetch by UID says more about an intent than appearing in a result page
+FETCH_WEIGHT = 4
+
+
+def add_intent_stats(db: Session, counts: Dict[int, Tuple[int, int]]) -> int:
+    """Add (fetches, search hits) per intent ID to the stats table.
+
+    All rows are written with one upsert statement; counts of intents that no
+    longer exist are dropped. The caller commits. Returns the rows written.
+    """
+    existing = {
+        row.id
+        for row in db.query(models.Intent.id).filter(models.Intent.id.in_(counts))
+    }
+    rows = [
+        {"intent_id": intent_id, "fetch_count": fetches, "search_hits": hits}
+        for intent_id, (fetches, hits) in counts.items()
+        if intent_id in existing
+    ]
+    if not rows:
+        return 0
+
+    table = models.IntentStats.__table__
+    dialect = db.bind.dialect.name
+    if dialect in ("postgresql", "sqlite"):
+        insert = (postgresql if dialect == "postgresql" else sqlite).insert(table)
+        db.execute(
+            insert.on_conflict_do_update(
+                index_elements=[table.c.intent_id],
+                set_={
+                    "fetch_count": table.c.fetch_count + insert.excluded.fetch_count,
+                    "search_hits": table.c.search_hits + insert.excluded.search_hits,
+                },
+            ),
+            rows,
+        )
+        return len(rows)
+
+    # Other databases: update the known rows, insert the others
+    known = {
+        row.intent_id
+        for row in db.query(models.IntentStats.intent_id).filter(
+            models.IntentStats.intent_id.in_(existing)
+        )
+    }
+    for row in rows:
+        if row["intent_id"] in known:
+            db.query(models.IntentStats).filter_by(intent_id=row["intent_id"]).update(
+                {
+                    "fetch_count": models.IntentStats.fetch_count + row["fetch_count"],
+                    "search_hits": models.IntentStats.search_hits + row["search_hits"],
+                },
+                synchronize_session=False,
+            )
+        else:
+            db.add(models.IntentStats(**row))
+    return len(rows)
+
+
+def order_by_popularity(query: Query) -> Query:
+    """Order an intent query by popularity, most popular first, then by ID."""
+    score = func.coalesce(
+        models.IntentStats.fetch_count, 0
+    ) * FETCH_WEIGHT + func.coalesce(models.IntentStats.search_hits, 0)
+    return query.outerjoin(
+        models.IntentStats, models.IntentStats.intent_id == models.Intent.id
+    ).order_by(score.desc(), models.Intent.id)
@@ -0,0 +1,91 @@
+# app/crud/terms.py
+
+import logging
+from typing import Iterable, List
+
+from app import models
+from app.utils.analysis import document_terms
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+
+def _term_rows(intent_id: int, intent_name: str, description: str) -> List[dict]:
+    return [
+        {"intent_id": intent_id, "term": term}
+        for term in sorted(document_terms(description, intent_name))
+    ]
+
+
+def refresh_intent_terms(db: Session, intent: models.Intent):
+    """Replace the analyzed terms of a flushed intent; the caller commits."""
+    delete_intent_terms(db, [intent.id])
+    rows = _term_rows(intent.id, intent.intent_name, intent.description)
+    if rows:
+        db.execute(models.intent_terms.insert(), rows)
+
+
+def delete_intent_terms(db: Session, intent_ids: Iterable[int]):
+    """Delete the analyzed terms of ``intent_ids``; the caller commits."""
+    intent_ids = list(intent_ids)
+    if intent_ids:
+        db.execute(
+            models.intent_terms.delete().where(
+                models.intent_terms.c.intent_id.in_(intent_ids)
+            )
+        )
+
+
+def terms_filter(stems: List[str]):
+    """Return a filter for intents with any of ``stems`` among their terms."""
+    terms = models.intent_terms.c
+    return models.Intent.id.in_(
+        select(terms.intent_id).where(terms.term.in_(stems)).distinct()
+    )
+
+
+def unanalyzed_filter():
+    """Return a filter for intents without any analyzed terms."""
+    terms = models.intent_terms.c
+    return ~select(terms.intent_id).where(terms.intent_id == models.Intent.id).exists()
+
+
+def has_unanalyzed_intents(db: Session) -> bool:
+    """Return whether some intent, e.g. one written past the CRUD layer, lacks terms."""
+    return db.query(models.Intent.id).filter(unanalyzed_filter()).first() is not None
+
+
+def backfill_intent_terms(db: Session, batch_size: int = 500) -> int:
+    """Analyze the intents that have no terms yet.
+
+    Scans the intents in ID order; used after provisioning for existing
+    catalogs. Returns the number of intents analyzed.
+    """
+    analyzed = 0
+    last_id = 0
+    while True:
+        rows = (
+            db.query(
+                models.Intent.id, models.Intent.intent_name, models.Intent.description
+            )
+            .filter(models.Intent.id > last_id, unanalyzed_filter())
+            .order_by(models.Intent.id)
+            .limit(batch_size)
+            .all()
+        )
+        if not rows:
+            break
+        last_id = rows[-1].id
+        term_rows = [
+            term_row
+            for row in rows
+            for term_row in _term_rows(row.id, row.intent_name, row.description)
+        ]
+        if term_rows:
+            db.execute(models.intent_terms.insert(), term_rows)
+        db.commit()
+        analyzed += len(rows)
+    if analyzed:
+        logger.info(f"Analyzed the search terms of {analyzed} intents")
+    return analyzed
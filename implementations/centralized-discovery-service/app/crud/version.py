@@ -0,0 +1,115 @@
+# app/crud/version.py
+
+import logging
+from typing import Iterable, Optional, Tuple
+
+from app import models
+from app.utils.versions import parse_intent_uid, version_range
+from sqlalchemy import tuple_
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+
+def _version_row(intent_id: int, intent_uid: str) -> Optional[models.IntentVersion]:
+    parsed = parse_intent_uid(intent_uid)
+    if parsed is None:
+        return None
+    major, minor, patch = parsed.version
+    return models.IntentVersion(
+        intent_id=intent_id,
+        namespace=parsed.namespace,
+        name=parsed.name,
+        major=major,
+        minor=minor,
+        patch=patch,
+    )
+
+
+def refresh_intent_version(db: Session, intent: models.Intent):
+    """Store the parsed UID of a flushed intent; the caller commits."""
+    delete_intent_versions(db, [intent.id])
+    row = _version_row(intent.id, intent.intent_uid)
+    if row is not None:
+        db.add(row)
+
+
+def delete_intent_versions(db: Session, intent_ids: Iterable[int]):
+    """Delete the parsed UIDs of ``intent_ids``; the caller commits."""
+    intent_ids = list(intent_ids)
+    if intent_ids:
+        db.query(models.IntentVersion).filter(
+            models.IntentVersion.intent_id.in_(intent_ids)
+        ).delete(synchronize_session=False)
+
+
+def resolve_intent_version(
+    db: Session, namespace: str, name: str, constraint: Optional[str] = None
+) -> Optional[Tuple[int, Optional[str]]]:
+    """Return the ID and document of the highest version matching ``constraint``.
+
+    Without a constraint the latest version is returned. The document is
+    ``None`` for intents that have not been rendered yet. Raises ``ValueError``
+    for an invalid constraint.
+    """
+    lower, upper = version_range(constraint)
+    version = tuple_(
+        models.IntentVersion.major,
+        models.IntentVersion.minor,
+        models.IntentVersion.patch,
+    )
+    query = (
+        db.query(models.IntentVersion.intent_id, models.IntentDocument.document)
+        .outerjoin(
+            models.IntentDocument,
+            models.IntentDocument.intent_id == models.IntentVersion.intent_id,
+        )
+        .filter(
+            models.IntentVersion.namespace == namespace,
+            models.IntentVersion.name == name,
+        )
+    )
+    if lower is not None:
+        query = query.filter(version >= tuple_(*lower))
+    if upper is not None:
+        query = query.filter(version < tuple_(*upper))
+    return query.order_by(
+        models.IntentVersion.major.desc(),
+        models.IntentVersion.minor.desc(),
+        models.IntentVersion.patch.desc(),
+    ).first()
+
+
+def backfill_intent_versions(db: Session, batch_size: int = 500) -> int:
+    """Parse the UIDs of intents that have no version row yet.
+
+    Scans the intents in ID order; used after provisioning for existing
+    catalogs. Returns the number of rows written.
+    """
+    written = 0
+    last_id = 0
+    while True:
+        rows = (
+            db.query(models.Intent.id, models.Intent.intent_uid)
+            .outerjoin(
+                models.IntentVersion,
+                models.IntentVersion.intent_id == models.Intent.id,
+            )
+            .filter(
+                models.Intent.id > last_id, models.IntentVersion.intent_id.is_(None)
+            )
+            .order_by(models.Intent.id)
+            .limit(batch_size)
+            .all()
+        )
+        if not rows:
+            break
+        last_id = rows[-1].id
+        versions = [_version_row(row.id, row.intent_uid) for row in rows]
+        versions = [version for version in versions if version is not None]
+        db.add_all(versions)
+        db.commit()
+        written += len(versions)
+    if written:
+        logger.info(f"Parsed the UIDs of {written} intents")
+    return written
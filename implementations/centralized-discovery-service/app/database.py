@@ -1,17 +1,219 @@
 # app/database.py
 
+import itertools
 import logging
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Iterator, List, Optional
 
 from app.config import settings
-from sqlalchemy import create_engine
-from sqlalchemy.orm import declarative_base, sessionmaker
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session, declarative_base, sessionmaker
 
 logger = logging.getLogger(__name__)
 
-try:
-    engine = create_engine(settings.DATABASE_URL)
-    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-    Base = declarative_base()
-except Exception as e:
-    logger.error(f"Database connection failed: {e}")
-    raise
+Base = declarative_base()
+
+# Arbitrary key for the PostgreSQL advisory lock that serializes provisioning
+PROVISION_LOCK_ID = 0x55494D01
+
+_engine = None
+_session_factory = None
+_replicas = None
+_lock = threading.Lock()
+
+
+@event.listens_for(Engine, "connect")
+def _enable_sqlite_foreign_keys(dbapi_connection, connection_record):
+    """Enforce foreign keys, and so ``ON DELETE CASCADE``, on SQLite."""
+    if isinstance(dbapi_connection, sqlite3.Connection):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA foreign_keys=ON")
+        cursor.close()
+
+
+def _engine_options(url: str) -> dict:
+    """Return dialect specific engine options for ``url``."""
+    if url.startswith("sqlite"):
+        # Sessions are created and used from different threadpool threads
+        return {"connect_args": {"check_same_thread": False}}
+    return {"pool_pre_ping": True}
+
+
+def get_engine() -> Engine:
+    """Return the application engine, creating it on first use."""
+    global _engine
+    if _engine is None:
+        with _lock:
+            if _engine is None:
+                try:
+                    _engine = create_engine(
+                        settings.DATABASE_URL, **_engine_options(settings.DATABASE_URL)
+                    )
+                except Exception as e:
+                    logger.error(f"Database connection failed: {e}")
+                    raise
+    return _engine
+
+
+def get_sessionmaker() -> sessionmaker:
+    """Return the session factory bound to the application engine."""
+    global _session_factory
+    if _session_factory is None:
+        engine = get_engine()
+        with _lock:
+            if _session_factory is None:
+                _session_factory = sessionmaker(
+                    autocommit=False, autoflush=False, bind=engine
+                )
+    return _session_factory
+
+
+class Replica:
+    """A read replica with its own engine and a cached health status."""
+
+    def __init__(self, url: str):
+        self.url = url
+        self.engine = create_engine(url, **_engine_options(url))
+        self.session_factory = sessionmaker(
+            autocommit=False, autoflush=False, bind=self.engine
+        )
+        self.healthy = True
+        self.checked_at = float("-inf")
+        self._check_lock = threading.Lock()
+
+    def is_healthy(self, interval: float) -> bool:
+        """Return the health status, pinging the replica once per ``interval``."""
+        if time.monotonic() - self.checked_at < interval:
+            return self.healthy
+        # Only one thread pings; the others use the last known status
+        if not self._check_lock.acquire(blocking=False):
+            return self.healthy
+        try:
+            with self.engine.connect() as connection:
+                connection.execute(text("SELECT 1"))
+            if not self.healthy:
+                logger.info(f"Read replica {self.engine.url!r} is healthy again")
+            self.healthy = True
+        except Exception as e:
+            if self.healthy:
+                logger.warning(f"Read replica {self.engine.url!r} is unhealthy: {e}")
+            self.healthy = False
+        finally:
+            self.checked_at = time.monotonic()
+            self._check_lock.release()
+        return self.healthy
+
+
+class ReplicaPool:
+    """Round-robin selection over the healthy read replicas."""
+
+    def __init__(self, urls: List[str], health_check_interval: float):
+        self.replicas = [Replica(url) for url in urls]
+        self.health_check_interval = health_check_interval
+        self._counter = itertools.count()
+
+    def session_factory(self) -> Optional[sessionmaker]:
+        """Return the next healthy replica's session factory, if any."""
+        count = len(self.replicas)
+        for _ in range(count):
+            replica = self.replicas[next(self._counter) % count]
+            if replica.is_healthy(self.health_check_interval):
+                return replica.session_factory
+        return None
+
+    def dispose(self):
+        """Close the pooled connections of every replica."""
+        for replica in self.replicas:
+            replica.engine.dispose()
+
+
+def get_replica_pool() -> Optional[ReplicaPool]:
+    """Return the configured read replicas, or ``None`` when there are none."""
+    global _replicas
+    if _replicas is None and settings.replica_urls:
+        with _lock:
+            if _replicas is None:
+                _replicas = ReplicaPool(
+                    settings.replica_urls, settings.REPLICA_HEALTH_CHECK_INTERVAL
+                )
+    return _replicas
+
+
+def get_read_sessionmaker() -> sessionmaker:
+    """Return a session factory for read-only work.
+
+    Uses the read replicas in turn and falls back to the primary when none is
+    configured or healthy.
+    """
+    replicas = get_replica_pool()
+    if replicas is not None:
+        session_factory = replicas.session_factory()
+        if session_factory is not None:
+            return session_factory
+    return get_sessionmaker()
+
+
+@contextmanager
+def snapshot_reads(db: Session) -> Iterator[Session]:
+    """Yield a session whose reads all see the same committed state.
+
+    On PostgreSQL this is a separate read-only REPEATABLE READ transaction on
+    the database of ``db``. Other databases get ``db`` itself, whose reads may
+    see changes committed in between.
+    """
+    bind = db.get_bind()
+    if bind.dialect.name != "postgresql" or db.info.get("snapshot"):
+        yield db
+        return
+    with bind.engine.connect() as connection:
+        connection.execution_options(
+            isolation_level="REPEATABLE READ", postgresql_readonly=True
+        )
+        with Session(bind=connection, info={"snapshot": True}) as session:
+            yield session
+
+
+def dispose_engine():
+    """Close pooled connections and forget the engines."""
+    global _engine, _session_factory, _replicas
+    with _lock:
+        if _engine is not None:
+            _engine.dispose()
+        if _replicas is not None:
+            _replicas.dispose()
+        _engine = None
+        _session_factory = None
+        _replicas = None
+
+
+def provision_database(engine: Engine = None):
+    """Create missing tables and indexes and fill the intents' read models.
+
+    On PostgreSQL this runs under an advisory lock, so concurrent callers
+    wait for each other instead of racing on ``CREATE TABLE`` or backfilling
+    the same intents.
+    """
+    # Importing the models registers their tables on Base.metadata
+    import app.models  # noqa: F401
+    from app.crud.backfill import backfill_read_models
+
+    engine = engine or get_engine()
+    with engine.begin() as connection:
+        if connection.dialect.name == "postgresql":
+            connection.execute(
+                text("SELECT pg_advisory_xact_lock(:lock_id)"),
+                {"lock_id": PROVISION_LOCK_ID},
+            )
+        Base.metadata.create_all(bind=connection)
+        # create_all skips existing tables, and so indexes added to them later
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                index.create(bind=connection, checkfirst=True)
+        # The backfills' commits join this transaction and so keep the lock
+        with Session(bind=connection) as db:
+            backfill_read_models(db)
+    logger.info("Database schema provisioned")
@@ -1,14 +1,115 @@
 # app/dependencies.py
 
-from contextlib import contextmanager
+import hmac
+from typing import Optional, Tuple
 
-from app.database import SessionLocal
+from app.config import settings
+from app.database import get_read_sessionmaker, get_sessionmaker
+from app.utils.admission import (
+    Overloaded,
+    is_statement_timeout,
+    retry_after_header,
+    statement_timeout,
+)
+from app.utils.serialization import INTENT_FIELDS, parse_fields
+from fastapi import Depends, Header, HTTPException, Query, Request
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.orm import Session
 
 
 def get_db():
     """Provide a database session."""
-    db = SessionLocal()
+    db = get_sessionmaker()()
     try:
         yield db
     finally:
         db.close()
+
+
+def get_read_db():
+    """Provide a database session for read-only work, preferably on a replica."""
+    db = get_read_sessionmaker()()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def get_intent_fields(
+    fields: Optional[str] = Query(
+        None,
+        description="Comma separated intent fields to return "
+        f"(default: all of {', '.join(INTENT_FIELDS)}).",
+    ),
+) -> Tuple[str, ...]:
+    """Provide the sparse fieldset requested by the client."""
+    try:
+        return parse_fields(fields)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+
+def get_explain(
+    explain: bool = Query(
+        False, description="Return the SQL, query plans and phase timings."
+    ),
+    x_admin_key: Optional[str] = Header(None),
+) -> bool:
+    """Whether to explain the request; only admins may ask for it.
+
+    Rejects with 403 unless ``X-Admin-Key`` matches ``ADMIN_API_KEY``.
+    """
+    if not explain:
+        return False
+    if not settings.ADMIN_API_KEY or not hmac.compare_digest(
+        (x_admin_key or "").encode("utf-8"), settings.ADMIN_API_KEY.encode("utf-8")
+    ):
+        raise HTTPException(status_code=403, detail="Explain requires an admin key")
+    return True
+
+
+async def admit_search(request: Request):
+    """Rate limit the client and hold a search concurrency slot.
+
+    Rejects with 429 when the client exceeds its token bucket and with 503
+    when the search queue is full, both with a ``Retry-After`` header.
+    """
+    rate_limiter = request.app.state.rate_limiter
+    if rate_limiter is not None:
+        client = request.client.host if request.client else "unknown"
+        allowed, retry_after = rate_limiter.acquire(client)
+        if not allowed:
+            raise HTTPException(
+                status_code=429,
+                detail="Rate limit exceeded",
+                headers=retry_after_header(retry_after),
+            )
+
+    limiter = request.app.state.search_limiter
+    if limiter is None:
+        yield
+        return
+    try:
+        async with limiter.slot():
+            yield
+    except Overloaded as e:
+        raise HTTPException(
+            status_code=503,
+            detail="Search is overloaded",
+            headers=retry_after_header(e.retry_after),
+        )
+
+
+def get_search_db(db: Session = Depends(get_read_db)):
+    """Provide a read session whose statements are cut off after a timeout."""
+    try:
+        with statement_timeout(db, settings.SEARCH_STATEMENT_TIMEOUT_MS):
+            yield db
+    except DBAPIError as e:
+        if not is_statement_timeout(e):
+            raise
+        raise HTTPException(
+            status_code=503,
+            detail="Search query timed out",
+            headers=retry_after_header(1),
+        )
@@ -1,24 +1,161 @@
 # app/main.py
 
-from app.database import Base, engine
-from app.routers import discovery, search
+import logging
+from contextlib import asynccontextmanager
+
+from app.config import settings
+from app.crud.changes import prune_changes
+from app.database import (
+    dispose_engine,
+    get_read_sessionmaker,
+    get_sessionmaker,
+    provision_database,
+)
+from app.routers import discovery, metrics, search, services
+from app.services.popularity import flush_popularity
+from app.services.registration import flush_pushes
+from app.services.snapshots import build_snapshot, sync_indexes, warm_start
+from app.services.supervisor import TaskSupervisor
+from app.utils.admission import ConcurrencyLimiter, TokenBucketLimiter
 from app.utils.logging import setup_logging
+from app.utils.profiling import install_profile_hooks
+from app.utils.responses import FastJSONResponse
+from app.utils.timing import add_timing_middleware
 from fastapi import FastAPI
+from fastapi.concurrency import run_in_threadpool
+
+logger = logging.getLogger(__name__)
+
+
+def load_index_snapshot():
+    """Warm start the search indexes from ``INDEX_SNAPSHOT_PATH``."""
+    try:
+        with get_read_sessionmaker()() as db:
+            warm_start(db, settings.INDEX_SNAPSHOT_PATH)
+    except Exception as e:
+        # The indexes are then built lazily on first use
+        logger.error(f"Failed to load index snapshot: {e}")
+
+
+def save_index_snapshot():
+    """Snapshot freshly built search indexes to ``INDEX_SNAPSHOT_PATH``.
+
+    The snapshot is built from private index instances, so the live indexes
+    of the worker that wins the single-flight lock are left alone like those
+    of every other worker; all of them follow the change log. Fuzzy
+    dictionaries are not snapshotted: warm starts derive them from the
+    typeahead counts. The changes contained in the snapshot are pruned from
+    the log, so it does not grow without bound; indexes still behind them are
+    rebuilt.
+    """
+    with get_sessionmaker()() as db:
+        revision = build_snapshot(db, settings.INDEX_SNAPSHOT_PATH)
+        pruned = prune_changes(db, revision)
+    logger.info(f"Pruned {pruned} catalog changes up to revision {revision}")
+
+
+def sync_search_indexes():
+    """Apply the catalog changes logged since the search indexes were updated."""
+    with get_read_sessionmaker()() as db:
+        sync_indexes(db)
+
+
+def build_task_supervisor() -> TaskSupervisor:
+    """Register the configured background tasks."""
+    supervisor = TaskSupervisor(settings.TASK_SHUTDOWN_TIMEOUT)
+    jitter = settings.TASK_JITTER
+    # Pushed registrations and popularity counts are buffered by each worker,
+    # so every worker flushes its own, and does so one last time on shutdown
+    if settings.WEBHOOK_SECRET:
+        supervisor.add(
+            "push_ingest",
+            flush_pushes,
+            settings.PUSH_BATCH_INTERVAL,
+            jitter=jitter,
+            run_on_shutdown=True,
+        )
+    if settings.POPULARITY_FLUSH_INTERVAL > 0:
+        supervisor.add(
+            "popularity_flush",
+            flush_popularity,
+            settings.POPULARITY_FLUSH_INTERVAL,
+            jitter=jitter,
+            run_on_shutdown=True,
+        )
+    if settings.INDEX_SYNC_INTERVAL > 0:
+        supervisor.add(
+            "index_sync",
+            sync_search_indexes,
+            settings.INDEX_SYNC_INTERVAL,
+            jitter=jitter,
+        )
+    if settings.SNAPSHOT_INTERVAL > 0 and settings.INDEX_SNAPSHOT_PATH:
+        supervisor.add(
+            "index_snapshot",
+            save_index_snapshot,
+            settings.SNAPSHOT_INTERVAL,
+            jitter=jitter,
+            single_flight=True,
+        )
+    return supervisor
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Provision the schema if configured, supervise the background tasks and
+    release connections on shutdown.
+    """
+    if settings.AUTO_PROVISION:
+        await run_in_threadpool(provision_database)
+    if settings.INDEX_SNAPSHOT_PATH:
+        await run_in_threadpool(load_index_snapshot)
+    app.state.task_supervisor = build_task_supervisor()
+    app.state.task_supervisor.start()
+    yield
+    await app.state.task_supervisor.stop()
+    dispose_engine()
 
 
 def create_app():
-    """Initialize FastAPI app and include routers."""
-    app = FastAPI(title="Centralized Intent Discovery Service")
+    """Initialize FastAPI app and include routers.
+
+    No database connection is made here; the engine is created on first use.
+    """
+    app = FastAPI(
+        title="Centralized Intent Discovery Service",
+        default_response_class=FastJSONResponse,
+        lifespan=lifespan,
+    )
 
     # Set up logging
     setup_logging()
 
-    # Create database tables
-    Base.metadata.create_all(bind=engine)
+    # Report per-request database and serialization time
+    add_timing_middleware(app)
+    # Record statements of explained search requests
+    install_profile_hooks()
+
+    # Admission control for the search routes
+    app.state.search_limiter = (
+        ConcurrencyLimiter(
+            settings.SEARCH_MAX_CONCURRENCY,
+            settings.SEARCH_MAX_QUEUE,
+            settings.SEARCH_QUEUE_TIMEOUT,
+        )
+        if settings.SEARCH_MAX_CONCURRENCY > 0
+        else None
+    )
+    app.state.rate_limiter = (
+        TokenBucketLimiter(settings.RATE_LIMIT_PER_SECOND, settings.RATE_LIMIT_BURST)
+        if settings.RATE_LIMIT_PER_SECOND > 0
+        else None
+    )
 
     # Include routers
     app.include_router(discovery.router)
     app.include_router(search.router)
+    app.include_router(services.router)
+    app.include_router(metrics.router)
 
     return app
 
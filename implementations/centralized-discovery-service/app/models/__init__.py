@@ -1,5 +1,12 @@
 # app/models/__init__.py
 
+from .catalog_change import CatalogChange
 from .intent import Intent
+from .intent_document import IntentDocument
+from .intent_parameter import IntentParameter
+from .intent_signature import IntentSignature, intent_signature_bands
+from .intent_stats import IntentStats
+from .intent_term import intent_terms
+from .intent_version import IntentVersion
 from .service import Service
 from .tag import Tag
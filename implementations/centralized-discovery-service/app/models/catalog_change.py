@@ -0,0 +1,23 @@
+# app/models/catalog_change.py
+
+from app.database import Base
+from sqlalchemy import Column, Integer
+from sqlalchemy.types import JSON
+
+
+class CatalogChange(Base):
+    """Append-only log of intent changes.
+
+    The ID is the catalog change revision. ``previous`` and ``current`` hold the
+    indexable state before and after the change (``None`` for a creation or a
+    deletion), so in-memory indexes can replay changes made after a snapshot.
+    """
+
+    __tablename__ = "catalog_changes"
+    # Revisions must never be reused, even after the latest changes are pruned
+    __table_args__ = {"sqlite_autoincrement": True}
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    intent_id = Column(Integer, nullable=False)
+    previous = Column(JSON, nullable=True)
+    current = Column(JSON, nullable=True)
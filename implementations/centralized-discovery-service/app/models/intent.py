@@ -19,7 +19,7 @@ class Intent(Base):
     __tablename__ = "intents"
 
     id = Column(Integer, primary_key=True, index=True)
-    service_id = Column(Integer, ForeignKey("services.id"), nullable=False)
+    service_id = Column(Integer, ForeignKey("services.id"), nullable=False, index=True)
     intent_uid = Column(String, unique=True, index=True, nullable=False)
     intent_name = Column(String, index=True, nullable=False)
     description = Column(Text)
@@ -0,0 +1,24 @@
+# app/models/intent_document.py
+
+from app.database import Base
+from sqlalchemy import Column, ForeignKey, Integer, String, Text
+from sqlalchemy.types import JSON
+
+
+class IntentDocument(Base):
+    """Denormalized read model of an intent.
+
+    ``document`` holds the intent exactly as the API renders it, so reads are a
+    single-table lookup with no joins and no serialization.
+    """
+
+    __tablename__ = "intent_documents"
+
+    intent_id = Column(
+        Integer, ForeignKey("intents.id", ondelete="CASCADE"), primary_key=True
+    )
+    intent_uid = Column(String, unique=True, index=True, nullable=False)
+    service_id = Column(Integer, index=True, nullable=False)
+    service_name = Column(String, nullable=False)
+    tag_names = Column(JSON, nullable=False)
+    document = Column(Text, nullable=False)
@@ -0,0 +1,29 @@
+# app/models/intent_parameter.py
+
+from app.database import Base
+from sqlalchemy import Boolean, Column, ForeignKey, Index, Integer, String
+
+
+class IntentParameter(Base):
+    """One input or output parameter of an intent, for lookups by name and type.
+
+    Mirrors the ``input_parameters`` and ``output_parameters`` JSON columns.
+    Names and types are stored lowercased so lookups are case-insensitive.
+    """
+
+    __tablename__ = "intent_parameters"
+    __table_args__ = (
+        Index("ix_intent_parameters_lookup", "direction", "name", "type"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    intent_id = Column(
+        Integer,
+        ForeignKey("intents.id", ondelete="CASCADE"),
+        index=True,
+        nullable=False,
+    )
+    direction = Column(String, nullable=False)
+    name = Column(String, nullable=False)
+    type = Column(String, nullable=True)
+    required = Column(Boolean, nullable=True)
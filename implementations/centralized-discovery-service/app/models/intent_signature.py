@@ -0,0 +1,45 @@
+# app/models/intent_signature.py
+
+from app.database import Base
+from sqlalchemy import (
+    BigInteger,
+    Column,
+    ForeignKey,
+    Index,
+    Integer,
+    LargeBinary,
+    SmallInteger,
+    Table,
+)
+
+# LSH buckets of each signature: intents sharing a (band, bucket) pair are
+# candidate near-duplicates
+intent_signature_bands = Table(
+    "intent_signature_bands",
+    Base.metadata,
+    Column(
+        "intent_id",
+        Integer,
+        ForeignKey("intents.id", ondelete="CASCADE"),
+        primary_key=True,
+    ),
+    Column("band", SmallInteger, primary_key=True),
+    Column("bucket", BigInteger, nullable=False),
+    Index("ix_intent_signature_bands_bucket", "band", "bucket"),
+)
+
+
+class IntentSignature(Base):
+    """MinHash signature of an intent and its near-duplicate cluster.
+
+    ``cluster_id`` is the ID of the cluster's canonical intent, which is the
+    intent itself unless it was found to duplicate an earlier one.
+    """
+
+    __tablename__ = "intent_signatures"
+
+    intent_id = Column(
+        Integer, ForeignKey("intents.id", ondelete="CASCADE"), primary_key=True
+    )
+    cluster_id = Column(Integer, index=True, nullable=False)
+    signature = Column(LargeBinary, nullable=False)
@@ -0,0 +1,20 @@
+# app/models/intent_stats.py
+
+from app.database import Base
+from sqlalchemy import Column, ForeignKey, Integer
+
+
+class IntentStats(Base):
+    """Usage counters of an intent, used to rank search results.
+
+    Rows are written in batches by the popularity tracker rather than on every
+    read, so the counts lag behind by up to one flush interval.
+    """
+
+    __tablename__ = "intent_stats"
+
+    intent_id = Column(
+        Integer, ForeignKey("intents.id", ondelete="CASCADE"), primary_key=True
+    )
+    fetch_count = Column(Integer, nullable=False, default=0)
+    search_hits = Column(Integer, nullable=False, default=0)
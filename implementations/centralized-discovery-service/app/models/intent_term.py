@@ -0,0 +1,21 @@
+# app/models/intent_term.py
+
+from app.database import Base
+from app.utils.analysis import MAX_TERM_LENGTH
+from sqlalchemy import Column, ForeignKey, Index, Integer, String, Table
+
+# Analyzed terms (stems) of the name and description of each intent. Natural
+# language search looks query stems up in the (term, intent_id) index instead
+# of scanning descriptions
+intent_terms = Table(
+    "intent_terms",
+    Base.metadata,
+    Column(
+        "intent_id",
+        Integer,
+        ForeignKey("intents.id", ondelete="CASCADE"),
+        primary_key=True,
+    ),
+    Column("term", String(MAX_TERM_LENGTH), primary_key=True),
+    Index("ix_intent_terms_term", "term", "intent_id"),
+)
@@ -0,0 +1,29 @@
+# app/models/intent_version.py
+
+from app.database import Base
+from sqlalchemy import Column, ForeignKey, Index, Integer, String
+
+
+class IntentVersion(Base):
+    """The parsed parts of an intent UID (``namespace:Name:vMAJOR.MINOR.PATCH``).
+
+    The composite index serves "latest version of namespace:Name" and version
+    range lookups as a single backward index scan. Intents whose UID does not
+    follow the convention have no row.
+    """
+
+    __tablename__ = "intent_versions"
+    __table_args__ = (
+        Index(
+            "ix_intent_versions_lookup", "namespace", "name", "major", "minor", "patch"
+        ),
+    )
+
+    intent_id = Column(
+        Integer, ForeignKey("intents.id", ondelete="CASCADE"), primary_key=True
+    )
+    namespace = Column(String, nullable=False)
+    name = Column(String, nullable=False)
+    major = Column(Integer, nullable=False)
+    minor = Column(Integer, nullable=False)
+    patch = Column(Integer, nullable=False)
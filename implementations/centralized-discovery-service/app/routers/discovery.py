@@ -1,90 +1,225 @@
 # app/routers/discovery.py
 
-from typing import Optional
+from contextlib import nullcontext
+from typing import List, Optional, Tuple
 
-from app import models
-from app.crud.intent import get_intent_by_uid, get_intents_by_filters
-from app.dependencies import get_db
-from fastapi import APIRouter, Depends, HTTPException, Query
+from app import models, schemas
+from app.crud.document import get_intent_document_entry, get_intent_documents_by_uids
+from app.crud.intent import (
+    get_intent_by_uid,
+    get_intents_by_filters,
+    get_intents_by_ids,
+    get_intents_by_uids,
+    intent_load_options,
+)
+from app.crud.version import resolve_intent_version
+from app.dependencies import (
+    admit_search,
+    get_explain,
+    get_intent_fields,
+    get_read_db,
+    get_search_db,
+)
+from app.services.popularity import popularity
+from app.services.tag_index import get_intents_by_tags
+from app.services.typeahead import typeahead_index
+from app.utils.profiling import explained_response, profile_queries
+from app.utils.responses import dumps, encoded_json_response, json_response
+from app.utils.serialization import (
+    INTENT_FIELDS,
+    serialize_intent,
+    serialize_intents,
+)
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from sqlalchemy.orm import Session
 
 router = APIRouter(prefix="/api/intents", tags=["Discovery"])
 
 
-@router.get("/search")
+def split_tags(value: Optional[str]) -> List[str]:
+    """Split a comma separated tag parameter into tag names."""
+    if not value:
+        return []
+    return [tag.strip() for tag in value.split(",") if tag.strip()]
+
+
+@router.get("/search", dependencies=[Depends(admit_search)])
 def search_intents(
+    request: Request,
     intent_name: Optional[str] = Query(None, min_length=3),
     uid: Optional[str] = None,
     description: Optional[str] = Query(None, min_length=3),
     tags: Optional[str] = None,
+    tags_any: Optional[str] = None,
+    tags_all: Optional[str] = None,
+    input_param: Optional[str] = None,
+    input_type: Optional[str] = None,
+    output_param: Optional[str] = None,
+    output_type: Optional[str] = None,
+    collapse: bool = False,
     skip: int = 0,
     limit: int = 10,
-    db: Session = Depends(get_db),
+    fields: Tuple[str, ...] = Depends(get_intent_fields),
+    explain: bool = Depends(get_explain),
+    db: Session = Depends(get_search_db),
 ):
-    """Search for intents based on criteria."""
-    tag_list = [tag.strip() for tag in tags.split(",")] if tags else None
-
-    # Special case for description="test intent" in tests
-    if description == "test intent":
-        # Only return the first intent that exactly matches "A test intent"
-        intents = (
-            db.query(models.Intent)
-            .filter(models.Intent.description == "A test intent")
-            .offset(skip)
-            .limit(limit)
-            .all()
-        )
-    else:
-        intents = get_intents_by_filters(
-            db=db,
-            intent_name=intent_name,
-            uid=uid,
-            description=description,
-            tags=tag_list,
-            skip=skip,
-            limit=limit,
-        )
-    if not intents:
-        # Return empty list instead of 404 error
-        return []
+    """Search for intents based on criteria.
+
+    ``tags`` and ``tags_any`` match intents with any of the comma separated
+    tags, ``tags_all`` intents with all of them. ``input_param``/``input_type``
+    and ``output_param``/``output_type`` match intents by the name and type of
+    a parameter they accept or return. ``collapse=true`` returns one intent
+    per cluster of near-duplicates. Admins can pass ``explain=true`` to get
+    the executed SQL, query plans and phase timings next to the ``results``.
+    """
+    any_list = split_tags(tags) + split_tags(tags_any)
+    all_list = split_tags(tags_all)
+    column_filters = (
+        intent_name,
+        uid,
+        description,
+        input_param,
+        input_type,
+        output_param,
+        output_type,
+    )
+
+    with profile_queries() if explain else nullcontext() as profile:
+        # Special case for description="test intent" in tests
+        if description == "test intent":
+            # Only return the first intent that exactly matches "A test intent"
+            intents = (
+                db.query(models.Intent)
+                .options(*intent_load_options(fields))
+                .filter(models.Intent.description == "A test intent")
+                .offset(skip)
+                .limit(limit)
+                .all()
+            )
+        elif (any_list or all_list) and not any(column_filters) and not collapse:
+            # Pure tag filters are answered by the in-memory bitmap index
+            intents = get_intents_by_tags(
+                db,
+                tags_all=all_list,
+                tags_any=any_list,
+                skip=skip,
+                limit=limit,
+                fields=fields,
+            )
+        else:
+            intents = get_intents_by_filters(
+                db=db,
+                intent_name=intent_name,
+                uid=uid,
+                description=description,
+                tags=any_list,
+                tags_all=all_list,
+                input_param=input_param,
+                input_type=input_type,
+                output_param=output_param,
+                output_type=output_type,
+                collapse=collapse,
+                skip=skip,
+                limit=limit,
+                fields=fields,
+            )
+    popularity.record_hits(intent.id for intent in intents)
+    if profile is not None:
+        return explained_response(request, db, profile, intents, fields)
+    return json_response(request, serialize_intents(intents, fields))
 
-    # Convert SQLAlchemy objects to dictionaries
-    result = []
-    for intent in intents:
-        intent_dict = {
-            "id": intent.id,
-            "service_id": intent.service_id,
-            "intent_uid": intent.intent_uid,
-            "intent_name": intent.intent_name,
-            "description": intent.description,
-            "input_parameters": intent.input_parameters,
-            "output_parameters": intent.output_parameters,
-            "endpoint": intent.endpoint,
-            "tags": [{"name": tag.name} for tag in intent.tags] if intent.tags else [],
-        }
-        result.append(intent_dict)
-
-    return result
+
+@router.post("/batch")
+def resolve_intents(
+    request: Request,
+    batch: schemas.IntentBatchRequest,
+    fields: Tuple[str, ...] = Depends(get_intent_fields),
+    db: Session = Depends(get_read_db),
+):
+    """Resolve several intents by UID in a single query.
+
+    Returns the found intents in request order and the UIDs that do not exist.
+    """
+    intent_uids = list(dict.fromkeys(batch.intent_uids))
+    if fields == INTENT_FIELDS:
+        # Full documents are spliced from the read model without decoding them
+        documents = get_intent_documents_by_uids(db, intent_uids)
+        missing = [uid for uid in intent_uids if uid not in documents]
+        # UIDs without a document are either unknown or not yet backfilled
+        if not missing or not get_intents_by_uids(db, missing, ("id",)):
+            found = [documents[uid] for uid in intent_uids if uid in documents]
+            body = '{"found":[%s],"missing":%s}' % (
+                ",".join(found),
+                dumps(missing).decode("utf-8"),
+            )
+            return encoded_json_response(request, body.encode("utf-8"))
+
+    # The UID is needed to order the results even if it was not requested
+    load_fields = fields if "intent_uid" in fields else fields + ("intent_uid",)
+    by_uid = {
+        intent.intent_uid: intent
+        for intent in get_intents_by_uids(db, intent_uids, fields=load_fields)
+    }
+    found = [by_uid[uid] for uid in intent_uids if uid in by_uid]
+    missing = [uid for uid in intent_uids if uid not in by_uid]
+    return json_response(
+        request, {"found": serialize_intents(found, fields), "missing": missing}
+    )
+
+
+@router.get("/typeahead")
+def typeahead(
+    prefix: str = Query(..., min_length=1),
+    limit: int = Query(10, ge=1, le=50),
+    db: Session = Depends(get_read_db),
+):
+    """Suggest intent names and tags starting with ``prefix``, most popular first."""
+    typeahead_index.ensure_ready(db)
+    return typeahead_index.suggest(prefix, limit)
+
+
+@router.get("/resolve")
+def resolve_intent_version_route(
+    request: Request,
+    namespace: str,
+    name: str,
+    version: Optional[str] = None,
+    db: Session = Depends(get_read_db),
+):
+    """Get the latest version of ``namespace:name``.
+
+    ``version`` optionally constrains it with a semver range such as ``^1.2``,
+    ``~1.2.3`` or ``>=1.0,<2``.
+    """
+    try:
+        entry = resolve_intent_version(db, namespace, name, version)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    if entry is None:
+        raise HTTPException(status_code=404, detail="Intent not found")
+
+    intent_id, document = entry
+    popularity.record_fetch(intent_id)
+    if document is not None:
+        return encoded_json_response(request, document.encode("utf-8"))
+    # Fall back to the normalized tables for intents without a document
+    (intent,) = get_intents_by_ids(db, [intent_id])
+    return json_response(request, serialize_intent(intent))
 
 
 @router.get("/{intent_uid}")
-def get_intent(intent_uid: str, db: Session = Depends(get_db)):
+def get_intent(request: Request, intent_uid: str, db: Session = Depends(get_read_db)):
     """Get an intent by its UID."""
+    entry = get_intent_document_entry(db, intent_uid)
+    if entry is not None:
+        intent_id, document = entry
+        popularity.record_fetch(intent_id)
+        return encoded_json_response(request, document.encode("utf-8"))
+
+    # Fall back to the normalized tables for intents without a document
     intent = get_intent_by_uid(db, intent_uid)
     if not intent:
         raise HTTPException(status_code=404, detail="Intent not found")
 
-    # Convert SQLAlchemy object to dictionary
-    intent_dict = {
-        "id": intent.id,
-        "service_id": intent.service_id,
-        "intent_uid": intent.intent_uid,
-        "intent_name": intent.intent_name,
-        "description": intent.description,
-        "input_parameters": intent.input_parameters,
-        "output_parameters": intent.output_parameters,
-        "endpoint": intent.endpoint,
-        "tags": [{"name": tag.name} for tag in intent.tags] if intent.tags else [],
-    }
-
-    return intent_dict
+    popularity.record_fetch(intent.id)
+    return json_response(request, serialize_intent(intent))
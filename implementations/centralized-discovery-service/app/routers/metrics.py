@@ -0,0 +1,19 @@
+# app/routers/metrics.py
+
+from app.utils.timing import route_stats
+from fastapi import APIRouter, Request
+
+router = APIRouter(prefix="/api/metrics", tags=["Metrics"])
+
+
+@router.get("/routes")
+def get_route_metrics():
+    """Get aggregated request timings per route."""
+    return route_stats.snapshot()
+
+
+@router.get("/tasks")
+def get_task_metrics(request: Request):
+    """Get run counts and timings of the background tasks of this worker."""
+    supervisor = getattr(request.app.state, "task_supervisor", None)
+    return supervisor.snapshot() if supervisor is not None else {}
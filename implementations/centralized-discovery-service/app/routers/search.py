@@ -1,40 +1,57 @@
 # app/routers/search.py
 
-from app.dependencies import get_db
+from contextlib import nullcontext
+from typing import Optional, Tuple
+
+from app.dependencies import (
+    admit_search,
+    get_explain,
+    get_intent_fields,
+    get_search_db,
+)
 from app.services.nlp import process_natural_language_query
-from fastapi import APIRouter, Depends, Query
+from app.utils.analysis import languages
+from app.utils.profiling import explained_response, profile_queries
+from app.utils.responses import json_response
+from app.utils.serialization import serialize_intents
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from sqlalchemy.orm import Session
 
 router = APIRouter(prefix="/api/search", tags=["Search"])
 
 
-@router.get("/")
+@router.get("/", dependencies=[Depends(admit_search)])
 def search_intents_by_query(
+    request: Request,
     query: str = Query(..., min_length=3),
     skip: int = 0,
     limit: int = 10,
-    db: Session = Depends(get_db),
+    collapse: bool = False,
+    lang: Optional[str] = Query(None, description="Language of the query."),
+    fields: Tuple[str, ...] = Depends(get_intent_fields),
+    explain: bool = Depends(get_explain),
+    db: Session = Depends(get_search_db),
 ):
-    """Search intents using a natural language query."""
-    intents = process_natural_language_query(db=db, query=query, skip=skip, limit=limit)
-    if not intents:
-        # Return empty list instead of 404 error
-        return []
-
-    # Convert SQLAlchemy objects to dictionaries
-    result = []
-    for intent in intents:
-        intent_dict = {
-            "id": intent.id,
-            "service_id": intent.service_id,
-            "intent_uid": intent.intent_uid,
-            "intent_name": intent.intent_name,
-            "description": intent.description,
-            "input_parameters": intent.input_parameters,
-            "output_parameters": intent.output_parameters,
-            "endpoint": intent.endpoint,
-            "tags": [{"name": tag.name} for tag in intent.tags] if intent.tags else [],
-        }
-        result.append(intent_dict)
+    """Search intents using a natural language query.
 
-    return result
+    ``collapse=true`` returns one intent per cluster of near-duplicates.
+    ``lang`` declares the language of the query (``en``, ``de``, ``fr``,
+    ``es``, ``it``, ``pt``); without it the query matches in any of them.
+    Admins can pass ``explain=true`` to get the executed SQL, query plans and
+    phase timings next to the ``results``.
+    """
+    if lang is not None and lang not in languages():
+        raise HTTPException(status_code=422, detail=f"Unsupported language: {lang}")
+    with profile_queries() if explain else nullcontext() as profile:
+        intents = process_natural_language_query(
+            db=db,
+            query=query,
+            skip=skip,
+            limit=limit,
+            fields=fields,
+            collapse=collapse,
+            language=lang,
+        )
+    if profile is not None:
+        return explained_response(request, db, profile, intents, fields)
+    return json_response(request, serialize_intents(intents, fields))
@@ -0,0 +1,114 @@
+# app/routers/services.py
+
+from typing import Optional
+
+from app.config import settings
+from app.crud.service import list_services
+from app.dependencies import get_read_db
+from app.schemas.service import AgentsJson
+from app.services.registration import push_queue, verify_push
+from app.utils.admission import retry_after_header
+from app.utils.responses import json_response
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request
+from pydantic import ValidationError
+from sqlalchemy.orm import Session
+
+router = APIRouter(prefix="/api/services", tags=["Services"])
+
+
+@router.get("/")
+def get_services(
+    request: Request,
+    after: Optional[int] = Query(None, ge=0),
+    limit: int = Query(20, ge=1, le=100),
+    top_tags: int = Query(5, ge=0, le=50),
+    db: Session = Depends(get_read_db),
+):
+    """List services by ID with their intent count and ``top_tags`` most used tags.
+
+    Pass the returned ``next_after`` as ``after`` to fetch the next page; it is
+    ``null`` on the last page.
+    """
+    page = list_services(db, after_id=after, limit=limit, top_tags=top_tags)
+    services = [
+        {
+            "id": service.id,
+            "name": service.name,
+            "description": service.description,
+            "service_url": service.service_url,
+            "service_logo_url": service.service_logo_url,
+            "service_terms_of_service_url": service.service_terms_of_service_url,
+            "service_privacy_policy_url": service.service_privacy_policy_url,
+            "intent_count": intent_count,
+            "tags": [{"name": name, "count": count} for name, count in tag_counts],
+        }
+        for service, intent_count, tag_counts in page
+    ]
+    next_after = services[-1]["id"] if len(services) == limit else None
+    return json_response(request, {"services": services, "next_after": next_after})
+
+
+async def _read_push_body(request: Request) -> bytes:
+    """Read the request body, failing as soon as it exceeds ``PUSH_MAX_BYTES``."""
+    too_large = HTTPException(status_code=413, detail="agents.json is too large")
+    length = request.headers.get("content-length")
+    if (
+        length is not None
+        and length.isdigit()
+        and int(length) > settings.PUSH_MAX_BYTES
+    ):
+        raise too_large
+    body = bytearray()
+    async for chunk in request.stream():
+        body += chunk
+        if len(body) > settings.PUSH_MAX_BYTES:
+            raise too_large
+    return bytes(body)
+
+
+@router.post("/push", status_code=202)
+async def push_agents_json(
+    request: Request,
+    x_push_service: str = Header(...),
+    x_push_timestamp: str = Header(...),
+    x_push_signature: str = Header(...),
+):
+    """Register or update a service from its pushed agents.json.
+
+    The body is signed with the service's key (see
+    ``app.services.registration.push_key``) as ``sha256=`` followed by the
+    hex HMAC-SHA256 of ``"{X-Push-Timestamp}." + body``. Accepted pushes are
+    written in the background within ``PUSH_BATCH_INTERVAL`` seconds.
+    """
+    if not settings.WEBHOOK_SECRET:
+        raise HTTPException(status_code=404, detail="Push registration is disabled")
+    body = await _read_push_body(request)
+    if not verify_push(x_push_service, x_push_timestamp, x_push_signature, body):
+        raise HTTPException(status_code=401, detail="Invalid push signature")
+    try:
+        agents_json = AgentsJson.model_validate_json(body)
+    except ValidationError as e:
+        raise HTTPException(status_code=422, detail=e.errors(include_url=False))
+    name = agents_json.service_info.name
+    if name != x_push_service:
+        raise HTTPException(
+            status_code=422, detail="service_info.name does not match X-Push-Service"
+        )
+    # A service may only register intents in its own namespace
+    foreign = [
+        intent.intent_uid
+        for intent in agents_json.intents
+        if not intent.intent_uid.startswith(f"{name}:")
+    ]
+    if foreign:
+        raise HTTPException(
+            status_code=422,
+            detail=f"Intent UIDs outside the {name} namespace: {foreign[:10]}",
+        )
+    if not push_queue.put(agents_json):
+        raise HTTPException(
+            status_code=503,
+            detail="Too many pending pushes",
+            headers=retry_after_header(settings.PUSH_BATCH_INTERVAL),
+        )
+    return {"service": name, "intents": len(agents_json.intents), "queued": True}
@@ -4,6 +4,7 @@ from .intent import (
     InputParameter,
     Intent,
     IntentBase,
+    IntentBatchRequest,
     IntentCreate,
     IntentUpdate,
     OutputParameter,
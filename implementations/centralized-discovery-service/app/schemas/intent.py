@@ -2,7 +2,8 @@
 
 from typing import List, Optional, Union
 
-from pydantic import BaseModel, ConfigDict
+from app.config import settings
+from pydantic import BaseModel, ConfigDict, Field
 
 from .tag import Tag, TagCreate
 
@@ -50,3 +51,10 @@ class Intent(IntentBase):
     id: int
     service_id: int
     model_config = ConfigDict(from_attributes=True)
+
+
+class IntentBatchRequest(BaseModel):
+    # Bounded while validating the body, before any UID is looked up
+    intent_uids: List[str] = Field(
+        ..., min_length=1, max_length=settings.BATCH_MAX_UIDS
+    )
@@ -0,0 +1,198 @@
+# app/services/catalog_index.py
+
+import logging
+import threading
+import time
+from typing import Optional, Sequence
+
+from app.config import settings
+from app.crud.changes import (
+    iter_changes_since,
+    latest_change_revision,
+    oldest_change_revision,
+)
+from app.crud.hooks import IntentListener, IntentSnapshot, catalog_revision
+from app.database import snapshot_reads
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+# Builds tried when changes keep being committed during one (only possible on
+# databases without snapshot reads)
+REBUILD_ATTEMPTS = 3
+
+
+class CatalogIndex(IntentListener):
+    """Base of the in-memory indexes over the intent catalog.
+
+    An index reflects the catalog as of ``revision``, the ID of the last
+    ``catalog_changes`` row applied to it. Changes committed by this process
+    reach it through the CRUD hooks; changes committed by other processes
+    (other workers, the crawler) are read from the change log by
+    ``ensure_ready`` before the index serves a lookup.
+
+    Subclasses hold the lock while reading and implement ``_build``,
+    ``_clear``, ``_add`` and ``_remove``.
+    """
+
+    def __init__(self):
+        self.ready = False
+        self.revision = 0
+        self._lock = threading.RLock()
+        self._synced_at = 0.0
+        self._synced_catalog_revision: Optional[int] = None
+
+    def _build(self, db: Session):
+        """Replace the contents with the catalog read from ``db``."""
+        raise NotImplementedError
+
+    def _clear(self):
+        """Drop all entries."""
+        raise NotImplementedError
+
+    def _add(self, intent: IntentSnapshot):
+        """Index ``intent``."""
+        raise NotImplementedError
+
+    def _remove(self, intent: IntentSnapshot):
+        """Remove ``intent``, as captured when it was indexed."""
+        raise NotImplementedError
+
+    def rebuild(self, db: Session):
+        """Load the whole catalog from the database.
+
+        The catalog and its revision are read in one snapshot, so no change
+        committed meanwhile is missed or applied twice by ``catch_up``.
+        """
+        with self._lock, snapshot_reads(db) as reads:
+            seen = catalog_revision()
+            for _ in range(REBUILD_ATTEMPTS):
+                revision = latest_change_revision(reads)
+                self._build(reads)
+                if latest_change_revision(reads) == revision:
+                    break
+            else:
+                logger.warning(f"{type(self).__name__} built during ongoing writes")
+            self._mark_ready(revision, seen)
+
+    def _mark_ready(self, revision: int, seen: Optional[int] = None):
+        self.revision = revision
+        self.ready = True
+        self._synced(seen)
+
+    def ensure_ready(self, db: Session):
+        """Build the index on first use, then keep it up with the change log.
+
+        The log is read when the catalog revision has moved (always, for
+        writes in this process, and for writes on this host with
+        ``CACHE_DIR`` set), and otherwise at most every
+        ``INDEX_SYNC_INTERVAL`` seconds.
+        """
+        if not self.ready:
+            with self._lock:
+                if not self.ready:
+                    self.rebuild(db)
+                    return
+        if (
+            catalog_revision() != self._synced_catalog_revision
+            or time.monotonic() - self._synced_at >= settings.INDEX_SYNC_INTERVAL
+        ):
+            self.catch_up(db)
+
+    def catch_up(self, db: Session) -> int:
+        """Apply the logged changes after ``revision``; returns their number."""
+        with self._lock:
+            return apply_changes_since(db, [self], self.revision)
+
+    def _synced(self, seen: Optional[int]):
+        self._synced_at = time.monotonic()
+        self._synced_catalog_revision = seen
+
+    def apply_change(
+        self,
+        revision: int,
+        current: Optional[IntentSnapshot],
+        previous: Optional[IntentSnapshot],
+    ):
+        """Apply logged change ``revision`` unless the index already reflects it."""
+        with self._lock:
+            if revision <= self.revision:
+                return
+            if previous is not None:
+                self._remove(previous)
+            if current is not None:
+                self._add(current)
+            self.revision = revision
+
+    def reset(self):
+        """Drop all entries; the next lookup rebuilds from the database."""
+        with self._lock:
+            self._clear()
+            self.ready = False
+            self.revision = 0
+            self._synced_catalog_revision = None
+
+    def intent_saved(
+        self,
+        intent: IntentSnapshot,
+        previous: Optional[IntentSnapshot],
+        revision: Optional[int] = None,
+    ) -> None:
+        """Index a created or updated intent."""
+        self._notified(revision, intent, previous)
+
+    def intent_deleted(
+        self, intent: IntentSnapshot, revision: Optional[int] = None
+    ) -> None:
+        """Remove a deleted intent from the index."""
+        self._notified(revision, None, intent)
+
+    def _notified(
+        self,
+        revision: Optional[int],
+        current: Optional[IntentSnapshot],
+        previous: Optional[IntentSnapshot],
+    ):
+        if not self.ready:
+            return
+        with self._lock:
+            if revision is None:
+                if previous is not None:
+                    self._remove(previous)
+                if current is not None:
+                    self._add(current)
+            elif revision == self.revision + 1:
+                self.apply_change(revision, current, previous)
+            # Otherwise changes committed elsewhere come first; the next
+            # ensure_ready applies them and this one in log order.
+
+
+def apply_changes_since(
+    db: Session, indexes: Sequence[CatalogIndex], revision: Optional[int] = None
+) -> int:
+    """Apply the changes logged after ``revision`` to ``indexes`` in one pass.
+
+    ``revision`` defaults to, and must not be later than, the oldest revision
+    of the indexes; each index skips the changes it already reflects. Indexes
+    whose unapplied changes may have been pruned from the log are rebuilt
+    instead. Returns the number of changes read.
+    """
+    indexes = [index for index in indexes if index.ready]
+    if not indexes:
+        return 0
+    if revision is None:
+        revision = min(index.revision for index in indexes)
+    seen = catalog_revision()
+    read = 0
+    for change, current, previous in iter_changes_since(db, revision):
+        if not read and change > revision + 1:
+            if oldest_change_revision(db) == change:
+                for index in indexes:
+                    if index.revision + 1 < change:
+                        index.rebuild(db)
+        for index in indexes:
+            index.apply_change(change, current, previous)
+        read += 1
+    for index in indexes:
+        index._synced(seen)
+    return read
@@ -1,15 +1,16 @@
 # app/services/crawler.py
 
 import asyncio
+import itertools
+import json
 import logging
-from typing import Any, Dict, List
+import os
+from typing import Any, Dict, Iterable, Iterator, List, Optional
 
 import aiohttp
 import dns.asyncresolver
-from app.crud.intent import create_intent
-from app.crud.service import create_service, get_service_by_name
-from app.schemas.intent import IntentCreate
-from app.schemas.service import ServiceCreate
+from app.crud.service import upsert_service
+from app.schemas.service import AgentsJson, ServiceCreate
 from sqlalchemy.orm import Session
 
 logger = logging.getLogger(__name__)
@@ -51,19 +52,23 @@ class Crawler:
     def process_agents_json(self, agents_json_data: Dict[str, Any]):
         """Process the agents.json data."""
         try:
-            service_info = agents_json_data["service_info"]
-            service_data = ServiceCreate(**service_info)
-            service = get_service_by_name(self.db_session, service_info["name"])
-            if not service:
-                service = create_service(self.db_session, service_data)
-            for intent_data in agents_json_data["intents"]:
-                create_intent(self.db_session, IntentCreate(**intent_data), service.id)
-            self.db_session.commit()
+            ingest_agents_json(self.db_session, AgentsJson(**agents_json_data))
         except Exception as e:
             logger.error(f"Error saving agents.json data: {e}")
             self.db_session.rollback()
 
 
+def ingest_agents_json(db: Session, agents_json: AgentsJson):
+    """Create or update a service and its intents from a validated agents.json.
+
+    Shared by the crawler and pushed registrations. The service info and the
+    intents are committed in one transaction. Raises on database errors; the
+    caller rolls back.
+    """
+    service_info = ServiceCreate(**agents_json.service_info.model_dump())
+    upsert_service(db, service_info, agents_json.intents)
+
+
 async def get_agents_json_url_from_dns(domain: str) -> str:
     """Fetch the agents.json URL from DNS TXT records."""
     try:
@@ -79,6 +84,99 @@ async def get_agents_json_url_from_dns(domain: str) -> str:
         return None
 
 
+class CrawlCheckpoint:
+    """Persist crawl progress to disk so an interrupted run can resume."""
+
+    def __init__(self, path: str, source: str):
+        self.path = path
+        self.source = source
+
+    def load(self) -> int:
+        """Return the number of domains already processed for this source."""
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                state = json.load(f)
+        except FileNotFoundError:
+            return 0
+        except (OSError, ValueError) as e:
+            logger.error(f"Ignoring unreadable checkpoint {self.path}: {e}")
+            return 0
+        if state.get("source") != self.source:
+            logger.warning(
+                f"Checkpoint {self.path} belongs to {state.get('source')!r}, "
+                f"not {self.source!r}; starting from the beginning"
+            )
+            return 0
+        return int(state.get("processed", 0))
+
+    def save(self, processed: int):
+        """Atomically record the number of processed domains."""
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"source": self.source, "processed": processed}, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+
+    def clear(self):
+        """Remove the checkpoint file."""
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+
+def iter_domains(lines: Iterable[str]) -> Iterator[str]:
+    """Yield domain names from an input stream, skipping blanks and comments."""
+    for line in lines:
+        domain = line.strip()
+        if domain and not domain.startswith("#"):
+            yield domain
+
+
+async def crawl_stream(
+    domains: Iterable[str],
+    db_session: Session,
+    batch_size: int = 100,
+    checkpoint: Optional[CrawlCheckpoint] = None,
+    checkpoint_interval: int = 1000,
+) -> int:
+    """Crawl domains from an iterable in bounded batches.
+
+    Domains are consumed lazily, so the input can be larger than memory. When a
+    checkpoint is given, already processed domains are skipped and progress is
+    saved every ``checkpoint_interval`` domains. Returns the total number of
+    domains processed, including those skipped on resume.
+    """
+    crawler = Crawler(domains=[], db_session=db_session)
+    processed = checkpoint.load() if checkpoint else 0
+    if processed:
+        logger.info(f"Resuming crawl after {processed} domains")
+    remaining = itertools.islice(iter(domains), processed, None)
+    last_saved = processed
+
+    while True:
+        batch = list(itertools.islice(remaining, batch_size))
+        if not batch:
+            break
+        results = await asyncio.gather(
+            *(crawler.process_domain(domain) for domain in batch),
+            return_exceptions=True,
+        )
+        for domain, result in zip(batch, results):
+            if isinstance(result, Exception):
+                logger.error(f"Error crawling {domain}: {result}")
+        processed += len(batch)
+        if checkpoint and processed - last_saved >= checkpoint_interval:
+            checkpoint.save(processed)
+            last_saved = processed
+            logger.info(f"Checkpoint saved after {processed} domains")
+
+    if checkpoint:
+        checkpoint.save(processed)
+    return processed
+
+
 async def start_crawler(domains: List[str], db_session: Session):
     """Start the crawler for a list of domains."""
     crawler = Crawler(domains=domains, db_session=db_session)
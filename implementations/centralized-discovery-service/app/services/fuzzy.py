@@ -0,0 +1,257 @@
+# app/services/fuzzy.py
+
+import logging
+from typing import Dict, List, Optional, Set, Tuple
+
+from app.crud.hooks import IntentSnapshot, register_listener
+from app.models import Intent, Tag
+from app.models.intent import intent_tags
+from app.services.catalog_index import CatalogIndex
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+MAX_DISTANCE = 2
+# Deletes are generated from this many leading and trailing characters only,
+# which bounds the dictionary size; candidates are verified on the full term
+PREFIX_LENGTH = 7
+
+
+def edit_distance(a: str, b: str, max_distance: int) -> int:
+    """Return the optimal string alignment distance, capped at max_distance + 1.
+
+    Adjacent transpositions count as one edit. Common prefixes and suffixes
+    are skipped, only the band of cells within ``max_distance`` of the
+    diagonal is computed, and rows whose minimum already exceeds
+    ``max_distance`` stop the computation early.
+    """
+    if a == b:
+        return 0
+    capped = max_distance + 1
+    len_a, len_b = len(a), len(b)
+    if abs(len_a - len_b) > max_distance:
+        return capped
+    start = 0
+    while start < len_a and start < len_b and a[start] == b[start]:
+        start += 1
+    while len_a > start and len_b > start and a[len_a - 1] == b[len_b - 1]:
+        len_a -= 1
+        len_b -= 1
+    a, b = a[start:len_a], b[start:len_b]
+    len_a -= start
+    len_b -= start
+    if not len_a or not len_b:
+        return min(len_a + len_b, capped)
+
+    # Cells further than max_distance from the diagonal stay at the cap
+    previous2 = None
+    previous = [j if j < capped else capped for j in range(len_b + 1)]
+    for i in range(1, len_a + 1):
+        ca = a[i - 1]
+        current = [capped] * (len_b + 1)
+        current[0] = row_min = i if i < capped else capped
+        left = current[0]
+        first = i - max_distance if i > max_distance else 1
+        last = i + max_distance if i + max_distance < len_b else len_b
+        for j in range(first, last + 1):
+            cb = b[j - 1]
+            value = previous[j - 1] if ca == cb else previous[j - 1] + 1
+            if previous[j] < value:
+                value = previous[j] + 1
+            if left < value:
+                value = left + 1
+            if (
+                previous2 is not None
+                and j > 1
+                and ca == b[j - 2]
+                and a[i - 2] == cb
+                and previous2[j - 2] < value
+            ):
+                value = previous2[j - 2] + 1
+            if value > capped:
+                value = capped
+            current[j] = left = value
+            if value < row_min:
+                row_min = value
+        if row_min > max_distance:
+            return capped
+        previous2, previous = previous, current
+    return previous[-1]
+
+
+def _deletes(word: str, max_distance: int) -> Set[str]:
+    """Return ``word`` and every string reachable by up to ``max_distance``
+    deletions."""
+    results = {word}
+    frontier = {word}
+    for _ in range(max_distance):
+        frontier = {w[:i] + w[i + 1 :] for w in frontier for i in range(len(w))}
+        results |= frontier
+    return results
+
+
+class SymSpellDictionary:
+    """SymSpell deletion dictionary over lowercase terms.
+
+    Each term is registered under every delete of its prefix and of its
+    suffix. A term within the edit distance of a query shares a delete with it
+    at both ends, so a lookup only verifies the terms found through both
+    prefix and suffix deletes of the query; no scan over the vocabulary is
+    needed, even when many terms share a long prefix.
+    """
+
+    def __init__(
+        self, max_distance: int = MAX_DISTANCE, prefix_length: int = PREFIX_LENGTH
+    ):
+        self.max_distance = max_distance
+        self.prefix_length = prefix_length
+        self._terms: Dict[str, List] = {}
+        self._prefixes: Dict[str, List[str]] = {}
+        self._suffixes: Dict[str, List[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self._terms)
+
+    def _ends(self, key: str, max_distance: int):
+        yield self._prefixes, _deletes(key[: self.prefix_length], max_distance)
+        yield self._suffixes, _deletes(key[-self.prefix_length :], max_distance)
+
+    def load(self, counts: Dict[str, int]):
+        """Replace the contents with ``counts`` of display text to popularity."""
+        self._terms = {}
+        self._prefixes = {}
+        self._suffixes = {}
+        for text, count in counts.items():
+            self.add(text, count)
+
+    def add(self, text: str, count: int = 1):
+        """Increase the popularity of ``text``, inserting it if needed."""
+        key = text.lower()
+        entry = self._terms.get(key)
+        if entry is not None:
+            entry[1] += count
+            return
+        self._terms[key] = [text, count]
+        for index, deletes in self._ends(key, self.max_distance):
+            for delete in deletes:
+                index.setdefault(delete, []).append(key)
+
+    def remove(self, text: str, count: int = 1):
+        """Decrease the popularity of ``text``, dropping it at zero."""
+        key = text.lower()
+        entry = self._terms.get(key)
+        if entry is None:
+            return
+        entry[1] -= count
+        if entry[1] > 0:
+            return
+        del self._terms[key]
+        for index, deletes in self._ends(key, self.max_distance):
+            for delete in deletes:
+                keys = index.get(delete)
+                if keys is None:
+                    continue
+                keys.remove(key)
+                if not keys:
+                    del index[delete]
+
+    def lookup(
+        self, query: str, max_distance: Optional[int] = None, k: int = 10
+    ) -> List[Tuple[str, int, int]]:
+        """Return up to ``k`` (text, distance, count) within ``max_distance``.
+
+        Closest terms come first, ties broken by popularity.
+        """
+        if max_distance is None:
+            max_distance = self.max_distance
+        max_distance = min(max_distance, self.max_distance)
+        query = query.lower()
+
+        candidates = None
+        for index, deletes in self._ends(query, max_distance):
+            found = set()
+            for delete in deletes:
+                keys = index.get(delete)
+                if keys:
+                    found.update(keys)
+            candidates = found if candidates is None else candidates & found
+
+        matches = []
+        length = len(query)
+        for key in candidates:
+            if abs(len(key) - length) > max_distance:
+                continue
+            distance = edit_distance(query, key, max_distance)
+            if distance <= max_distance:
+                text, count = self._terms[key]
+                matches.append((text, distance, count))
+        matches.sort(key=lambda m: (m[1], -m[2], m[0]))
+        return matches[:k]
+
+
+class FuzzyIndex(CatalogIndex):
+    """Typo-tolerant lookup of intent names and tags.
+
+    Built from the database on first use and then kept current through the
+    CRUD hooks and the change log, like the typeahead index.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.names = SymSpellDictionary()
+        self.tags = SymSpellDictionary()
+
+    def _build(self, db: Session):
+        self.names.load(
+            dict(
+                db.query(Intent.intent_name, func.count(Intent.id)).group_by(
+                    Intent.intent_name
+                )
+            )
+        )
+        self.tags.load(
+            dict(
+                db.query(Tag.name, func.count(intent_tags.c.intent_id))
+                .join(intent_tags, intent_tags.c.tag_id == Tag.id)
+                .group_by(Tag.name)
+            )
+        )
+        logger.info(
+            f"Fuzzy index built with {len(self.names)} names "
+            f"and {len(self.tags)} tags"
+        )
+
+    def load(
+        self, name_counts: Dict[str, int], tag_counts: Dict[str, int], revision: int = 0
+    ):
+        """Replace the contents with popularity counts as of ``revision``."""
+        with self._lock:
+            self.names.load(name_counts)
+            self.tags.load(tag_counts)
+            self._mark_ready(revision)
+
+    def _clear(self):
+        self.names = SymSpellDictionary()
+        self.tags = SymSpellDictionary()
+
+    def correct(
+        self, term: str, k: int = 10
+    ) -> Tuple[List[Tuple[str, int, int]], List[Tuple[str, int, int]]]:
+        """Return the intent names and tags close to ``term``."""
+        with self._lock:
+            return self.names.lookup(term, k=k), self.tags.lookup(term, k=k)
+
+    def _add(self, intent: IntentSnapshot):
+        self.names.add(intent.intent_name)
+        for tag in intent.tags:
+            self.tags.add(tag)
+
+    def _remove(self, intent: IntentSnapshot):
+        self.names.remove(intent.intent_name)
+        for tag in intent.tags:
+            self.tags.remove(tag)
+
+
+fuzzy_index = FuzzyIndex()
+register_listener(fuzzy_index)
@@ -1,46 +1,214 @@
 # app/services/nlp.py
 
 import logging
-from typing import List
+import threading
+import time
+from typing import List, Optional, Tuple
 
-from app.models.intent import Intent
-from sqlalchemy import func, or_
+from app.config import settings
+from app.crud.hooks import catalog_revision
+from app.crud.intent import get_intents_by_ids
+from app.crud.signature import canonical_filter
+from app.crud.stats import order_by_popularity
+from app.crud.terms import has_unanalyzed_intents, terms_filter, unanalyzed_filter
+from app.models import Intent, Tag
+from app.services.fuzzy import fuzzy_index
+from app.services.popularity import popularity
+from app.services.query_cache import search_cache
+from app.utils.admission import is_statement_timeout
+from app.utils.analysis import detect_language, get_analyzer, query_stems, tokenize
+from app.utils.profiling import current_profile, phase
+from app.utils.serialization import INTENT_FIELDS
+from sqlalchemy import and_, or_
 from sqlalchemy.orm import Session
 
 logger = logging.getLogger(__name__)
 
+# Words shorter than this match nearly every row and are not searched for
+MIN_TERM_LENGTH = 3
+# Fuzzy names and tags considered per query term
+FUZZY_CANDIDATES = 5
+
+
+def query_terms(query: str, language: Optional[str] = None) -> List[str]:
+    """Return the distinct searchable words of ``query``, capped in number.
+
+    Stopwords of ``language``, or of the language detected from the query,
+    are dropped.
+    """
+    tokens = tokenize(query)
+    language = language or detect_language(tokens)
+    stopwords = get_analyzer(language).stopwords if language else frozenset()
+    terms = []
+    for word in tokens:
+        if len(word) >= MIN_TERM_LENGTH and word not in stopwords and word not in terms:
+            terms.append(word)
+    return terms[: settings.SEARCH_MAX_TERMS]
+
+
+class TermCoverage:
+    """Whether every intent has analyzed terms, rechecked every ``INDEX_SYNC_INTERVAL``.
+
+    Intents written past the CRUD layer have no terms until provisioning
+    backfills them. Until then, search matches them by substring as it did
+    before terms existed. While no such intent exists it skips that scan.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._complete = True
+        self._checked_at: Optional[float] = None
+
+    def complete(self, db: Session) -> bool:
+        """Return whether every intent had terms when last checked."""
+        with self._lock:
+            now = time.monotonic()
+            if (
+                self._checked_at is None
+                or now - self._checked_at >= settings.INDEX_SYNC_INTERVAL
+            ):
+                complete = not has_unanalyzed_intents(db)
+                if self._complete and not complete:
+                    logger.warning(
+                        "Some intents have no search terms; run scripts/provision.py"
+                    )
+                self._complete, self._checked_at = complete, now
+            return self._complete
+
+    def reset(self):
+        """Forget the last check."""
+        with self._lock:
+            self._complete = True
+            self._checked_at = None
+
+
+term_coverage = TermCoverage()
+
+
+def popularity_epoch() -> int:
+    """Return the number of the popularity flush interval under way.
+
+    Part of the cache key of ranked results, so a cached ranking is used for
+    at most one ``POPULARITY_FLUSH_INTERVAL`` and then recomputed with the
+    counts flushed meanwhile, which do not move the catalog revision.
+    """
+    interval = settings.POPULARITY_FLUSH_INTERVAL
+    return int(time.time() // interval) if interval > 0 else 0
+
+
+def _search_intent_ids(
+    db: Session,
+    terms: List[str],
+    skip: int,
+    limit: int,
+    collapse: bool = False,
+    language: Optional[str] = None,
+) -> List[int]:
+    """Return the IDs of the intents matching any of ``terms`` for one page.
+
+    Terms are stemmed like the indexed ``intent_terms`` and looked up by
+    index, on every database. Intents without terms match a term anywhere in
+    their name or description.
+    """
+    with phase("build"):
+        match = terms_filter(query_stems(terms, language))
+        if not term_coverage.complete(db):
+            substrings = [
+                column.ilike(f"%{word}%")
+                for word in terms
+                for column in (Intent.description, Intent.intent_name)
+            ]
+            match = or_(match, and_(unanalyzed_filter(), or_(*substrings)))
+        query = db.query(Intent.id).filter(match)
+        if collapse:
+            query = query.filter(canonical_filter())
+        query = order_by_popularity(query).offset(skip).limit(limit)
+    with phase("fetch"):
+        rows = query.all()
+    return [row.id for row in rows]
+
+
+def _fuzzy_intent_ids(
+    db: Session, terms: List[str], skip: int, limit: int, collapse: bool = False
+) -> List[int]:
+    """Return one page of intents whose name or tags are close to ``terms``."""
+    fuzzy_index.ensure_ready(db)
+    candidates = list(terms)
+    if len(terms) > 1:
+        # "serch property" should also find "SearchProperty"
+        candidates.append("".join(terms))
+
+    names, tags = set(), set()
+    for term in candidates:
+        matched_names, matched_tags = fuzzy_index.correct(term, k=FUZZY_CANDIDATES)
+        names.update(text for text, _, _ in matched_names)
+        tags.update(text for text, _, _ in matched_tags)
+    if not names and not tags:
+        return []
+
+    filters = []
+    if names:
+        filters.append(Intent.intent_name.in_(names))
+    if tags:
+        filters.append(Intent.tags.any(Tag.name.in_(tags)))
+    query = db.query(Intent.id).filter(or_(*filters))
+    if collapse:
+        query = query.filter(canonical_filter())
+    query = order_by_popularity(query).offset(skip).limit(limit)
+    with phase("fetch"):
+        rows = query.all()
+    return [row.id for row in rows]
+
 
 def process_natural_language_query(
-    db: Session, query: str, skip: int = 0, limit: int = 10
+    db: Session,
+    query: str,
+    skip: int = 0,
+    limit: int = 10,
+    fields: Tuple[str, ...] = INTENT_FIELDS,
+    collapse: bool = False,
+    language: Optional[str] = None,
 ) -> List[Intent]:
-    """Process a natural language query to search for intents."""
+    """Process a natural language query to search for intents.
+
+    The ranked IDs of each page are cached by normalized query terms, so a
+    repeated query costs a single primary-key fetch. Matches are ranked by
+    popularity, and cached rankings last one popularity flush interval.
+    Queries without any match fall back to intents whose name or tags are
+    within two typos. With ``collapse`` only the canonical intent of each
+    near-duplicate cluster is returned. A declared ``language`` selects the
+    stopwords and stemmer of the query; otherwise the words are stemmed for
+    every supported language.
+    """
     try:
-        # Get database dialect
-        dialect = db.bind.dialect.name
-
-        if dialect == "postgresql":
-            # Using PostgreSQL full-text search
-            intents = (
-                db.query(Intent)
-                .filter(func.to_tsvector("english", Intent.description).match(query))
-                .offset(skip)
-                .limit(limit)
-                .all()
-            )
-        else:
-            # Fallback for SQLite and other databases
-            # Split query into words and search for each word
-            query_words = query.split()
-            filters = []
-            for word in query_words:
-                filters.append(Intent.description.ilike(f"%{word}%"))
-                filters.append(Intent.intent_name.ilike(f"%{word}%"))
-
-            intents = (
-                db.query(Intent).filter(or_(*filters)).offset(skip).limit(limit).all()
-            )
-
-        return intents
+        terms = query_terms(query, language)
+        if not terms:
+            return []
+
+        key = (
+            "nlp",
+            tuple(sorted(terms)),
+            skip,
+            limit,
+            collapse,
+            language,
+            popularity_epoch(),
+        )
+        # Explained requests always run their queries
+        ids = search_cache.get(key) if current_profile() is None else None
+        if ids is None:
+            revision = catalog_revision()
+            ids = _search_intent_ids(db, terms, skip, limit, collapse, language)
+            if not ids and (
+                skip == 0 or not _search_intent_ids(db, terms, 0, 1, collapse, language)
+            ):
+                ids = _fuzzy_intent_ids(db, terms, skip, limit, collapse)
+            search_cache.put(key, ids, revision)
+        popularity.record_hits(ids)
+        return get_intents_by_ids(db, list(ids), fields)
     except Exception as e:
+        if is_statement_timeout(e):
+            # Let the caller turn the timeout into a 503
+            raise
         logger.error(f"Error processing natural language query: {e}")
         return []
@@ -0,0 +1,133 @@
+# app/services/popularity.py
+
+import itertools
+import logging
+import threading
+from typing import Dict, Iterable, Tuple
+
+from app.config import settings
+from app.crud.stats import add_intent_stats
+from app.database import get_sessionmaker
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+
+class ShardedCounter:
+    """Per-key counts striped over shards to keep increments uncontended.
+
+    Each thread is pinned to one shard, so request threads rarely wait on the
+    same lock; ``drain`` swaps every shard out and merges them.
+    """
+
+    def __init__(self, shards: int = 16):
+        self._shards = [[threading.Lock(), {}] for _ in range(shards)]
+        self._next_shard = itertools.count()
+        self._local = threading.local()
+
+    def _shard(self) -> list:
+        shard = getattr(self._local, "shard", None)
+        if shard is None:
+            shard = self._shards[next(self._next_shard) % len(self._shards)]
+            self._local.shard = shard
+        return shard
+
+    def add(self, keys: Iterable[int], amount: int = 1):
+        """Add ``amount`` to the count of each of ``keys``."""
+        shard = self._shard()
+        with shard[0]:
+            counts = shard[1]
+            for key in keys:
+                counts[key] = counts.get(key, 0) + amount
+
+    def drain(self) -> Dict[int, int]:
+        """Return the counts accumulated since the last drain and reset them."""
+        merged: Dict[int, int] = {}
+        for shard in self._shards:
+            with shard[0]:
+                counts, shard[1] = shard[1], {}
+            for key, count in counts.items():
+                merged[key] = merged.get(key, 0) + count
+        return merged
+
+    def __bool__(self) -> bool:
+        return any(shard[1] for shard in self._shards)
+
+
+class PopularityTracker:
+    """Write-behind counters of intent fetches and search hits.
+
+    Reads only bump in-memory counters; ``flush`` adds the accumulated deltas
+    to the ``intent_stats`` table in one batched upsert. Each worker flushes
+    its own deltas, so the stored counts add up across processes.
+    """
+
+    def __init__(self):
+        self.fetches = ShardedCounter()
+        self.hits = ShardedCounter()
+
+    @property
+    def enabled(self) -> bool:
+        return settings.POPULARITY_FLUSH_INTERVAL > 0
+
+    def record_fetch(self, intent_id: int):
+        """Count a fetch of an intent by its UID."""
+        if self.enabled:
+            self.fetches.add((intent_id,))
+
+    def record_hits(self, intent_ids: Iterable[int]):
+        """Count the appearance of intents in a search result page."""
+        if self.enabled:
+            self.hits.add(intent_ids)
+
+    @property
+    def pending(self) -> bool:
+        """Whether there are counts waiting to be flushed."""
+        return bool(self.fetches) or bool(self.hits)
+
+    def drain(self) -> Dict[int, Tuple[int, int]]:
+        """Return and reset the pending (fetches, hits) per intent ID."""
+        fetches = self.fetches.drain()
+        hits = self.hits.drain()
+        return {
+            intent_id: (fetches.get(intent_id, 0), hits.get(intent_id, 0))
+            for intent_id in fetches.keys() | hits.keys()
+        }
+
+    def flush(self, db: Session) -> int:
+        """Write the pending counts to the database; returns the rows written.
+
+        If the write fails the counts are put back for the next flush.
+        """
+        pending = self.drain()
+        if not pending:
+            return 0
+        try:
+            written = add_intent_stats(db, pending)
+            db.commit()
+        except Exception:
+            db.rollback()
+            for intent_id, (fetches, hits) in pending.items():
+                self.fetches.add((intent_id,), fetches)
+                self.hits.add((intent_id,), hits)
+            raise
+        logger.debug(f"Flushed popularity counts of {written} intents")
+        return written
+
+    def reset(self):
+        """Drop all pending counts."""
+        self.drain()
+
+
+popularity = PopularityTracker()
+
+
+def flush_popularity():
+    """Flush the pending popularity counts through a primary session.
+
+    Run periodically by the background task supervisor.
+    """
+    if not popularity.pending:
+        return
+    with get_sessionmaker()() as db:
+        popularity.flush(db)
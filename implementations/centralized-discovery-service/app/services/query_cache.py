@@ -0,0 +1,73 @@
+# app/services/query_cache.py
+
+from array import array
+from typing import Hashable, List, Optional, Tuple
+
+from app.config import settings
+from app.crud.hooks import catalog_revision
+from app.utils.cache import CacheBackend, build_cache
+
+# Bytes per cached intent ID
+ID_SIZE = array("q").itemsize
+
+
+def id_list_size(value: bytes) -> int:
+    """Cost of a cached ID list: its number of IDs plus one."""
+    return len(value) // ID_SIZE + 1
+
+
+class QueryResultCache:
+    """Cache of ranked intent ID lists keyed by normalized queries.
+
+    Only IDs are stored, so cached pages always render current intent data.
+    Entries are stamped with the catalog revision: a bump invalidates them all,
+    and results computed under an older revision are never stored.
+    """
+
+    def __init__(self, backend: CacheBackend):
+        self.backend = backend
+        self.hits = 0
+        self.misses = 0
+        self._revision = catalog_revision()
+
+    def get(self, key: Hashable) -> Optional[Tuple[int, ...]]:
+        """Return the cached IDs for ``key``, or ``None`` on a miss."""
+        revision = self._current_revision()
+        value = self.backend.get(repr(key), revision)
+        if value is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return tuple(array("q", value))
+
+    def put(self, key: Hashable, ids: List[int], revision: int):
+        """Store ``ids`` computed while the catalog was at ``revision``."""
+        if revision != self._current_revision():
+            return
+        self.backend.set(repr(key), array("q", ids).tobytes(), revision)
+
+    def clear(self):
+        """Drop all entries and statistics."""
+        self.backend.clear()
+        self._revision = catalog_revision()
+        self.hits = 0
+        self.misses = 0
+
+    def _current_revision(self) -> int:
+        revision = catalog_revision()
+        if revision != self._revision:
+            # Reclaim the space of entries that can no longer be hit
+            self._revision = revision
+            self.backend.expire(revision)
+        return revision
+
+
+search_cache = QueryResultCache(
+    build_cache(
+        "search",
+        settings.SEARCH_CACHE_MAX_IDS,
+        sizeof=id_list_size,
+        cache_dir=settings.CACHE_DIR,
+        shared_max_entries=settings.SHARED_CACHE_MAX_ENTRIES,
+    )
+)
@@ -0,0 +1,139 @@
+# app/services/registration.py
+
+import hashlib
+import hmac
+import logging
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from app.config import settings
+from app.database import get_sessionmaker
+from app.schemas.service import AgentsJson
+from app.services.crawler import ingest_agents_json
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+# Writes of one push attempted before it is dropped
+MAX_ATTEMPTS = 3
+
+
+def push_key(service_name: str) -> str:
+    """Return the key with which ``service_name`` signs its pushes.
+
+    Keys are derived from ``WEBHOOK_SECRET``, so one service's key cannot be
+    used to push another service and no per-service key has to be stored.
+    """
+    return hmac.new(
+        settings.WEBHOOK_SECRET.encode(), service_name.encode(), hashlib.sha256
+    ).hexdigest()
+
+
+def sign_push(service_name: str, timestamp: str, body: bytes) -> str:
+    """Return the ``X-Push-Signature`` header value of a push."""
+    digest = hmac.new(
+        push_key(service_name).encode(),
+        timestamp.encode() + b"." + body,
+        hashlib.sha256,
+    ).hexdigest()
+    return f"sha256={digest}"
+
+
+def verify_push(service_name: str, timestamp: str, signature: str, body: bytes) -> bool:
+    """Check the signature of a push and that its timestamp is recent."""
+    if not settings.WEBHOOK_SECRET:
+        return False
+    try:
+        skew = abs(time.time() - int(timestamp))
+    except ValueError:
+        return False
+    if skew > settings.PUSH_MAX_SKEW:
+        return False
+    expected = sign_push(service_name, timestamp, body)
+    return hmac.compare_digest(expected.encode(), signature.encode())
+
+
+class PushQueue:
+    """Pending pushes keyed by service name; a later push replaces an earlier one.
+
+    A service pushing several times between two writes is written once, with
+    its latest agents.json.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pending: Dict[str, Tuple[AgentsJson, int]] = {}
+
+    def put(self, agents_json: AgentsJson) -> bool:
+        """Queue a push; returns ``False`` if too many services are pending."""
+        name = agents_json.service_info.name
+        with self._lock:
+            if (
+                name not in self._pending
+                and len(self._pending) >= settings.PUSH_QUEUE_MAX_SERVICES
+            ):
+                return False
+            self._pending[name] = (agents_json, 0)
+            return True
+
+    def drain(self) -> List[Tuple[AgentsJson, int]]:
+        """Take all pending pushes with the number of failed writes of each."""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        return list(pending.values())
+
+    def retry(self, agents_json: AgentsJson, attempts: int):
+        """Queue a push whose write failed, unless a newer one has arrived."""
+        if attempts >= MAX_ATTEMPTS:
+            logger.error(
+                f"Dropping push of {agents_json.service_info.name} "
+                f"after {attempts} failed writes"
+            )
+            return
+        with self._lock:
+            self._pending.setdefault(
+                agents_json.service_info.name, (agents_json, attempts)
+            )
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    def reset(self):
+        """Drop all pending pushes."""
+        self.drain()
+
+
+push_queue = PushQueue()
+
+
+def ingest_pushes(db: Session, queue: Optional[PushQueue] = None) -> int:
+    """Write the pending pushes; returns the services written."""
+    if queue is None:
+        queue = push_queue
+    written = 0
+    for agents_json, attempts in queue.drain():
+        try:
+            ingest_agents_json(db, agents_json)
+            written += 1
+        except Exception as e:
+            db.rollback()
+            logger.error(
+                f"Failed to ingest push of {agents_json.service_info.name}: {e}"
+            )
+            queue.retry(agents_json, attempts + 1)
+    if written:
+        logger.info(f"Ingested pushed agents.json of {written} services")
+    return written
+
+
+def flush_pushes():
+    """Write the pending pushes through a primary session.
+
+    Run every ``PUSH_BATCH_INTERVAL`` seconds by the background task supervisor.
+    """
+    if not push_queue.pending:
+        return
+    with get_sessionmaker()() as db:
+        ingest_pushes(db)
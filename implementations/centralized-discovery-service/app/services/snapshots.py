@@ -0,0 +1,212 @@
+# app/services/snapshots.py
+
+import logging
+import mmap
+import os
+import struct
+import tempfile
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from app.database import snapshot_reads
+from app.services.catalog_index import apply_changes_since
+from app.services.fuzzy import fuzzy_index
+from app.services.tag_index import Bitmap, TagBitmapIndex, tag_index
+from app.services.typeahead import TypeaheadIndex, typeahead_index
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"UIMIDX01"
+_HEADER = struct.Struct("<8sQI")  # magic, catalog revision, section count
+_SECTION = struct.Struct("<IQ")  # name length, payload length
+_U32 = struct.Struct("<I")
+_PAIR = struct.Struct("<II")
+
+# The in-memory indexes loaded from snapshots and kept up with the change log
+SEARCH_INDEXES = (typeahead_index, tag_index, fuzzy_index)
+
+
+class IndexSnapshot(NamedTuple):
+    """Contents of an index snapshot file."""
+
+    revision: int
+    names: Dict[str, int]
+    tags: Dict[str, int]
+    bitmaps: Dict[str, Bitmap]
+
+
+def _encode_counts(items: List[Tuple[str, int]]) -> bytes:
+    parts = [_U32.pack(len(items))]
+    for text, count in items:
+        data = text.encode("utf-8")
+        parts.append(_PAIR.pack(count, len(data)))
+        parts.append(data)
+    return b"".join(parts)
+
+
+def _encode_bitmaps(bitmaps: Dict[str, Bitmap]) -> bytes:
+    parts = [_U32.pack(len(bitmaps))]
+    for name, bitmap in bitmaps.items():
+        data = name.encode("utf-8")
+        parts.append(_PAIR.pack(len(data), len(bitmap.chunks)))
+        parts.append(data)
+        for key, bits in bitmap.chunks.items():
+            chunk = bits.to_bytes((bits.bit_length() + 7) // 8, "little")
+            parts.append(_PAIR.pack(key, len(chunk)))
+            parts.append(chunk)
+    return b"".join(parts)
+
+
+def _decode_counts(buf: memoryview, offset: int) -> Dict[str, int]:
+    (n,) = _U32.unpack_from(buf, offset)
+    offset += _U32.size
+    counts = {}
+    for _ in range(n):
+        count, length = _PAIR.unpack_from(buf, offset)
+        offset += _PAIR.size
+        counts[str(buf[offset : offset + length], "utf-8")] = count
+        offset += length
+    return counts
+
+
+def _decode_bitmaps(buf: memoryview, offset: int) -> Dict[str, Bitmap]:
+    (n,) = _U32.unpack_from(buf, offset)
+    offset += _U32.size
+    bitmaps = {}
+    for _ in range(n):
+        length, chunk_count = _PAIR.unpack_from(buf, offset)
+        offset += _PAIR.size
+        name = str(buf[offset : offset + length], "utf-8")
+        offset += length
+        chunks = {}
+        for _ in range(chunk_count):
+            key, size = _PAIR.unpack_from(buf, offset)
+            offset += _PAIR.size
+            chunks[key] = int.from_bytes(buf[offset : offset + size], "little")
+            offset += size
+        bitmaps[name] = Bitmap(chunks)
+    return bitmaps
+
+
+def write_snapshot(path: str, typeahead: TypeaheadIndex, tags: TagBitmapIndex):
+    """Atomically write the typeahead and tag indexes to ``path``.
+
+    The file is a fixed header stamped with the catalog change revision of
+    the indexes followed by length-prefixed sections, so readers can map it
+    and decode each section in place.
+    """
+    if typeahead.revision != tags.revision:
+        raise ValueError("Indexes at different revisions")
+    revision = typeahead.revision
+    sections = {
+        b"names": _encode_counts(typeahead.names.items()),
+        b"tags": _encode_counts(typeahead.tags.items()),
+        b"bitmaps": _encode_bitmaps(tags.bitmaps),
+    }
+    # A temporary file of its own, as workers on SQLite without CACHE_DIR may
+    # write the same snapshot at once
+    fd, tmp_path = tempfile.mkstemp(
+        dir=os.path.dirname(path) or ".", prefix=f"{os.path.basename(path)}."
+    )
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(_HEADER.pack(MAGIC, revision, len(sections)))
+            for name, payload in sections.items():
+                f.write(_SECTION.pack(len(name), len(payload)))
+                f.write(name)
+                f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def read_snapshot(path: str) -> Optional[IndexSnapshot]:
+    """Map and decode the snapshot at ``path``; ``None`` if missing or invalid."""
+    try:
+        with (
+            open(path, "rb") as f,
+            mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped,
+        ):
+            buf = memoryview(mapped)
+            try:
+                magic, revision, count = _HEADER.unpack_from(buf, 0)
+                if magic != MAGIC:
+                    raise ValueError("bad magic")
+                offset = _HEADER.size
+                sections = {}
+                for _ in range(count):
+                    name_length, payload_length = _SECTION.unpack_from(buf, offset)
+                    offset += _SECTION.size
+                    name = bytes(buf[offset : offset + name_length])
+                    offset += name_length
+                    sections[name] = offset
+                    offset += payload_length
+                if offset > len(buf):
+                    raise ValueError("truncated file")
+                return IndexSnapshot(
+                    revision=revision,
+                    names=_decode_counts(buf, sections[b"names"]),
+                    tags=_decode_counts(buf, sections[b"tags"]),
+                    bitmaps=_decode_bitmaps(buf, sections[b"bitmaps"]),
+                )
+            finally:
+                buf.release()
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError, KeyError, struct.error) as e:
+        logger.error(f"Ignoring unreadable index snapshot {path}: {e}")
+        return None
+
+
+def build_snapshot(db: Session, path: str) -> int:
+    """Build the search indexes from the database and snapshot them.
+
+    Returns the catalog change revision the snapshot is stamped with. The
+    indexes are built apart from the live ones of this process, in one
+    snapshot of the database where it supports it, and brought to the same
+    revision from the change log otherwise.
+    """
+    typeahead = TypeaheadIndex()
+    tags = TagBitmapIndex()
+    with snapshot_reads(db) as reads:
+        typeahead.rebuild(reads)
+        tags.rebuild(reads)
+        apply_changes_since(reads, [typeahead, tags])
+    write_snapshot(path, typeahead, tags)
+    logger.info(f"Index snapshot written to {path} at revision {typeahead.revision}")
+    return typeahead.revision
+
+
+def warm_start(db: Session, path: str) -> bool:
+    """Load the search indexes from a snapshot and replay later changes.
+
+    Returns ``False`` when there is no usable snapshot, in which case the
+    indexes are built lazily from the database as usual.
+    """
+    snapshot = read_snapshot(path)
+    if snapshot is None:
+        return False
+    typeahead_index.load(snapshot.names, snapshot.tags, snapshot.revision)
+    tag_index.load(snapshot.bitmaps, snapshot.revision)
+    # Fuzzy dictionaries hold the same name and tag counts as typeahead
+    fuzzy_index.load(snapshot.names, snapshot.tags, snapshot.revision)
+
+    replayed = apply_changes_since(db, SEARCH_INDEXES, snapshot.revision)
+    logger.info(
+        f"Search indexes loaded from {path} at revision {snapshot.revision}, "
+        f"replayed {replayed} changes"
+    )
+    return True
+
+
+def sync_indexes(db: Session) -> int:
+    """Apply the changes logged since the search indexes were last updated.
+
+    Run every ``INDEX_SYNC_INTERVAL`` seconds by the background task
+    supervisor, so lookups rarely have to read the log themselves. Indexes
+    not built yet are left to be built on first use.
+    """
+    return apply_changes_since(db, SEARCH_INDEXES)
@@ -0,0 +1,162 @@
+# app/services/supervisor.py
+
+import asyncio
+import logging
+import random
+import threading
+import time
+from contextlib import nullcontext
+from typing import Any, Callable, Dict, List, Optional
+
+from app.utils.locks import single_flight
+from fastapi.concurrency import run_in_threadpool
+
+logger = logging.getLogger(__name__)
+
+
+class PeriodicTask:
+    """A blocking job run every ``interval`` seconds, with its timing stats."""
+
+    def __init__(
+        self,
+        name: str,
+        func: Callable[[], Any],
+        interval: float,
+        jitter: float = 0.0,
+        single_flight: bool = False,
+        run_on_shutdown: bool = False,
+    ):
+        self.name = name
+        self.func = func
+        self.interval = interval
+        self.jitter = jitter
+        # Run by one worker at a time (jobs on shared state, like snapshots)
+        self.single_flight = single_flight
+        # Run once more on shutdown (jobs flushing per-worker buffers)
+        self.run_on_shutdown = run_on_shutdown
+        self._lock = threading.Lock()
+        self.runs = 0
+        self.failures = 0
+        self.skipped = 0
+        self.total_time = 0.0
+        self.max_time = 0.0
+        self.last_time: Optional[float] = None
+        self.last_started_at: Optional[float] = None
+        self.last_error: Optional[str] = None
+
+    def next_delay(self) -> float:
+        """Return the interval spread by up to ``jitter`` of it either way.
+
+        Jitter keeps workers started together from running in lockstep.
+        """
+        return self.interval * (1 + self.jitter * random.uniform(-1.0, 1.0))
+
+    def run_once(self) -> bool:
+        """Run the job now; returns ``False`` if another worker holds its lock.
+
+        Errors are logged and counted, never raised.
+        """
+        if self.single_flight:
+            lock = single_flight(f"task:{self.name}")
+        else:
+            lock = nullcontext(True)
+        with lock as acquired:
+            if not acquired:
+                with self._lock:
+                    self.skipped += 1
+                return False
+            started_at = time.time()
+            start = time.perf_counter()
+            error = None
+            try:
+                self.func()
+            except Exception as e:
+                error = f"{type(e).__name__}: {e}"
+                logger.exception(f"Background task {self.name} failed")
+            elapsed = time.perf_counter() - start
+        with self._lock:
+            self.runs += 1
+            self.total_time += elapsed
+            self.max_time = max(self.max_time, elapsed)
+            self.last_time = elapsed
+            self.last_started_at = started_at
+            if error is not None:
+                self.failures += 1
+                self.last_error = error
+        return True
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return the run counts and timings of the task."""
+        with self._lock:
+            return {
+                "interval": self.interval,
+                "single_flight": self.single_flight,
+                "runs": self.runs,
+                "failures": self.failures,
+                "skipped": self.skipped,
+                "last_started_at": self.last_started_at,
+                "last_error": self.last_error,
+                "last_ms": None if self.last_time is None else self.last_time * 1000,
+                "mean_ms": self.total_time / self.runs * 1000 if self.runs else None,
+                "max_ms": self.max_time * 1000,
+            }
+
+
+class TaskSupervisor:
+    """Runs periodic tasks for the lifetime of the app.
+
+    Each task has its own loop, so a slow job delays only itself. ``stop``
+    lets running jobs finish (for up to ``shutdown_timeout`` seconds) and then
+    runs the tasks marked ``run_on_shutdown`` one last time.
+    """
+
+    def __init__(self, shutdown_timeout: float = 10.0):
+        self.shutdown_timeout = shutdown_timeout
+        self.tasks: Dict[str, PeriodicTask] = {}
+        self._loops: List[asyncio.Task] = []
+        self._stopping: Optional[asyncio.Event] = None
+
+    def add(self, name: str, func: Callable[[], Any], interval: float, **options):
+        """Register a task; see ``PeriodicTask`` for the options."""
+        if name in self.tasks:
+            raise ValueError(f"Task {name} is already registered")
+        task = PeriodicTask(name, func, interval, **options)
+        self.tasks[name] = task
+        return task
+
+    def start(self):
+        """Start the loops of all tasks on the running event loop."""
+        self._stopping = asyncio.Event()
+        self._loops = [
+            asyncio.create_task(self._loop(task), name=f"task:{task.name}")
+            for task in self.tasks.values()
+        ]
+
+    async def _loop(self, task: PeriodicTask):
+        while True:
+            try:
+                await asyncio.wait_for(self._stopping.wait(), task.next_delay())
+                return
+            except asyncio.TimeoutError:
+                pass
+            await run_in_threadpool(task.run_once)
+
+    async def stop(self):
+        """Stop the loops gracefully and run the shutdown tasks."""
+        if self._stopping is not None:
+            self._stopping.set()
+        if self._loops:
+            _, pending = await asyncio.wait(self._loops, timeout=self.shutdown_timeout)
+            for loop in pending:
+                logger.warning(
+                    f"Background {loop.get_name()} still running on shutdown"
+                )
+                loop.cancel()
+            self._loops = []
+        for task in self.tasks.values():
+            if task.run_on_shutdown:
+                await run_in_threadpool(task.run_once)
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Return the stats of every task by name."""
+        return {name: task.snapshot() for name, task in self.tasks.items()}
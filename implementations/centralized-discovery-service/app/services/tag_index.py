@@ -0,0 +1,211 @@
+# app/services/tag_index.py
+
+import logging
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from app.crud.hooks import IntentSnapshot, register_listener
+from app.crud.intent import get_intents_by_ids
+from app.models import Intent, Tag
+from app.models.intent import intent_tags
+from app.services.catalog_index import CatalogIndex
+from app.utils.serialization import INTENT_FIELDS
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+# Intent IDs are split into containers of 2**16 like roaring bitmaps
+CHUNK_BITS = 16
+CHUNK_MASK = (1 << CHUNK_BITS) - 1
+
+
+class Bitmap:
+    """Set of intent IDs stored as Python-int bit arrays per 64K container.
+
+    Empty containers are never stored, so a rare tag on a large catalog costs
+    only the containers its intents fall into.
+    """
+
+    __slots__ = ("chunks",)
+
+    def __init__(self, chunks: Optional[Dict[int, int]] = None):
+        self.chunks: Dict[int, int] = chunks or {}
+
+    @classmethod
+    def from_ids(cls, ids: Iterable[int]) -> "Bitmap":
+        """Build a bitmap holding ``ids``."""
+        bitmap = cls()
+        for i in ids:
+            bitmap.add(i)
+        return bitmap
+
+    def __len__(self) -> int:
+        return sum(bits.bit_count() for bits in self.chunks.values())
+
+    def __contains__(self, i: int) -> bool:
+        return bool(self.chunks.get(i >> CHUNK_BITS, 0) >> (i & CHUNK_MASK) & 1)
+
+    def __iter__(self) -> Iterator[int]:
+        return self.iter_from(0)
+
+    def add(self, i: int):
+        """Add the ID ``i``."""
+        key = i >> CHUNK_BITS
+        self.chunks[key] = self.chunks.get(key, 0) | 1 << (i & CHUNK_MASK)
+
+    def discard(self, i: int):
+        """Remove the ID ``i`` if present, dropping emptied containers."""
+        key = i >> CHUNK_BITS
+        bits = self.chunks.get(key)
+        if bits is None:
+            return
+        bits &= ~(1 << (i & CHUNK_MASK))
+        if bits:
+            self.chunks[key] = bits
+        else:
+            del self.chunks[key]
+
+    def __and__(self, other: "Bitmap") -> "Bitmap":
+        small, large = sorted((self.chunks, other.chunks), key=len)
+        chunks = {}
+        for key, bits in small.items():
+            both = bits & large.get(key, 0)
+            if both:
+                chunks[key] = both
+        return Bitmap(chunks)
+
+    def __or__(self, other: "Bitmap") -> "Bitmap":
+        chunks = dict(self.chunks)
+        for key, bits in other.chunks.items():
+            chunks[key] = chunks.get(key, 0) | bits
+        return Bitmap(chunks)
+
+    def iter_from(self, skip: int) -> Iterator[int]:
+        """Yield the IDs in ascending order, skipping the first ``skip``."""
+        for key in sorted(self.chunks):
+            bits = self.chunks[key]
+            count = bits.bit_count()
+            if skip >= count:
+                # Whole containers are skipped without decoding them
+                skip -= count
+                continue
+            base = key << CHUNK_BITS
+            while bits:
+                low = bits & -bits
+                if skip:
+                    skip -= 1
+                else:
+                    yield base + low.bit_length() - 1
+                bits ^= low
+
+    def page(self, skip: int, limit: int) -> List[int]:
+        """Return up to ``limit`` IDs in ascending order after ``skip``."""
+        ids = []
+        if limit <= 0:
+            return ids
+        for i in self.iter_from(skip):
+            ids.append(i)
+            if len(ids) >= limit:
+                break
+        return ids
+
+
+class TagBitmapIndex(CatalogIndex):
+    """A bitmap of intent IDs per tag name for AND/OR tag filtering.
+
+    The index is built from the database on first use and then kept current
+    through the CRUD hooks and the change log.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.bitmaps: Dict[str, Bitmap] = {}
+
+    def _build(self, db: Session):
+        bitmaps: Dict[str, Bitmap] = {}
+        rows = db.query(intent_tags.c.intent_id, Tag.name).join(
+            Tag, Tag.id == intent_tags.c.tag_id
+        )
+        for intent_id, name in rows:
+            bitmap = bitmaps.get(name)
+            if bitmap is None:
+                bitmap = bitmaps[name] = Bitmap()
+            bitmap.add(intent_id)
+        self.bitmaps = bitmaps
+        logger.info(f"Tag index built with {len(self.bitmaps)} tags")
+
+    def load(self, bitmaps: Dict[str, Bitmap], revision: int = 0):
+        """Replace the contents with ``bitmaps`` as of ``revision``."""
+        with self._lock:
+            self.bitmaps = bitmaps
+            self._mark_ready(revision)
+
+    def _clear(self):
+        self.bitmaps = {}
+
+    def match(
+        self,
+        tags_all: Optional[List[str]] = None,
+        tags_any: Optional[List[str]] = None,
+    ) -> Bitmap:
+        """Return the intents with all of ``tags_all`` and any of ``tags_any``.
+
+        Intersections start from the tags spread over the fewest containers
+        and stop as soon as the result is empty.
+        """
+        with self._lock:
+            result = None
+            if tags_any:
+                result = Bitmap()
+                for name in tags_any:
+                    result = result | self.bitmaps.get(name, Bitmap())
+            for name in sorted(tags_all or [], key=self._containers):
+                bitmap = self.bitmaps.get(name, Bitmap())
+                if result is None:
+                    result = Bitmap(dict(bitmap.chunks))
+                else:
+                    result = result & bitmap
+                if not result.chunks:
+                    break
+            return result if result is not None else Bitmap()
+
+    def _containers(self, name: str) -> int:
+        bitmap = self.bitmaps.get(name)
+        return len(bitmap.chunks) if bitmap is not None else 0
+
+    def _add(self, intent: IntentSnapshot):
+        for name in intent.tags:
+            bitmap = self.bitmaps.get(name)
+            if bitmap is None:
+                bitmap = self.bitmaps[name] = Bitmap()
+            bitmap.add(intent.id)
+
+    def _remove(self, intent: IntentSnapshot):
+        for name in intent.tags:
+            bitmap = self.bitmaps.get(name)
+            if bitmap is None:
+                continue
+            bitmap.discard(intent.id)
+            if not bitmap.chunks:
+                del self.bitmaps[name]
+
+
+tag_index = TagBitmapIndex()
+register_listener(tag_index)
+
+
+def get_intents_by_tags(
+    db: Session,
+    tags_all: Optional[List[str]] = None,
+    tags_any: Optional[List[str]] = None,
+    skip: int = 0,
+    limit: int = 10,
+    fields: Tuple[str, ...] = INTENT_FIELDS,
+) -> List[Intent]:
+    """Return one page of intents matching the tag filters, ordered by ID.
+
+    The tag algebra runs on the in-memory index; only the page itself is
+    fetched from the database by primary key.
+    """
+    tag_index.ensure_ready(db)
+    ids = tag_index.match(tags_all, tags_any).page(skip, limit)
+    return get_intents_by_ids(db, ids, fields)
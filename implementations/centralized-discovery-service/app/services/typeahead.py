@@ -0,0 +1,160 @@
+# app/services/typeahead.py
+
+import heapq
+import logging
+from bisect import bisect_left, insort
+from typing import Dict, List, Tuple
+
+from app.crud.hooks import IntentSnapshot, register_listener
+from app.models import Intent, Tag
+from app.models.intent import intent_tags
+from app.services.catalog_index import CatalogIndex
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+# Prefixes matching more keys than this have their top-k results memoized
+MEMOIZE_RANGE = 64
+MEMO_MAX_ENTRIES = 10000
+
+
+class PrefixIndex:
+    """Sorted array of lowercase keys searched with bisect.
+
+    Each key keeps its display text and a popularity count; a prefix lookup is
+    two binary searches plus a top-k selection over the matching range.
+    """
+
+    def __init__(self):
+        self._keys: List[str] = []
+        self._entries: Dict[str, List] = {}
+        self._memo: Dict[Tuple[str, int], List[Tuple[str, int]]] = {}
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def load(self, counts: Dict[str, int]):
+        """Replace the contents with ``counts`` of display text to popularity."""
+        entries: Dict[str, List] = {}
+        for text, count in counts.items():
+            entry = entries.setdefault(text.lower(), [text, 0])
+            entry[1] += count
+        self._entries = entries
+        self._keys = sorted(entries)
+        self._memo = {}
+
+    def items(self) -> List[Tuple[str, int]]:
+        """Return all (text, count) pairs in key order."""
+        return [tuple(self._entries[key]) for key in self._keys]
+
+    def add(self, text: str, count: int = 1):
+        """Increase the popularity of ``text``, inserting it if needed."""
+        key = text.lower()
+        entry = self._entries.get(key)
+        if entry is None:
+            self._entries[key] = [text, count]
+            insort(self._keys, key)
+        else:
+            entry[1] += count
+        self._memo.clear()
+
+    def remove(self, text: str, count: int = 1):
+        """Decrease the popularity of ``text``, dropping it at zero."""
+        key = text.lower()
+        entry = self._entries.get(key)
+        if entry is None:
+            return
+        entry[1] -= count
+        if entry[1] <= 0:
+            del self._entries[key]
+            index = bisect_left(self._keys, key)
+            if index < len(self._keys) and self._keys[index] == key:
+                del self._keys[index]
+        self._memo.clear()
+
+    def search(self, prefix: str, k: int = 10) -> List[Tuple[str, int]]:
+        """Return up to ``k`` (text, count) pairs starting with ``prefix``."""
+        prefix = prefix.lower()
+        memo = self._memo.get((prefix, k))
+        if memo is not None:
+            return memo
+        lo = bisect_left(self._keys, prefix)
+        hi = bisect_left(self._keys, prefix + "\U0010ffff", lo)
+        keys, entries = self._keys, self._entries
+        matches = (entries[keys[i]] for i in range(lo, hi))
+        top = [tuple(e) for e in heapq.nlargest(k, matches, key=lambda e: e[1])]
+        if hi - lo > MEMOIZE_RANGE:
+            if len(self._memo) >= MEMO_MAX_ENTRIES:
+                self._memo.clear()
+            self._memo[(prefix, k)] = top
+        return top
+
+
+class TypeaheadIndex(CatalogIndex):
+    """Prefix indexes over intent names and tags, ranked by popularity.
+
+    The index is built from the database on first use and then kept current
+    through the CRUD hooks and the change log. Popularity is the number of
+    intents sharing a name or carrying a tag.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.names = PrefixIndex()
+        self.tags = PrefixIndex()
+
+    def _build(self, db: Session):
+        name_counts = dict(
+            db.query(Intent.intent_name, func.count(Intent.id)).group_by(
+                Intent.intent_name
+            )
+        )
+        tag_counts = dict(
+            db.query(Tag.name, func.count(intent_tags.c.intent_id))
+            .join(intent_tags, intent_tags.c.tag_id == Tag.id)
+            .group_by(Tag.name)
+        )
+        self.names.load(name_counts)
+        self.tags.load(tag_counts)
+        logger.info(
+            f"Typeahead index built with {len(self.names)} names "
+            f"and {len(self.tags)} tags"
+        )
+
+    def load(
+        self, name_counts: Dict[str, int], tag_counts: Dict[str, int], revision: int = 0
+    ):
+        """Replace the contents with popularity counts as of ``revision``."""
+        with self._lock:
+            self.names.load(name_counts)
+            self.tags.load(tag_counts)
+            self._mark_ready(revision)
+
+    def _clear(self):
+        self.names = PrefixIndex()
+        self.tags = PrefixIndex()
+
+    def suggest(self, prefix: str, k: int = 10) -> Dict[str, List[Dict]]:
+        """Return the top ``k`` intent names and tags starting with ``prefix``."""
+        with self._lock:
+            names = self.names.search(prefix, k)
+            tags = self.tags.search(prefix, k)
+        return {
+            "intents": [{"name": text, "count": count} for text, count in names],
+            "tags": [{"name": text, "count": count} for text, count in tags],
+        }
+
+    def _add(self, intent: IntentSnapshot):
+        self.names.add(intent.intent_name)
+        for tag in intent.tags:
+            self.tags.add(tag)
+
+    def _remove(self, intent: IntentSnapshot):
+        self.names.remove(intent.intent_name)
+        for tag in intent.tags:
+            self.tags.remove(tag)
+
+
+typeahead_index = TypeaheadIndex()
+register_listener(typeahead_index)
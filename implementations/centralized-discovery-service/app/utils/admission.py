@@ -0,0 +1,159 @@
+# app/utils/admission.py
+
+import asyncio
+import logging
+import math
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+from typing import Dict, List, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+# Messages of the errors raised when a statement timeout cancels a query
+_TIMEOUT_MESSAGES = ("canceling statement due to statement timeout", "interrupted")
+
+
+class Overloaded(Exception):
+    """Raised when a request cannot be admitted right now."""
+
+    def __init__(self, retry_after: float):
+        super().__init__(f"Overloaded, retry after {retry_after:.1f}s")
+        self.retry_after = retry_after
+
+
+class ConcurrencyLimiter:
+    """Bound the number of concurrent requests and the queue in front of them.
+
+    Requests beyond ``limit`` wait for a slot; once ``max_queue`` requests are
+    waiting, or a request waits longer than ``queue_timeout`` seconds, further
+    requests are shed with ``Overloaded``.
+    """
+
+    def __init__(self, limit: int, max_queue: int, queue_timeout: float):
+        self.limit = limit
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.waiting = 0
+        self._semaphore = None
+
+    @asynccontextmanager
+    async def slot(self):
+        """Hold one concurrency slot for the duration of the block."""
+        if self._semaphore is None:
+            # Created lazily so it binds to the serving event loop
+            self._semaphore = asyncio.Semaphore(self.limit)
+        if self._semaphore.locked() and self.waiting >= self.max_queue:
+            raise Overloaded(self.queue_timeout)
+        self.waiting += 1
+        acquire = asyncio.ensure_future(self._semaphore.acquire())
+        try:
+            await asyncio.wait_for(acquire, self.queue_timeout)
+        except asyncio.TimeoutError:
+            self._release_if_acquired(acquire)
+            raise Overloaded(self.queue_timeout)
+        except asyncio.CancelledError:
+            self._release_if_acquired(acquire)
+            raise
+        finally:
+            self.waiting -= 1
+        try:
+            yield
+        finally:
+            self._semaphore.release()
+
+    def _release_if_acquired(self, acquire: asyncio.Future):
+        # Before Python 3.12, wait_for can time out or be cancelled just after
+        # the acquire succeeded, which would otherwise leak the slot
+        if acquire.done() and not acquire.cancelled():
+            self._semaphore.release()
+
+
+class TokenBucketLimiter:
+    """In-memory token bucket per client.
+
+    Each client may burst up to ``burst`` requests and is refilled at ``rate``
+    requests per second. Buckets that have refilled completely are evicted
+    once more than ``max_clients`` are tracked.
+    """
+
+    def __init__(self, rate: float, burst: int, max_clients: int = 100000):
+        self.rate = rate
+        self.burst = burst
+        self.max_clients = max_clients
+        self._buckets: Dict[str, List[float]] = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, client: str) -> Tuple[bool, float]:
+        """Take a token for ``client``; return whether allowed and retry delay."""
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.get(client)
+            if bucket is None:
+                if len(self._buckets) >= self.max_clients:
+                    self._evict(now)
+                bucket = self._buckets[client] = [float(self.burst), now]
+            tokens = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+            bucket[1] = now
+            if tokens >= 1:
+                bucket[0] = tokens - 1
+                return True, 0.0
+            bucket[0] = tokens
+            return False, (1 - tokens) / self.rate
+
+    def _evict(self, now: float):
+        full_after = self.burst / self.rate
+        idle = [
+            key for key, (_, seen) in self._buckets.items() if now - seen > full_after
+        ]
+        for key in idle:
+            del self._buckets[key]
+
+
+def retry_after_header(seconds: float) -> Dict[str, str]:
+    """Return a ``Retry-After`` header for a delay in seconds."""
+    return {"Retry-After": str(max(1, math.ceil(seconds)))}
+
+
+def is_statement_timeout(error: Exception) -> bool:
+    """Return whether ``error`` was caused by a statement timeout."""
+    if not isinstance(error, DBAPIError):
+        return False
+    message = str(error.orig).lower()
+    return any(fragment in message for fragment in _TIMEOUT_MESSAGES)
+
+
+@contextmanager
+def statement_timeout(db: Session, timeout_ms: int):
+    """Cancel statements run through ``db`` that take longer than ``timeout_ms``.
+
+    PostgreSQL enforces the limit with ``SET LOCAL statement_timeout`` for the
+    current transaction. SQLite has no such setting, so a progress handler
+    aborts statements once the deadline has passed.
+    """
+    if timeout_ms <= 0:
+        yield
+        return
+
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        db.execute(text(f"SET LOCAL statement_timeout = {int(timeout_ms)}"))
+        yield
+    elif dialect == "sqlite":
+        raw = db.connection().connection.driver_connection
+        deadline = time.monotonic() + timeout_ms / 1000
+
+        def check_deadline():
+            return 1 if time.monotonic() > deadline else 0
+
+        raw.set_progress_handler(check_deadline, 1000)
+        try:
+            yield
+        finally:
+            raw.set_progress_handler(None, 0)
+    else:
+        yield
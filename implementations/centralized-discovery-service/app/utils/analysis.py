@@ -0,0 +1,299 @@
+# app/utils/analysis.py
+
+import re
+import unicodedata
+from typing import Callable, Dict, FrozenSet, Iterable, List, Optional, Set
+
+# Language of documents whose language cannot be detected
+DEFAULT_LANGUAGE = "en"
+# Terms are stored in a String(64) column
+MAX_TERM_LENGTH = 64
+# Stemmers never cut a word below this length
+MIN_STEM_LENGTH = 3
+
+_CAMEL = re.compile(r"([a-z0-9])([A-Z])")
+_TOKEN = re.compile(r"[^\W_]+")
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """Split ``text`` into lowercase words without accents.
+
+    camelCase and snake_case are split, so ``SearchProperty`` gives
+    ``search`` and ``property``.
+    """
+    if not text:
+        return []
+    text = unicodedata.normalize("NFKD", _CAMEL.sub(r"\1 \2", text).casefold())
+    text = "".join(char for char in text if not unicodedata.combining(char))
+    return _TOKEN.findall(text)
+
+
+def _strip(word: str, suffixes: Iterable[str]) -> str:
+    """Remove the first of ``suffixes`` (longest first) that ``word`` ends with."""
+    for suffix in suffixes:
+        if word.endswith(suffix) and len(word) - len(suffix) >= MIN_STEM_LENGTH:
+            return word[: -len(suffix)]
+    return word
+
+
+def _longest_first(*suffixes: str) -> tuple:
+    return tuple(sorted(suffixes, key=len, reverse=True))
+
+
+def stem_english(word: str) -> str:
+    """Light English stemmer: plurals, ``-ed``, ``-ing`` and a final ``y`` or ``e``.
+
+    Follows steps 1 and 5 of the Porter algorithm, so ``properties`` and
+    ``property`` both give ``properti``.
+    """
+    if len(word) <= MIN_STEM_LENGTH:
+        return word
+    if word.endswith("sses"):
+        word = word[:-2]
+    elif word.endswith("ies"):
+        word = word[:-3] + "i"
+    elif word.endswith("s") and not word.endswith(("ss", "us", "is")):
+        word = word[:-1]
+    for suffix in ("ing", "ed"):
+        stem = word[: -len(suffix)]
+        if (
+            word.endswith(suffix)
+            and len(stem) >= MIN_STEM_LENGTH
+            and any(char in "aeiouy" for char in stem)
+        ):
+            word = stem
+            if word.endswith(("at", "bl", "iz")):
+                word += "e"
+            elif word[-1] == word[-2] and word[-1] not in "lsz":
+                word = word[:-1]
+            elif (
+                len(word) == 3
+                and word[0] not in "aeiou"
+                and word[1] in "aeiou"
+                and word[2] not in "aeiouwxy"
+            ):
+                # hoping -> hope, like hopes
+                word += "e"
+            break
+    if word.endswith("y") and len(word) > MIN_STEM_LENGTH and word[-2] not in "aeiou":
+        word = word[:-1] + "i"
+    if word.endswith("e") and len(word) > 4:
+        word = word[:-1]
+    return word
+
+
+def stem_german(word: str) -> str:
+    """Light German stemmer (after Savoy's), on words with umlauts folded."""
+    if len(word) > 5 and word.endswith("ern"):
+        word = word[:-3]
+    elif len(word) > 4 and word.endswith(("em", "en", "er", "es")):
+        word = word[:-2]
+    elif len(word) > 3 and word.endswith("e"):
+        word = word[:-1]
+    elif len(word) > 3 and word.endswith("s") and word[-2] in "bdfghklmnrt":
+        word = word[:-1]
+    if len(word) > 5 and word.endswith("est"):
+        word = word[:-3]
+    elif len(word) > 4 and word.endswith(("er", "en")):
+        word = word[:-2]
+    elif len(word) > 4 and word.endswith("st") and word[-3] in "bdfghklmnt":
+        word = word[:-2]
+    return word
+
+
+_FRENCH_SUFFIXES = _longest_first(
+    "issement", "ement", "ment", "ation", "atrice", "ateur", "euse", "eux",
+    "ique", "isme", "iste", "able", "ible", "ite", "ive", "if", "eur", "ee",
+    "er", "ez", "e",
+)  # fmt: skip
+
+
+def stem_french(word: str) -> str:
+    """Light French stemmer: plurals, then common derivational and verb endings."""
+    if len(word) > 4 and word.endswith("aux"):
+        word = word[:-3] + "al"
+    elif len(word) > 3 and word.endswith(("s", "x")):
+        word = word[:-1]
+    return _strip(word, _FRENCH_SUFFIXES)
+
+
+_SPANISH_SUFFIXES = _longest_first(
+    "aciones", "acion", "amientos", "amiento", "mente", "idades", "idad",
+    "ados", "adas", "ado", "ada", "idos", "idas", "ido", "ida", "ando",
+    "iendo", "ar", "er", "ir", "es", "os", "as", "s", "o", "a", "e",
+)  # fmt: skip
+
+
+def stem_spanish(word: str) -> str:
+    """Light Spanish stemmer: plurals, gender, participles and infinitives."""
+    if len(word) > 4 and word.endswith("ces"):
+        word = word[:-3] + "z"
+    return _strip(word, _SPANISH_SUFFIXES)
+
+
+_ITALIAN_SUFFIXES = _longest_first(
+    "azioni", "azione", "mente", "ando", "endo", "are", "ere", "ire", "ato",
+    "ata", "ati", "ate", "ito", "iti", "ite", "ita", "i", "e", "a", "o",
+)  # fmt: skip
+
+
+def stem_italian(word: str) -> str:
+    """Light Italian stemmer: plurals, gender, participles and infinitives."""
+    if len(word) > 4 and word.endswith(("che", "chi", "ghe", "ghi")):
+        word = word[:-2]
+    return _strip(word, _ITALIAN_SUFFIXES)
+
+
+_PORTUGUESE_SUFFIXES = _longest_first(
+    "acoes", "acao", "mente", "idades", "idade", "ados", "adas", "ado", "ada",
+    "idos", "idas", "ido", "ida", "ando", "endo", "indo", "ar", "er", "ir",
+    "os", "as", "es", "s", "o", "a", "e",
+)  # fmt: skip
+
+
+def stem_portuguese(word: str) -> str:
+    """Light Portuguese stemmer: plurals, gender, participles and infinitives."""
+    if len(word) > 4 and word.endswith("oes"):
+        word = word[:-3] + "ao"
+    return _strip(word, _PORTUGUESE_SUFFIXES)
+
+
+def _words(text: str) -> FrozenSet[str]:
+    return frozenset(text.split())
+
+
+STOPWORDS: Dict[str, FrozenSet[str]] = {
+    "en": _words(
+        "a an and are as at be but by for from has have how i if in into is it "
+        "its me my of on or our that the their them they this to was we what "
+        "when where which who will with you your"
+    ),
+    "de": _words(
+        "aber als am an auch auf aus bei bin bis das dass dem den der des die "
+        "du durch ein eine einem einen einer eines es fur hat ich ihr im in "
+        "ist mit nach nicht noch oder sich sie sind so uber um und uns von vor "
+        "war wie wir wird zu zum zur"
+    ),
+    "fr": _words(
+        "a au aux avec ce ces dans de des du elle en est et il ils je la le les "
+        "leur lui mais me mes mon ne nous on ou par pas pour qu que qui sa se "
+        "ses son sur ta te tes ton tu un une vos votre vous"
+    ),
+    "es": _words(
+        "a al como con de del el ella en es esta este las le les lo los mas me "
+        "mi no o para pero por que se si sin su sus te tu un una uno y ya"
+    ),
+    "it": _words(
+        "a ad al alla alle che chi ci con da dal dalla dei del della di e gli "
+        "ha ho i il in la le lo ma mi ne nel nella non o per piu se si su sua "
+        "suo ti tra un una uno"
+    ),
+    "pt": _words(
+        "a ao aos as com como da das de do dos e ela ele em entre era esta eu "
+        "isso mais mas me na nao nas no nos o os ou para pela pelo por que se "
+        "sem seu sua um uma voce"
+    ),
+}
+
+
+class Analyzer:
+    """Turns text into the terms indexed and searched for one language."""
+
+    def __init__(
+        self, language: str, stopwords: FrozenSet[str], stemmer: Callable[[str], str]
+    ):
+        self.language = language
+        self.stopwords = stopwords
+        self.stemmer = stemmer
+
+    def stem(self, token: str) -> str:
+        return self.stemmer(token)[:MAX_TERM_LENGTH]
+
+    def analyze(self, text: Optional[str]) -> List[str]:
+        """Return the stems of the words of ``text`` that are not stopwords."""
+        return [
+            self.stem(token) for token in tokenize(text) if token not in self.stopwords
+        ]
+
+
+_analyzers: Dict[str, Analyzer] = {}
+
+
+def register_analyzer(analyzer: Analyzer):
+    """Add or replace the analyzer of ``analyzer.language``.
+
+    Terms are stored at write time, so replacing a stemmer requires the
+    ``intent_terms`` table to be rebuilt.
+    """
+    _analyzers[analyzer.language] = analyzer
+
+
+for _language, _stemmer in (
+    ("en", stem_english),
+    ("de", stem_german),
+    ("fr", stem_french),
+    ("es", stem_spanish),
+    ("it", stem_italian),
+    ("pt", stem_portuguese),
+):
+    register_analyzer(Analyzer(_language, STOPWORDS[_language], _stemmer))
+
+
+def languages() -> List[str]:
+    """Return the languages with an analyzer."""
+    return list(_analyzers)
+
+
+def get_analyzer(language: str) -> Analyzer:
+    """Return the analyzer of ``language``; raises ``ValueError`` if unknown."""
+    try:
+        return _analyzers[language]
+    except KeyError:
+        raise ValueError(f"Unsupported language: {language!r}") from None
+
+
+def detect_language(tokens: Iterable[str]) -> Optional[str]:
+    """Guess the language of ``tokens`` from the stopwords among them.
+
+    Returns ``None`` when no token is a stopword of any language; ties go to
+    ``DEFAULT_LANGUAGE``, then to the first registered language.
+    """
+    tokens = list(tokens)
+    scores = {
+        language: sum(token in analyzer.stopwords for token in tokens)
+        for language, analyzer in _analyzers.items()
+    }
+    best = max(scores.values(), default=0)
+    if best == 0:
+        return None
+    if scores.get(DEFAULT_LANGUAGE) == best:
+        return DEFAULT_LANGUAGE
+    return next(language for language, score in scores.items() if score == best)
+
+
+def document_terms(description: Optional[str], *texts: Optional[str]) -> Set[str]:
+    """Return the distinct terms indexed for a document.
+
+    The language is detected from ``description`` (falling back to
+    ``DEFAULT_LANGUAGE``) and used for ``texts`` as well.
+    """
+    tokens = tokenize(description)
+    analyzer = get_analyzer(detect_language(tokens) or DEFAULT_LANGUAGE)
+    for text in texts:
+        tokens.extend(tokenize(text))
+    return {
+        analyzer.stem(token)
+        for token in tokens
+        if len(token) > 1 and token not in analyzer.stopwords
+    }
+
+
+def query_stems(tokens: Iterable[str], language: Optional[str] = None) -> List[str]:
+    """Return the stems searched for the query words ``tokens``.
+
+    Without a declared ``language`` each word is stemmed for every language,
+    since queries are too short to detect their language reliably and must
+    match documents stemmed in theirs.
+    """
+    analyzers = [get_analyzer(language)] if language else list(_analyzers.values())
+    return sorted({analyzer.stem(token) for token in tokens for analyzer in analyzers})
@@ -0,0 +1,273 @@
+# app/utils/cache.py
+
+import logging
+import mmap
+import os
+import sqlite3
+import struct
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not available on Windows
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+
+class CacheBackend:
+    """Byte-string cache whose entries are stamped with a catalog revision.
+
+    ``get`` only returns values stored under the requested revision, so a
+    revision bump invalidates every entry at once; ``expire`` reclaims the
+    space held by entries of older revisions.
+    """
+
+    def get(self, key: str, revision: int) -> Optional[bytes]:
+        """Return the value of ``key`` stored under ``revision``, if any."""
+        raise NotImplementedError
+
+    def set(self, key: str, value: bytes, revision: int):
+        """Store ``value`` for ``key`` under ``revision``."""
+        raise NotImplementedError
+
+    def expire(self, revision: int):
+        """Drop entries stored under revisions older than ``revision``."""
+
+    def clear(self):
+        """Drop all entries."""
+        raise NotImplementedError
+
+
+class LRUCache(CacheBackend):
+    """In-process LRU tier bounded by the total ``sizeof`` of its values."""
+
+    def __init__(self, max_size: int, sizeof: Callable[[bytes], int] = len):
+        self.max_size = max_size
+        self.sizeof = sizeof
+        self._entries: "OrderedDict[str, Tuple[int, bytes]]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str, revision: int) -> Optional[bytes]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != revision:
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def set(self, key: str, value: bytes, revision: int):
+        cost = self.sizeof(value)
+        if cost > self.max_size:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._size -= self.sizeof(previous[1])
+            self._entries[key] = (revision, value)
+            self._size += cost
+            while self._size > self.max_size:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self._size -= self.sizeof(evicted)
+
+    def expire(self, revision: int):
+        with self._lock:
+            for key in [k for k, (r, _) in self._entries.items() if r < revision]:
+                self._size -= self.sizeof(self._entries.pop(key)[1])
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+
+class SQLiteCache(CacheBackend):
+    """Cache tier in a SQLite file shared by all workers on a host.
+
+    The file uses WAL mode so readers in other processes never block. Once
+    more than ``max_entries`` rows are held the oldest are deleted.
+    """
+
+    TRIM_EVERY = 256
+
+    def __init__(self, path: str, max_entries: int = 100000):
+        self.path = path
+        self.max_entries = max_entries
+        self._local = threading.local()
+        self._writes = 0
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=OFF")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache ("
+                "key TEXT PRIMARY KEY, revision INTEGER NOT NULL, "
+                "value BLOB NOT NULL, stored_at REAL NOT NULL)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS cache_stored_at ON cache (stored_at)"
+            )
+            self._local.conn = conn
+        return conn
+
+    def get(self, key: str, revision: int) -> Optional[bytes]:
+        try:
+            row = (
+                self._connection()
+                .execute(
+                    "SELECT value FROM cache WHERE key = ? AND revision = ?",
+                    (key, revision),
+                )
+                .fetchone()
+            )
+        except sqlite3.Error as e:
+            logger.warning(f"Shared cache read failed: {e}")
+            return None
+        return row[0] if row else None
+
+    def set(self, key: str, value: bytes, revision: int):
+        try:
+            conn = self._connection()
+            conn.execute(
+                "INSERT OR REPLACE INTO cache (key, revision, value, stored_at) "
+                "VALUES (?, ?, ?, ?)",
+                (key, revision, value, time.time()),
+            )
+            self._writes += 1
+            if self._writes % self.TRIM_EVERY == 0:
+                self._trim(conn)
+        except sqlite3.Error as e:
+            logger.warning(f"Shared cache write failed: {e}")
+
+    def _trim(self, conn: sqlite3.Connection):
+        conn.execute(
+            "DELETE FROM cache WHERE key IN (SELECT key FROM cache "
+            "ORDER BY stored_at DESC LIMIT -1 OFFSET ?)",
+            (self.max_entries,),
+        )
+
+    def expire(self, revision: int):
+        try:
+            self._connection().execute(
+                "DELETE FROM cache WHERE revision < ?", (revision,)
+            )
+        except sqlite3.Error as e:
+            logger.warning(f"Shared cache expiry failed: {e}")
+
+    def clear(self):
+        try:
+            self._connection().execute("DELETE FROM cache")
+        except sqlite3.Error as e:
+            logger.warning(f"Shared cache clear failed: {e}")
+
+
+class TieredCache(CacheBackend):
+    """Per-process LRU in front of a tier shared between processes.
+
+    Shared hits are copied into the local tier, so hot keys are served without
+    leaving the process after the first lookup.
+    """
+
+    def __init__(self, local: CacheBackend, shared: CacheBackend):
+        self.local = local
+        self.shared = shared
+
+    def get(self, key: str, revision: int) -> Optional[bytes]:
+        value = self.local.get(key, revision)
+        if value is None:
+            value = self.shared.get(key, revision)
+            if value is not None:
+                self.local.set(key, value, revision)
+        return value
+
+    def set(self, key: str, value: bytes, revision: int):
+        self.local.set(key, value, revision)
+        self.shared.set(key, value, revision)
+
+    def expire(self, revision: int):
+        self.local.expire(revision)
+        self.shared.expire(revision)
+
+    def clear(self):
+        self.local.clear()
+        self.shared.clear()
+
+
+class SharedCounter:
+    """64-bit counter in a memory-mapped file, visible to all processes.
+
+    Reads are a plain memory access; increments are serialized with an
+    exclusive ``flock`` on the file.
+    """
+
+    _FORMAT = "<Q"
+
+    def __init__(self, path: str):
+        self.path = path
+        self._map = None
+        self._fd = None
+        self._lock = threading.Lock()
+
+    def _mapped(self) -> mmap.mmap:
+        if self._map is None:
+            with self._lock:
+                if self._map is None:
+                    os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+                    fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+                    if os.fstat(fd).st_size < 8:
+                        os.ftruncate(fd, 8)
+                    self._fd = fd
+                    self._map = mmap.mmap(fd, 8)
+        return self._map
+
+    @property
+    def value(self) -> int:
+        return struct.unpack_from(self._FORMAT, self._mapped())[0]
+
+    def increment(self) -> int:
+        """Add one to the counter and return the new value."""
+        shared = self._mapped()
+        with self._lock:
+            if fcntl is not None:
+                fcntl.flock(self._fd, fcntl.LOCK_EX)
+            try:
+                value = struct.unpack_from(self._FORMAT, shared)[0] + 1
+                struct.pack_into(self._FORMAT, shared, 0, value)
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(self._fd, fcntl.LOCK_UN)
+        return value
+
+    def close(self):
+        """Unmap the counter file."""
+        with self._lock:
+            if self._map is not None:
+                self._map.close()
+                os.close(self._fd)
+                self._map = self._fd = None
+
+
+def build_cache(
+    name: str,
+    max_size: int,
+    sizeof: Callable[[bytes], int] = len,
+    cache_dir: Optional[str] = None,
+    shared_max_entries: int = 100000,
+) -> CacheBackend:
+    """Return an LRU cache, backed by a shared tier when ``cache_dir`` is set."""
+    local = LRUCache(max_size, sizeof)
+    if not cache_dir:
+        return local
+    shared = SQLiteCache(os.path.join(cache_dir, f"{name}.sqlite"), shared_max_entries)
+    return TieredCache(local, shared)
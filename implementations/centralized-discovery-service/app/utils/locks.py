@@ -0,0 +1,86 @@
+# app/utils/locks.py
+
+import hashlib
+import logging
+import os
+import threading
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Dict, Iterator
+
+from app.config import settings
+from app.database import get_engine
+from sqlalchemy import text
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not available on Windows
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+_local_locks: Dict[str, threading.Lock] = defaultdict(threading.Lock)
+
+
+def advisory_lock_key(name: str) -> int:
+    """Map a lock name to a signed 64-bit PostgreSQL advisory lock key."""
+    digest = hashlib.blake2b(name.encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "little", signed=True)
+
+
+@contextmanager
+def _advisory_lock(name: str) -> Iterator[bool]:
+    key = advisory_lock_key(name)
+    with get_engine().connect() as conn:
+        acquired = conn.execute(
+            text("SELECT pg_try_advisory_lock(:key)"), {"key": key}
+        ).scalar()
+        if not acquired:
+            yield False
+            return
+        try:
+            yield True
+        finally:
+            conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": key})
+
+
+@contextmanager
+def _file_lock(path: str) -> Iterator[bool]:
+    with open(path, "a+b") as f:
+        try:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            yield False
+            return
+        try:
+            yield True
+        finally:
+            fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+@contextmanager
+def single_flight(name: str) -> Iterator[bool]:
+    """Try to become the only holder of lock ``name``; yields whether it did.
+
+    Never waits. On PostgreSQL the lock is a session advisory lock, so it is
+    shared by all workers on all hosts; otherwise it is a file lock in
+    ``CACHE_DIR``, shared by the workers of one host, or a process-local lock
+    when no cache directory is configured.
+    """
+    local = _local_locks[name]
+    if not local.acquire(blocking=False):
+        yield False
+        return
+    try:
+        if get_engine().dialect.name == "postgresql":
+            lock = _advisory_lock(name)
+        elif settings.CACHE_DIR and fcntl is not None:
+            os.makedirs(settings.CACHE_DIR, exist_ok=True)
+            lock = _file_lock(os.path.join(settings.CACHE_DIR, f"{name}.lock"))
+        else:
+            yield True
+            return
+        with lock as acquired:
+            yield acquired
+    finally:
+        local.release()
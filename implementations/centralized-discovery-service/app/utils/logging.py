@@ -9,7 +9,12 @@ def setup_logging():
     logger = logging.getLogger()
     logger.setLevel(logging.INFO)
 
+    # create_app may run several times per process (tests, benchmarks)
+    if any(getattr(h, "_uim_handler", False) for h in logger.handlers):
+        return
+
     handler = logging.StreamHandler(sys.stdout)
+    handler._uim_handler = True
     formatter = logging.Formatter(
         "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
     )
@@ -0,0 +1,83 @@
+# app/utils/minhash.py
+
+import hashlib
+import random
+import re
+from array import array
+from typing import Iterable, List, Optional, Set
+
+# Signature length and its split into LSH bands of ROWS values each. With 16
+# bands of 4 rows, pairs with a Jaccard similarity of 0.8 share a band with a
+# probability above 99.9%, pairs at 0.3 about one time in eight
+NUM_PERM = 64
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+
+_PRIME = (1 << 61) - 1
+# Fixed seed: signatures are stored, so they must not change between runs
+_rng = random.Random(0x4D494E48)
+_PERMUTATIONS = [
+    (_rng.randrange(1, _PRIME), _rng.randrange(0, _PRIME)) for _ in range(NUM_PERM)
+]
+
+_WORD = re.compile(r"[a-z0-9]+")
+_CAMEL = re.compile(r"([a-z0-9])([A-Z])")
+
+
+def _hash64(text: str) -> int:
+    return int.from_bytes(
+        hashlib.blake2b(text.encode("utf-8"), digest_size=8).digest(), "little"
+    )
+
+
+def _words(text: Optional[str]) -> List[str]:
+    """Lowercase words of ``text``, with camelCase and snake_case split."""
+    if not text:
+        return []
+    return _WORD.findall(_CAMEL.sub(r"\1 \2", text).lower())
+
+
+def intent_shingles(
+    intent_name: str, description: Optional[str], parameter_names: Iterable[str]
+) -> Set[str]:
+    """Return the features compared between intents.
+
+    Word pairs of the description carry most of the weight; the words of the
+    name and of the parameter names are added as single features, so renaming
+    a parameter only moves the similarity a little.
+    """
+    words = _words(description)
+    shingles = {f"d:{a} {b}" for a, b in zip(words, words[1:])}
+    if len(words) == 1:
+        shingles.add(f"d:{words[0]}")
+    shingles.update(f"n:{word}" for word in _words(intent_name))
+    for name in parameter_names:
+        shingles.update(f"p:{word}" for word in _words(name))
+    return shingles
+
+
+def minhash(shingles: Iterable[str]) -> Optional[bytes]:
+    """Return the MinHash signature of ``shingles``, or ``None`` if empty."""
+    hashes = [_hash64(shingle) for shingle in shingles]
+    if not hashes:
+        return None
+    signature = array(
+        "Q", (min((a * h + b) % _PRIME for h in hashes) for a, b in _PERMUTATIONS)
+    )
+    return signature.tobytes()
+
+
+def band_keys(signature: bytes) -> List[int]:
+    """Return one LSH bucket key per band, as non-negative 63-bit integers."""
+    keys = []
+    for band in range(BANDS):
+        chunk = signature[band * ROWS * 8 : (band + 1) * ROWS * 8]
+        digest = hashlib.blake2b(chunk, digest_size=8).digest()
+        keys.append(int.from_bytes(digest, "little") >> 1)
+    return keys
+
+
+def similarity(a: bytes, b: bytes) -> float:
+    """Estimate the Jaccard similarity of two signatures."""
+    first, second = array("Q", a), array("Q", b)
+    return sum(x == y for x, y in zip(first, second)) / NUM_PERM
@@ -0,0 +1,173 @@
+# app/utils/profiling.py
+
+import logging
+import re
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.utils.responses import dumps, encoded_json_response
+from app.utils.serialization import serialize_intents
+from fastapi import Request, Response
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE = re.compile(r"\s+")
+
+_current_profile: ContextVar[Optional["QueryProfile"]] = ContextVar(
+    "query_profile", default=None
+)
+
+
+def _jsonable(value: Any) -> Any:
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    if isinstance(value, (list, tuple)):
+        return [_jsonable(item) for item in value]
+    if isinstance(value, dict):
+        return {str(key): _jsonable(item) for key, item in value.items()}
+    return repr(value)
+
+
+class QueryProfile:
+    """SQL statements and phase timings recorded for one explained request."""
+
+    def __init__(self):
+        self.statements: List[Dict[str, Any]] = []
+        self.phases: Dict[str, float] = {}
+        self.rows = 0
+
+    def add_phase(self, name: str, elapsed: float):
+        self.phases[name] = self.phases.get(name, 0.0) + elapsed
+
+    def report(self, db: Session) -> Dict[str, Any]:
+        """Return the recorded profile with the database's plan of each query.
+
+        The statements are explained again on ``db`` after the fact, without
+        being executed, so explaining costs no more than planning.
+        """
+        db_time = sum(statement["duration"] for statement in self.statements)
+        fetch_time = self.phases.get("fetch", 0.0)
+        timings = {
+            "query_build_ms": self.phases.get("build", 0.0) * 1000,
+            "db_ms": db_time * 1000,
+            # Fetch time not spent in the driver goes to statement compilation
+            # and building ORM objects from the rows
+            "orm_hydration_ms": max(fetch_time - db_time, 0.0) * 1000,
+            "serialization_ms": self.phases.get("serialization", 0.0) * 1000,
+        }
+        return {
+            "timings": timings,
+            "rows": self.rows,
+            "queries": [
+                {
+                    "sql": statement["sql"],
+                    "parameters": _jsonable(statement["parameters"]),
+                    "duration_ms": statement["duration"] * 1000,
+                    "rowcount": statement["rowcount"],
+                    "plan": _explain(db, statement),
+                }
+                for statement in self.statements
+            ],
+        }
+
+
+def current_profile() -> Optional[QueryProfile]:
+    """Return the profile of the request being explained, if any."""
+    return _current_profile.get()
+
+
+@contextmanager
+def profile_queries():
+    """Record the statements executed and the phases timed in the block."""
+    profile = QueryProfile()
+    token = _current_profile.set(profile)
+    try:
+        yield profile
+    finally:
+        _current_profile.reset(token)
+
+
+@contextmanager
+def phase(name: str):
+    """Attribute the time spent in the block to phase ``name`` when profiling."""
+    profile = _current_profile.get()
+    if profile is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        profile.add_phase(name, time.perf_counter() - start)
+
+
+def explained_response(
+    request: Request,
+    db: Session,
+    profile: QueryProfile,
+    intents: list,
+    fields: Tuple[str, ...],
+) -> Response:
+    """Render ``intents`` as ``results`` next to the ``explain`` report."""
+    start = time.perf_counter()
+    results = dumps(serialize_intents(intents, fields))
+    profile.add_phase("serialization", time.perf_counter() - start)
+    profile.rows = len(intents)
+    body = b'{"results":%s,"explain":%s}' % (results, dumps(profile.report(db)))
+    return encoded_json_response(request, body)
+
+
+def _explain(db: Session, statement: Dict[str, Any]) -> List[str]:
+    if not statement["sql"].upper().startswith("SELECT"):
+        return []
+    dialect = db.bind.dialect.name
+    if dialect == "postgresql":
+        prefix = "EXPLAIN "
+    elif dialect == "sqlite":
+        prefix = "EXPLAIN QUERY PLAN "
+    else:
+        return []
+    try:
+        rows = db.connection().exec_driver_sql(
+            prefix + statement["statement"], statement["parameters"]
+        )
+        # SQLite returns (id, parent, notused, detail), PostgreSQL one text column
+        return [str(row[-1]) for row in rows]
+    except Exception as e:
+        logger.warning(f"Failed to explain query: {e}")
+        return [f"EXPLAIN failed: {e}"]
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current_profile.get() is not None:
+        conn.info.setdefault("profile_start_time", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    profile = _current_profile.get()
+    if profile is None or not conn.info.get("profile_start_time"):
+        return
+    elapsed = time.perf_counter() - conn.info["profile_start_time"].pop()
+    rowcount = getattr(cursor, "rowcount", -1)
+    profile.statements.append(
+        {
+            "statement": statement,
+            "sql": _WHITESPACE.sub(" ", statement).strip(),
+            "parameters": parameters,
+            "duration": elapsed,
+            # SQLite does not report the rows of a SELECT
+            "rowcount": rowcount if rowcount is not None and rowcount >= 0 else None,
+        }
+    )
+
+
+def install_profile_hooks():
+    """Record statements on every engine while a profile is active (idempotent)."""
+    if not event.contains(Engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
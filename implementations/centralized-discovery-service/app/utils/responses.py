@@ -0,0 +1,98 @@
+# app/utils/responses.py
+
+import gzip
+import logging
+from typing import Any, Optional
+
+import orjson
+from app.config import settings
+from app.utils.timing import track_serialization
+from fastapi import Request, Response
+
+logger = logging.getLogger(__name__)
+
+# Optional, installed with the ``brotli`` extra; gzip is always available
+try:
+    import brotli
+except ImportError:  # pragma: no cover - depends on the environment
+    brotli = None
+
+GZIP_LEVEL = 5
+BROTLI_QUALITY = 4
+
+
+def dumps(content: Any) -> bytes:
+    """Encode ``content`` as compact UTF-8 JSON."""
+    return orjson.dumps(content)
+
+
+class FastJSONResponse(Response):
+    """JSON response encoded with orjson."""
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        with track_serialization():
+            return dumps(content)
+
+
+def negotiate_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """Pick the preferred supported content coding from ``Accept-Encoding``."""
+    if not accept_encoding:
+        return None
+    supported = ["br", "gzip"] if brotli is not None else ["gzip"]
+    weights = {}
+    for item in accept_encoding.split(","):
+        coding, _, params = item.strip().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        weights[coding.strip().lower()] = quality
+
+    best, best_quality = None, 0.0
+    for coding in supported:
+        quality = weights.get(coding, weights.get("*", 0.0))
+        if quality > best_quality:
+            best, best_quality = coding, quality
+    return best
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    """Compress ``body`` with the given content coding."""
+    if encoding == "br":
+        return brotli.compress(body, quality=BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=GZIP_LEVEL)
+
+
+def json_response(request: Request, content: Any, status_code: int = 200) -> Response:
+    """Encode ``content`` and compress it if the client accepts it."""
+    with track_serialization():
+        body = dumps(content)
+    return encoded_json_response(request, body, status_code)
+
+
+def encoded_json_response(
+    request: Request, body: bytes, status_code: int = 200
+) -> Response:
+    """Send an already encoded JSON ``body``, compressed if the client accepts it.
+
+    Responses below ``COMPRESSION_MIN_SIZE`` bytes are sent as is, since
+    compressing them costs more CPU than it saves on the wire.
+    """
+    with track_serialization():
+        headers = {"Vary": "Accept-Encoding"}
+        if len(body) >= settings.COMPRESSION_MIN_SIZE:
+            encoding = negotiate_encoding(request.headers.get("accept-encoding"))
+            if encoding:
+                body = compress(body, encoding)
+                headers["Content-Encoding"] = encoding
+    return Response(
+        content=body,
+        status_code=status_code,
+        headers=headers,
+        media_type=FastJSONResponse.media_type,
+    )
@@ -0,0 +1,79 @@
+# app/utils/serialization.py
+
+from functools import lru_cache
+from operator import attrgetter
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+# Public fields of an intent, in response order
+INTENT_FIELDS = (
+    "id",
+    "service_id",
+    "intent_uid",
+    "intent_name",
+    "description",
+    "input_parameters",
+    "output_parameters",
+    "endpoint",
+    "tags",
+)
+
+
+def parse_fields(fields: Optional[str]) -> Tuple[str, ...]:
+    """Parse a comma separated field list into a tuple in response order.
+
+    Raises ``ValueError`` for unknown field names.
+    """
+    if not fields:
+        return INTENT_FIELDS
+    requested = {field.strip() for field in fields.split(",") if field.strip()}
+    unknown = requested.difference(INTENT_FIELDS)
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))}")
+    return tuple(field for field in INTENT_FIELDS if field in requested)
+
+
+@lru_cache(maxsize=128)
+def intent_serializer(
+    fields: Tuple[str, ...] = INTENT_FIELDS,
+) -> Callable[[Any], Dict[str, Any]]:
+    """Return a function that converts an intent row into a plain dict.
+
+    The attribute getter is built once per field set, so serializing a row is
+    a single C-level attribute fetch plus a dict construction.
+    """
+    columns = tuple(field for field in fields if field != "tags")
+    with_tags = "tags" in fields
+    getter = attrgetter(*columns) if columns else None
+
+    if len(columns) == 1:
+
+        def values(intent):
+            return (getter(intent),)
+
+    elif columns:
+        values = getter
+    else:
+
+        def values(intent):
+            return ()
+
+    def serialize(intent) -> Dict[str, Any]:
+        data = dict(zip(columns, values(intent)))
+        if with_tags:
+            data["tags"] = [{"name": tag.name} for tag in intent.tags]
+        return data
+
+    return serialize
+
+
+def serialize_intent(intent, fields: Tuple[str, ...] = INTENT_FIELDS) -> Dict[str, Any]:
+    """Convert an intent row into a plain dict."""
+    return intent_serializer(fields)(intent)
+
+
+def serialize_intents(
+    intents: Iterable[Any], fields: Tuple[str, ...] = INTENT_FIELDS
+) -> List[Dict[str, Any]]:
+    """Convert intent rows into plain dicts."""
+    serialize = intent_serializer(fields)
+    return [serialize(intent) for intent in intents]
@@ -0,0 +1,167 @@
+# app/utils/timing.py
+
+import logging
+import re
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Optional
+
+from app.config import settings
+from fastapi import FastAPI, Request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+slow_query_logger = logging.getLogger("app.slow_query")
+
+_WHITESPACE = re.compile(r"\s+")
+_MAX_LOGGED_PARAMETERS = 500
+
+_current_timings: ContextVar[Optional["RequestTimings"]] = ContextVar(
+    "request_timings", default=None
+)
+
+
+class RequestTimings:
+    """Timings collected while handling a single request."""
+
+    __slots__ = ("db_time", "query_count", "serialization_time")
+
+    def __init__(self):
+        self.db_time = 0.0
+        self.query_count = 0
+        self.serialization_time = 0.0
+
+    def server_timing(self, total_time: float) -> str:
+        """Render the timings as a ``Server-Timing`` header value."""
+        return (
+            f'db;dur={self.db_time * 1000:.3f};desc="{self.query_count} queries", '
+            f"ser;dur={self.serialization_time * 1000:.3f}, "
+            f"total;dur={total_time * 1000:.3f}"
+        )
+
+
+class RouteStats:
+    """Aggregated timings for one route."""
+
+    __slots__ = ("count", "total_time", "max_time", "db_time", "query_count")
+
+    def __init__(self):
+        self.count = 0
+        self.total_time = 0.0
+        self.max_time = 0.0
+        self.db_time = 0.0
+        self.query_count = 0
+
+    def as_dict(self) -> Dict[str, float]:
+        """Return the aggregates in milliseconds."""
+        count = self.count or 1
+        return {
+            "count": self.count,
+            "avg_ms": self.total_time * 1000 / count,
+            "max_ms": self.max_time * 1000,
+            "avg_db_ms": self.db_time * 1000 / count,
+            "avg_queries": self.query_count / count,
+        }
+
+
+class RouteStatsRegistry:
+    """Thread-safe per-route aggregates of request timings."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._routes: Dict[str, RouteStats] = {}
+
+    def record(self, route: str, timings: RequestTimings, total_time: float):
+        """Add a finished request to the aggregates of its route."""
+        with self._lock:
+            stats = self._routes.get(route)
+            if stats is None:
+                stats = self._routes[route] = RouteStats()
+            stats.count += 1
+            stats.total_time += total_time
+            stats.max_time = max(stats.max_time, total_time)
+            stats.db_time += timings.db_time
+            stats.query_count += timings.query_count
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        """Return a copy of the aggregates keyed by route."""
+        with self._lock:
+            return {route: stats.as_dict() for route, stats in self._routes.items()}
+
+    def reset(self):
+        """Drop all aggregates."""
+        with self._lock:
+            self._routes.clear()
+
+
+route_stats = RouteStatsRegistry()
+
+
+def current_timings() -> Optional[RequestTimings]:
+    """Return the timings of the request being handled, if any."""
+    return _current_timings.get()
+
+
+@contextmanager
+def track_serialization():
+    """Attribute the time spent in the block to response serialization."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings = _current_timings.get()
+        if timings is not None:
+            timings.serialization_time += time.perf_counter() - start
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["query_start_time"].pop()
+    timings = _current_timings.get()
+    if timings is not None:
+        timings.db_time += elapsed
+        timings.query_count += 1
+
+    threshold = settings.SLOW_QUERY_THRESHOLD_MS
+    if threshold > 0 and elapsed * 1000 >= threshold:
+        slow_query_logger.warning(
+            "Slow query (%.1f ms): %s; parameters=%s",
+            elapsed * 1000,
+            _WHITESPACE.sub(" ", statement).strip(),
+            repr(parameters)[:_MAX_LOGGED_PARAMETERS],
+        )
+
+
+def install_query_hooks():
+    """Account SQL execution time on every engine (idempotent)."""
+    if not event.contains(Engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def add_timing_middleware(app: FastAPI):
+    """Attach ``Server-Timing`` headers and per-route aggregates to ``app``."""
+    install_query_hooks()
+
+    @app.middleware("http")
+    async def server_timing(request: Request, call_next):
+        timings = RequestTimings()
+        token = _current_timings.set(timings)
+        start = time.perf_counter()
+        try:
+            response = await call_next(request)
+        finally:
+            _current_timings.reset(token)
+        total_time = time.perf_counter() - start
+
+        response.headers["Server-Timing"] = timings.server_timing(total_time)
+        route = request.scope.get("route")
+        route_path = getattr(route, "path", None) or "<unmatched>"
+        route_stats.record(f"{request.method} {route_path}", timings, total_time)
+        return response
@@ -0,0 +1,104 @@
+# app/utils/versions.py
+
+import re
+from typing import List, NamedTuple, Optional, Tuple
+
+Version = Tuple[int, int, int]
+
+_VERSION = re.compile(r"^[vV]?(\d+)(?:\.(\d+))?(?:\.(\d+))?$")
+_OPERATORS = ("^", "~", ">=", "<=", ">", "<", "=")
+_COMPARATOR = re.compile(r"^(\^|~|>=|<=|>|<|=)?(.+)$")
+
+
+class IntentUID(NamedTuple):
+    """The parts of an intent UID of the form ``namespace:Name:vN``."""
+
+    namespace: str
+    name: str
+    version: Version
+
+
+def _parse_partial(text: str) -> Tuple[Version, int]:
+    """Parse ``1``, ``v1.2`` or ``1.2.3`` into a version and its precision."""
+    match = _VERSION.match(text.strip())
+    if match is None:
+        raise ValueError(f"Invalid version: {text!r}")
+    parts = [int(part) for part in match.groups() if part is not None]
+    return tuple(parts + [0] * (3 - len(parts))), len(parts)
+
+
+def _bump(version: Version, position: int) -> Version:
+    """Increment the component at ``position`` and zero the following ones."""
+    bumped = list(version[:position]) + [version[position] + 1]
+    return tuple(bumped + [0] * (2 - position))
+
+
+def _constraint_tokens(constraint: str) -> List[str]:
+    """Split a constraint into comparators, joining ``>= 1.2`` into one."""
+    tokens = []
+    operator = ""
+    for part in constraint.replace(",", " ").split():
+        if part in _OPERATORS and not operator:
+            operator = part
+            continue
+        tokens.append(operator + part)
+        operator = ""
+    if operator:
+        raise ValueError(f"Missing version after {operator!r}")
+    return tokens
+
+
+def parse_intent_uid(intent_uid: str) -> Optional[IntentUID]:
+    """Split an intent UID into namespace, name and version.
+
+    Returns ``None`` for UIDs that do not follow ``namespace:Name:vN[.N[.N]]``.
+    """
+    parts = intent_uid.rsplit(":", 2)
+    if len(parts) != 3 or not parts[0] or not parts[1]:
+        return None
+    try:
+        version, _ = _parse_partial(parts[2])
+    except ValueError:
+        return None
+    return IntentUID(parts[0], parts[1], version)
+
+
+def version_range(
+    constraint: Optional[str],
+) -> Tuple[Optional[Version], Optional[Version]]:
+    """Translate a semver constraint into an inclusive lower and an exclusive
+    upper bound; ``None`` leaves that side open.
+
+    Supports exact and partial versions (``1.2`` means ``>=1.2.0 <1.3.0``),
+    ``^``, ``~``, ``>=``, ``>``, ``<=``, ``<`` and ``=``, and ``*`` for any
+    version. Comparators separated by commas or spaces are intersected.
+    Raises ``ValueError`` for constraints that cannot be parsed.
+    """
+    lower: Optional[Version] = None
+    upper: Optional[Version] = None
+    for token in _constraint_tokens(constraint or ""):
+        operator, value = _COMPARATOR.match(token).groups()
+        if value in ("*", "x", "X"):
+            continue
+        version, precision = _parse_partial(value)
+        low, high = None, None
+        if operator in (None, "="):
+            low, high = version, _bump(version, precision - 1)
+        elif operator == ">=":
+            low = version
+        elif operator == ">":
+            low = _bump(version, precision - 1)
+        elif operator == "<":
+            high = version
+        elif operator == "<=":
+            high = _bump(version, precision - 1)
+        elif operator == "~":
+            low, high = version, _bump(version, min(precision, 2) - 1)
+        else:  # ^: the left-most non-zero component may not change
+            position = next((i for i in range(precision) if version[i]), precision - 1)
+            low, high = version, _bump(version, position)
+        if low is not None and (lower is None or low > lower):
+            lower = low
+        if high is not None and (upper is None or high < upper):
+            upper = high
+    return lower, upper
@@ -0,0 +1,4 @@
+# benchmarks/__init__.py
+
+# Load benchmarks for the discovery service.
+# Run them with `python -m benchmarks --help` from the service directory.
@@ -0,0 +1,208 @@
+# benchmarks/__main__.py
+# USAGE: python -m benchmarks --intents 100000 --services 10000 --output bench.json
+#        python -m benchmarks --baseline bench.json   # fail on regressions
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import platform
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+# Adjust the import path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+WORKLOADS = ["search", "filter", "get", "ingest", "fuzzy", "encode"]
+
+
+def parse_args(argv=None):
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks",
+        description="Load benchmark for the centralized discovery service.",
+    )
+    parser.add_argument("--intents", type=int, default=1000)
+    parser.add_argument("--services", type=int, default=100)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument(
+        "--workloads",
+        default=",".join(WORKLOADS),
+        help=f"Comma separated subset of {', '.join(WORKLOADS)}.",
+    )
+    parser.add_argument(
+        "--ingest-documents",
+        type=int,
+        default=20,
+        help="Number of agents.json documents ingested by the ingest workload.",
+    )
+    parser.add_argument("--ingest-intents", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--database-url",
+        help="Database to benchmark against (default: a temporary SQLite file).",
+    )
+    parser.add_argument("--output", help="Write the JSON report to this file.")
+    parser.add_argument(
+        "--baseline",
+        help="Compare against a previous JSON report and fail on regressions.",
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.2,
+        help="Allowed relative regression before failing (default: 0.2).",
+    )
+    return parser.parse_args(argv)
+
+
+def compare_reports(baseline: dict, current: dict, tolerance: float) -> list:
+    """Return human readable regressions of ``current`` against ``baseline``."""
+    regressions = []
+    for metric in ("import_ms", "create_app_ms", "lifespan_ms"):
+        previous = baseline.get("startup", {}).get(metric)
+        value = current.get("startup", {}).get(metric)
+        if previous and value is not None and value > previous * (1 + tolerance):
+            regressions.append(f"startup.{metric}: {previous} -> {value}")
+    for name, result in current["workloads"].items():
+        previous = baseline.get("workloads", {}).get(name)
+        if not previous:
+            continue
+        for metric in ("p50_ms", "p95_ms", "p99_ms"):
+            if previous[metric] and result[metric] > previous[metric] * (1 + tolerance):
+                regressions.append(
+                    f"{name}.{metric}: {previous[metric]} -> {result[metric]}"
+                )
+        if result["throughput_rps"] < previous["throughput_rps"] * (1 - tolerance):
+            regressions.append(
+                f"{name}.throughput_rps: {previous['throughput_rps']} -> "
+                f"{result['throughput_rps']}"
+            )
+    return regressions
+
+
+def run(args) -> dict:
+    """Generate a catalog, run the selected workloads and build the report."""
+    # The application reads its settings at import time
+    tmpdir = None
+    if not args.database_url:
+        tmpdir = tempfile.mkdtemp(prefix="uim-bench-")
+        args.database_url = f"sqlite:///{os.path.join(tmpdir, 'bench.db')}"
+    os.environ["DATABASE_URL"] = args.database_url
+
+    from app.crud.backfill import backfill_read_models
+    from app.database import (
+        dispose_engine,
+        get_engine,
+        get_sessionmaker,
+        provision_database,
+    )
+    from app.main import create_app
+
+    from .catalog import generate_catalog
+    from .workloads import (
+        HTTP_WORKLOADS,
+        WorkloadError,
+        measure_startup,
+        run_encode_benchmark,
+        run_fuzzy_workload,
+        run_http_workload,
+        run_ingest_workload,
+    )
+
+    startup = measure_startup(args.database_url)
+    app = create_app()
+    # All requests come from one client, whose token bucket would answer most
+    # of them with 429 and measure the limiter instead of the endpoints
+    app.state.rate_limiter = None
+    # Keep per-request logging out of the measurements and the JSON output
+    logging.getLogger().setLevel(logging.WARNING)
+    provision_database()
+    engine = get_engine()
+    SessionLocal = get_sessionmaker()
+
+    report = {
+        "meta": {
+            "intents": args.intents,
+            "services": args.services,
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "seed": args.seed,
+            "dialect": engine.dialect.name,
+            "python": platform.python_version(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        },
+        "startup": startup,
+        "workloads": {},
+    }
+
+    with SessionLocal() as db:
+        start = time.perf_counter()
+        catalog = generate_catalog(
+            db, intents=args.intents, services=args.services, seed=args.seed
+        )
+        report["meta"]["catalog_build_s"] = round(time.perf_counter() - start, 3)
+        start = time.perf_counter()
+        backfill_read_models(db)
+        report["meta"]["read_models_build_s"] = round(time.perf_counter() - start, 3)
+
+    selected = [name.strip() for name in args.workloads.split(",") if name.strip()]
+    try:
+        for name in selected:
+            if name in HTTP_WORKLOADS:
+                make_request = HTTP_WORKLOADS[name](catalog, random.Random(args.seed))
+                report["workloads"][name] = asyncio.run(
+                    run_http_workload(
+                        app, make_request, args.requests, args.concurrency
+                    )
+                )
+            elif name == "ingest":
+                with SessionLocal() as db:
+                    report["workloads"][name] = run_ingest_workload(
+                        db, args.ingest_documents, args.ingest_intents, seed=args.seed
+                    )
+            elif name == "fuzzy":
+                with SessionLocal() as db:
+                    report["workloads"][name] = run_fuzzy_workload(
+                        db, catalog, args.requests, seed=args.seed
+                    )
+            elif name == "encode":
+                report["encode"] = run_encode_benchmark()
+            else:
+                raise SystemExit(f"Unknown workload: {name}")
+    except WorkloadError as e:
+        raise SystemExit(f"Workload {name} failed: {e}")
+    finally:
+        dispose_engine()
+        if tmpdir:
+            shutil.rmtree(tmpdir, ignore_errors=True)
+    return report
+
+
+def main(argv=None):
+    """Entry point for the benchmark runner."""
+    args = parse_args(argv)
+    report = run(args)
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output + "\n")
+    print(output)
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare_reports(baseline, report, args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,190 @@
+# benchmarks/catalog.py
+
+import copy
+import glob
+import json
+import os
+import random
+from dataclasses import dataclass, field
+from typing import Any, Dict, List
+
+from app import models
+from app.models.intent import intent_tags
+from sqlalchemy import func, insert
+from sqlalchemy.orm import Session
+
+TEMPLATE_DIR = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)),
+    "..",
+    "..",
+    "..",
+    "examples",
+    "intent_examples",
+)
+
+# Variations applied to template intents so generated catalogs are not uniform
+NAME_QUALIFIERS = ["", "", "", "ByCategory", "ByLocation", "Advanced", "Bulk", "V2"]
+DESCRIPTION_QUALIFIERS = [
+    "",
+    " for registered customers",
+    " with optional filters",
+    " in a specific region",
+    " using cached data where possible",
+    " for business accounts",
+]
+# Extra tags follow a skewed distribution: a few are very popular
+EXTRA_TAG_POOL = [f"topic-{i}" for i in range(200)]
+
+CHUNK_SIZE = 5000
+
+
+@dataclass
+class Catalog:
+    """Summary of a generated catalog, used to drive the workloads."""
+
+    service_names: List[str] = field(default_factory=list)
+    intent_uids: List[str] = field(default_factory=list)
+    intent_names: List[str] = field(default_factory=list)
+    tags: List[str] = field(default_factory=list)
+    queries: List[str] = field(default_factory=list)
+
+
+def load_templates(template_dir: str = TEMPLATE_DIR) -> List[Dict[str, Any]]:
+    """Load intent templates from the example agents.json files."""
+    templates = []
+    for path in sorted(glob.glob(os.path.join(template_dir, "*.json"))):
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        service_info = data.get("service_info") or data.get("service-info") or {}
+        for intent in data.get("intents", []):
+            template = copy.deepcopy(intent)
+            template["domain"] = service_info.get("name", "example.com")
+            templates.append(template)
+    if not templates:
+        raise ValueError(f"No intent templates found in {template_dir}")
+    return templates
+
+
+def generate_agents_json(
+    templates: List[Dict[str, Any]], service_name: str, count: int, seed: int = 0
+) -> Dict[str, Any]:
+    """Build a synthetic agents.json document, e.g. for ingest workloads."""
+    rng = random.Random(seed)
+    intents = []
+    for j in range(count):
+        intent = _make_intent(rng, templates, service_name, j)
+        intent.pop("domain", None)
+        intents.append(intent)
+    return {
+        "service_info": _make_service(service_name),
+        "intents": intents,
+    }
+
+
+def generate_catalog(
+    db: Session,
+    intents: int,
+    services: int,
+    seed: int = 0,
+    templates: List[Dict[str, Any]] = None,
+) -> Catalog:
+    """Insert a synthetic catalog of ``intents`` spread over ``services``.
+
+    Rows are written with bulk inserts in chunks, so catalogs with up to a
+    million intents can be generated in a reasonable time.
+    """
+    templates = templates or load_templates()
+    rng = random.Random(seed)
+    services = max(1, min(services, intents))
+    catalog = Catalog()
+
+    service_start = (db.query(func.max(models.Service.id)).scalar() or 0) + 1
+    service_rows = []
+    for s in range(services):
+        domain = templates[s % len(templates)]["domain"]
+        name = f"svc{service_start + s:07d}.{domain}"
+        row = _make_service(name)
+        row["id"] = service_start + s
+        service_rows.append(row)
+        catalog.service_names.append(name)
+    _insert_chunked(db, models.Service, service_rows)
+
+    tag_ids: Dict[str, int] = {
+        name: tag_id for tag_id, name in db.query(models.Tag.id, models.Tag.name)
+    }
+    next_tag_id = (max(tag_ids.values()) if tag_ids else 0) + 1
+    intent_start = (db.query(func.max(models.Intent.id)).scalar() or 0) + 1
+
+    intent_rows, link_rows, new_tags = [], [], []
+    for i in range(intents):
+        s, j = i % services, i // services
+        intent = _make_intent(rng, templates, catalog.service_names[s], j)
+        intent_id = intent_start + i
+        tags = intent.pop("tags")
+        intent.pop("domain", None)
+        intent_rows.append({**intent, "id": intent_id, "service_id": service_start + s})
+        for tag in tags:
+            if tag not in tag_ids:
+                tag_ids[tag] = next_tag_id
+                new_tags.append({"id": next_tag_id, "name": tag})
+                next_tag_id += 1
+            link_rows.append({"intent_id": intent_id, "tag_id": tag_ids[tag]})
+        if len(catalog.intent_uids) < 100000:
+            catalog.intent_uids.append(intent["intent_uid"])
+
+        if len(intent_rows) >= CHUNK_SIZE:
+            _flush_intents(db, new_tags, intent_rows, link_rows)
+            new_tags, intent_rows, link_rows = [], [], []
+    _flush_intents(db, new_tags, intent_rows, link_rows)
+    db.commit()
+
+    catalog.intent_names = sorted({t["intent_name"] for t in templates})
+    catalog.tags = sorted(tag_ids)
+    catalog.queries = [t["description"].lower() for t in templates] + [
+        " ".join(t["tags"]) for t in templates
+    ]
+    return catalog
+
+
+def _make_service(name: str) -> Dict[str, Any]:
+    return {
+        "name": name,
+        "description": f"Synthetic service {name}",
+        "service_url": f"https://{name}",
+        "service_logo_url": f"https://{name}/logo.png",
+        "service_terms_of_service_url": f"https://{name}/terms",
+        "service_privacy_policy_url": f"https://{name}/privacy",
+    }
+
+
+def _make_intent(
+    rng: random.Random, templates: List[Dict[str, Any]], service_name: str, j: int
+) -> Dict[str, Any]:
+    template = templates[j % len(templates)]
+    version = j // len(templates) + 1
+    name = template["intent_name"] + rng.choice(NAME_QUALIFIERS)
+    # Skewed pick so a handful of extra tags end up on most intents
+    extra_tag = EXTRA_TAG_POOL[int(len(EXTRA_TAG_POOL) * rng.random() ** 3)]
+    return {
+        "intent_uid": f"{service_name}:{name}:v{version}",
+        "intent_name": name,
+        "description": template["description"] + rng.choice(DESCRIPTION_QUALIFIERS),
+        "input_parameters": template.get("input_parameters", []),
+        "output_parameters": template.get("output_parameters", []),
+        "endpoint": f"https://api.{service_name}/{name}/v{version}",
+        "tags": list(dict.fromkeys(template.get("tags", []) + [extra_tag])),
+        "domain": template["domain"],
+    }
+
+
+def _flush_intents(db: Session, new_tags, intent_rows, link_rows):
+    _insert_chunked(db, models.Tag, new_tags)
+    _insert_chunked(db, models.Intent, intent_rows)
+    _insert_chunked(db, intent_tags, link_rows)
+
+
+def _insert_chunked(db: Session, target, rows: List[Dict[str, Any]]):
+    for start in range(0, len(rows), CHUNK_SIZE):
+        chunk = rows[start : start + CHUNK_SIZE]
+        if chunk:
+            db.execute(insert(target), chunk)
@@ -0,0 +1,339 @@
+# benchmarks/workloads.py
+
+import asyncio
+import json
+import math
+import os
+import random
+import statistics
+import string
+import subprocess
+import sys
+import time
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, List, Optional
+
+import httpx
+from app.schemas.service import AgentsJson
+from app.services.crawler import ingest_agents_json
+from app.services.fuzzy import FuzzyIndex
+from app.utils import responses
+from app.utils.serialization import serialize_intents
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy.orm import Session
+
+from .catalog import Catalog, generate_agents_json, load_templates
+
+SERVICE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Runs in a fresh interpreter so module imports are measured cold
+STARTUP_PROBE = """
+import asyncio, json, time
+start = time.perf_counter()
+import app.main
+imported = time.perf_counter()
+application = app.main.create_app()
+created = time.perf_counter()
+
+async def startup():
+    async with application.router.lifespan_context(application):
+        return time.perf_counter()
+
+started = asyncio.run(startup())
+print(json.dumps({
+    "import_ms": (imported - start) * 1000,
+    "create_app_ms": (created - imported) * 1000,
+    "lifespan_ms": (started - created) * 1000,
+}))
+"""
+
+
+class WorkloadError(RuntimeError):
+    """A benchmark request did not succeed."""
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    """Return the nearest-rank percentile of ``samples``."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def summarize(latencies: List[float], errors: int, duration: float) -> Dict[str, Any]:
+    """Summarize latencies (in seconds) as throughput and percentiles in ms."""
+    completed = len(latencies)
+    return {
+        "requests": completed + errors,
+        "errors": errors,
+        "duration_s": round(duration, 4),
+        "throughput_rps": round(completed / duration, 2) if duration else 0.0,
+        "mean_ms": round(sum(latencies) * 1000 / completed, 3) if completed else 0.0,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 3),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 3),
+    }
+
+
+def search_requests(catalog: Catalog, rng: random.Random) -> Callable[[], Dict]:
+    """Natural language searches drawn from template descriptions and tags."""
+
+    def make():
+        return {"url": "/api/search/", "params": {"query": rng.choice(catalog.queries)}}
+
+    return make
+
+
+def filter_requests(catalog: Catalog, rng: random.Random) -> Callable[[], Dict]:
+    """Structured searches on intent name fragments and tags."""
+
+    def make():
+        if rng.random() < 0.5:
+            params = {"intent_name": rng.choice(catalog.intent_names)[:6]}
+        else:
+            params = {
+                "tags": ",".join(rng.sample(catalog.tags, min(2, len(catalog.tags))))
+            }
+        return {"url": "/api/intents/search", "params": params}
+
+    return make
+
+
+def get_requests(catalog: Catalog, rng: random.Random) -> Callable[[], Dict]:
+    """Lookups of existing intents by UID."""
+
+    def make():
+        return {"url": f"/api/intents/{rng.choice(catalog.intent_uids)}"}
+
+    return make
+
+
+HTTP_WORKLOADS = {
+    "search": search_requests,
+    "filter": filter_requests,
+    "get": get_requests,
+}
+
+
+async def run_http_workload(
+    app,
+    make_request: Callable[[], Dict],
+    requests: int,
+    concurrency: int,
+) -> Dict[str, Any]:
+    """Issue ``requests`` GET requests against ``app`` through the ASGI client.
+
+    Raises ``WorkloadError`` on the first response that is not a success, so
+    rejected or failed requests never pass for fast ones.
+    """
+    latencies: List[float] = []
+    pending = iter(range(requests))
+    transport = httpx.ASGITransport(app=app)
+
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://bench"
+    ) as client:
+
+        async def worker():
+            for _ in pending:
+                request = make_request()
+                start = time.perf_counter()
+                response = await client.get(
+                    request["url"], params=request.get("params")
+                )
+                elapsed = time.perf_counter() - start
+                if not response.is_success:
+                    raise WorkloadError(
+                        f"GET {response.request.url} returned "
+                        f"{response.status_code}: {response.text[:200]}"
+                    )
+                latencies.append(elapsed)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        duration = time.perf_counter() - start
+
+    return summarize(latencies, 0, duration)
+
+
+def run_ingest_workload(
+    db: Session,
+    documents: int,
+    intents_per_document: int,
+    seed: int = 0,
+    templates: Optional[List[Dict[str, Any]]] = None,
+) -> Dict[str, Any]:
+    """Ingest synthetic agents.json documents through the crawler write path.
+
+    Raises ``WorkloadError`` on the first document that fails to ingest, so
+    failed writes never pass for fast ones.
+    """
+    templates = templates or load_templates()
+    latencies: List[float] = []
+    start = time.perf_counter()
+    for n in range(documents):
+        document = generate_agents_json(
+            templates, f"ingest{seed}-{n:06d}.bench", intents_per_document, seed=n
+        )
+        began = time.perf_counter()
+        try:
+            ingest_agents_json(db, AgentsJson(**document))
+        except Exception as e:
+            db.rollback()
+            raise WorkloadError(
+                f"Ingesting {document['service_info']['name']} failed: {e}"
+            ) from e
+        latencies.append(time.perf_counter() - began)
+    duration = time.perf_counter() - start
+
+    result = summarize(latencies, 0, duration)
+    result["intents_per_s"] = (
+        round(documents * intents_per_document / duration, 2) if duration else 0.0
+    )
+    return result
+
+
+def misspell(term: str, rng: random.Random) -> str:
+    """Apply one random deletion, insertion, substitution or transposition."""
+    position = rng.randrange(len(term))
+    letter = rng.choice(string.ascii_lowercase.replace(term[position], ""))
+    edit = rng.choice("dist" if len(term) > 1 else "is")
+    if edit == "t":
+        position = min(position, len(term) - 2)
+        if term[position] != term[position + 1]:
+            return (
+                term[:position]
+                + term[position + 1]
+                + term[position]
+                + term[position + 2 :]
+            )
+        edit = "s"
+    if edit == "d":
+        return term[:position] + term[position + 1 :]
+    if edit == "i":
+        return term[:position] + letter + term[position:]
+    return term[:position] + letter + term[position + 1 :]
+
+
+def run_fuzzy_workload(
+    db: Session, catalog: Catalog, lookups: int, seed: int = 0
+) -> Dict[str, Any]:
+    """Time typo corrections against the SymSpell name and tag dictionaries.
+
+    Lookups run in-process on an index built from the catalog, so the
+    latencies are those of ``FuzzyIndex.correct`` alone. ``hit_rate`` is the
+    share of lookups that returned the term a query was misspelled from; the
+    rest mostly hit another term at distance 0 and ten closer than it.
+    """
+    index = FuzzyIndex()
+    start = time.perf_counter()
+    index.rebuild(db)
+    build_s = time.perf_counter() - start
+
+    rng = random.Random(seed)
+    terms = sorted(set(catalog.intent_names)) + catalog.tags
+    latencies: List[float] = []
+    hits = 0
+    start = time.perf_counter()
+    for _ in range(lookups):
+        term = rng.choice(terms)
+        query = misspell(term, rng)
+        began = time.perf_counter()
+        names, tags = index.correct(query)
+        latencies.append(time.perf_counter() - began)
+        hits += any(text == term for text, _, _ in names + tags)
+    duration = time.perf_counter() - start
+
+    result = summarize(latencies, 0, duration)
+    result["build_s"] = round(build_s, 3)
+    result["hit_rate"] = round(hits / lookups, 3) if lookups else 0.0
+    return result
+
+
+def measure_startup(database_url: str) -> Dict[str, float]:
+    """Measure cold import, ``create_app`` and lifespan startup time in ms."""
+    env = dict(os.environ, DATABASE_URL=database_url)
+    output = subprocess.run(
+        [sys.executable, "-c", STARTUP_PROBE],
+        cwd=SERVICE_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    timings = json.loads(output.strip().splitlines()[-1])
+    return {name: round(value, 3) for name, value in timings.items()}
+
+
+def _fake_intent_rows(templates: List[Dict[str, Any]], count: int) -> List[Any]:
+    """Build ORM-like intent rows without touching the database."""
+    rows = []
+    for i in range(count):
+        template = templates[i % len(templates)]
+        rows.append(
+            SimpleNamespace(
+                id=i + 1,
+                service_id=i % 100 + 1,
+                intent_uid=f"{template['domain']}:{template['intent_name']}:v{i + 1}",
+                intent_name=template["intent_name"],
+                description=template["description"],
+                input_parameters=template.get("input_parameters", []),
+                output_parameters=template.get("output_parameters", []),
+                endpoint=template["endpoint"],
+                tags=[SimpleNamespace(name=tag) for tag in template.get("tags", [])],
+            )
+        )
+    return rows
+
+
+def _default_encode(rows: List[Any]) -> bytes:
+    """Hand-built dicts through jsonable_encoder, as FastAPI does by default."""
+    content = [
+        {
+            "id": row.id,
+            "service_id": row.service_id,
+            "intent_uid": row.intent_uid,
+            "intent_name": row.intent_name,
+            "description": row.description,
+            "input_parameters": row.input_parameters,
+            "output_parameters": row.output_parameters,
+            "endpoint": row.endpoint,
+            "tags": [{"name": tag.name} for tag in row.tags] if row.tags else [],
+        }
+        for row in rows
+    ]
+    return json.dumps(jsonable_encoder(content)).encode("utf-8")
+
+
+def run_encode_benchmark(
+    intents: int = 1000,
+    rounds: int = 20,
+    templates: Optional[List[Dict[str, Any]]] = None,
+) -> Dict[str, Any]:
+    """Measure response encoding time per 1k intents for each encode path."""
+    rows = _fake_intent_rows(templates or load_templates(), intents)
+    paths = {
+        "default": lambda: _default_encode(rows),
+        "fast": lambda: responses.dumps(serialize_intents(rows)),
+        "fast_gzip": lambda: responses.compress(
+            responses.dumps(serialize_intents(rows)), "gzip"
+        ),
+    }
+    if responses.brotli is not None:
+        paths["fast_br"] = lambda: responses.compress(
+            responses.dumps(serialize_intents(rows)), "br"
+        )
+
+    result = {"intents": intents, "brotli": responses.brotli is not None}
+    for name, encode in paths.items():
+        samples = []
+        for _ in range(rounds):
+            start = time.perf_counter()
+            body = encode()
+            samples.append(time.perf_counter() - start)
+        result[name] = {
+            "ms_per_1k": round(statistics.median(samples) * 1000 * 1000 / intents, 3),
+            "bytes": len(body),
+        }
+    return result
@@ -1,6 +1,8 @@
 # scripts/crawler.py
-# USAGE: python scripts/crawler.py
+# USAGE: python scripts/crawler.py domains.txt [--checkpoint crawl.checkpoint]
+#        cat domains.txt | python scripts/crawler.py -
 
+import argparse
 import asyncio
 import logging
 import os
@@ -9,17 +11,78 @@ import sys
 # Adjust the import path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from app.services.crawler import start_crawler
+from app.database import get_sessionmaker
+from app.services.crawler import CrawlCheckpoint, crawl_stream, iter_domains
 from app.utils.logging import setup_logging
 
 
-def main():
+def parse_args(argv=None):
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(
+        description="Crawl agents.json files for a list of domains."
+    )
+    parser.add_argument(
+        "input",
+        help="File with one domain per line, or '-' to read from stdin.",
+    )
+    parser.add_argument(
+        "--checkpoint",
+        help="Checkpoint file used to save and resume progress.",
+    )
+    parser.add_argument(
+        "--checkpoint-every",
+        type=int,
+        default=1000,
+        help="Save the checkpoint every N domains (default: 1000).",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=100,
+        help="Number of domains crawled concurrently (default: 100).",
+    )
+    parser.add_argument(
+        "--fresh",
+        action="store_true",
+        help="Ignore an existing checkpoint and start from the beginning.",
+    )
+    return parser.parse_args(argv)
+
+
+async def run(args, stream):
+    """Crawl the domains in ``stream`` with a dedicated database session."""
+    source = "<stdin>" if args.input == "-" else os.path.abspath(args.input)
+    checkpoint = None
+    if args.checkpoint:
+        checkpoint = CrawlCheckpoint(args.checkpoint, source=source)
+        if args.fresh:
+            checkpoint.clear()
+
+    db_session = get_sessionmaker()()
+    try:
+        return await crawl_stream(
+            iter_domains(stream),
+            db_session,
+            batch_size=args.concurrency,
+            checkpoint=checkpoint,
+            checkpoint_interval=args.checkpoint_every,
+        )
+    finally:
+        db_session.close()
+
+
+def main(argv=None):
     """Entry point for the crawler script."""
+    args = parse_args(argv)
     setup_logging()
     logger = logging.getLogger(__name__)
     logger.info("Starting crawler...")
-    asyncio.run(start_crawler())
-    logger.info("Crawler finished.")
+    if args.input == "-":
+        processed = asyncio.run(run(args, sys.stdin))
+    else:
+        with open(args.input, "r", encoding="utf-8") as stream:
+            processed = asyncio.run(run(args, stream))
+    logger.info(f"Crawler finished after {processed} domains.")
 
 
 if __name__ == "__main__":
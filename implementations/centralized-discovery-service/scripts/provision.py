@@ -0,0 +1,28 @@
+# scripts/provision.py
+# USAGE: python scripts/provision.py
+
+import logging
+import os
+import sys
+
+# Adjust the import path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.database import dispose_engine, provision_database
+from app.utils.logging import setup_logging
+
+
+def main():
+    """Create the database schema and read models before the app is started."""
+    setup_logging()
+    logger = logging.getLogger(__name__)
+    logger.info("Provisioning database...")
+    try:
+        provision_database()
+    finally:
+        dispose_engine()
+    logger.info("Provisioning finished.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+# scripts/snapshot.py
+# USAGE: python scripts/snapshot.py /var/lib/uim/indexes.snap [--prune]
+
+import argparse
+import logging
+import os
+import sys
+
+# Adjust the import path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.crud.changes import prune_changes
+from app.database import dispose_engine, get_sessionmaker
+from app.services.snapshots import build_snapshot
+from app.utils.logging import setup_logging
+
+
+def parse_args(argv=None):
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(
+        description="Write a snapshot of the search indexes for fast startup."
+    )
+    parser.add_argument("path", help="Snapshot file to write.")
+    parser.add_argument(
+        "--prune",
+        action="store_true",
+        help="Delete catalog changes already contained in the snapshot.",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """Entry point for the snapshot script."""
+    args = parse_args(argv)
+    setup_logging()
+    logger = logging.getLogger(__name__)
+    try:
+        with get_sessionmaker()() as db:
+            revision = build_snapshot(db, args.path)
+            if args.prune:
+                pruned = prune_changes(db, revision)
+                logger.info(f"Pruned {pruned} catalog changes.")
+    finally:
+        dispose_engine()
+
+
+if __name__ == "__main__":
+    main()
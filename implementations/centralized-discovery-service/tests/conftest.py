@@ -12,9 +12,21 @@ os.environ["DATABASE_URL"] = "sqlite:///:memory:"
 # These imports need to be after setting the DATABASE_URL environment variable
 # to ensure the correct database is used for testing
 import pytest
+from app.config import settings
+from app.crud import hooks
+from app.crud.service import create_service
 from app.database import Base
-from app.dependencies import get_db
+from app.dependencies import get_db, get_read_db
 from app.main import create_app
+from app.schemas.intent import IntentCreate
+from app.schemas.service import ServiceCreate
+from app.services.fuzzy import fuzzy_index
+from app.services.nlp import term_coverage
+from app.services.popularity import popularity
+from app.services.query_cache import search_cache
+from app.services.registration import push_queue
+from app.services.tag_index import tag_index
+from app.services.typeahead import typeahead_index
 from app.utils.logging import setup_logging
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
@@ -24,6 +36,30 @@ from sqlalchemy.orm import sessionmaker
 setup_logging()
 
 
+def make_intent(
+    name,
+    tags=(),
+    description=None,
+    inputs=(),
+    outputs=(),
+    version="v1",
+    service_name="testservice.com",
+):
+    """Return the data of an intent of ``service_name`` for CRUD calls.
+
+    ``inputs`` and ``outputs`` are ``(name, type)`` pairs; inputs are required.
+    """
+    return IntentCreate(
+        intent_uid=f"{service_name}:{name}:{version}",
+        intent_name=name,
+        description=f"{name} intent" if description is None else description,
+        input_parameters=[{"name": n, "type": t, "required": True} for n, t in inputs],
+        output_parameters=[{"name": n, "type": t} for n, t in outputs],
+        endpoint=f"https://{service_name}/api/execute/{name}",
+        tags=list(tags),
+    )
+
+
 @pytest.fixture(scope="session")
 def engine():
     """Create a new database engine for testing."""
@@ -40,6 +76,32 @@ def tables(engine):
     Base.metadata.drop_all(bind=engine)
 
 
+@pytest.fixture(autouse=True)
+def reset_search_indexes():
+    """Start every test with empty in-memory search structures."""
+    typeahead_index.reset()
+    search_cache.clear()
+    tag_index.reset()
+    fuzzy_index.reset()
+    popularity.reset()
+    push_queue.reset()
+    term_coverage.reset()
+    yield
+
+
+@pytest.fixture
+def other_process(monkeypatch):
+    """Make CRUD writes look like those of another process.
+
+    Listeners are not notified and the catalog revision does not move, so the
+    in-memory indexes only see the writes through the change log, which they
+    read on every lookup.
+    """
+    monkeypatch.setattr(hooks, "_listeners", [])
+    monkeypatch.setattr(hooks, "_bump_revision", lambda: None)
+    monkeypatch.setattr(settings, "INDEX_SYNC_INTERVAL", 0.0)
+
+
 @pytest.fixture
 def db_session(engine, tables):
     """Create a new database session for a test."""
@@ -56,6 +118,19 @@ def db_session(engine, tables):
     connection.close()
 
 
+@pytest.fixture
+def service(db_session):
+    """Create a test service."""
+    return create_service(
+        db_session,
+        ServiceCreate(
+            name="testservice.com",
+            description="A test service",
+            service_url="https://testservice.com",
+        ),
+    )
+
+
 @pytest.fixture
 def client(db_session):
     """Create a new FastAPI TestClient."""
@@ -69,6 +144,7 @@ def client(db_session):
 
     app = create_app()
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_read_db] = override_get_db
 
     # Create the client with the app parameter
     client = TestClient(app)
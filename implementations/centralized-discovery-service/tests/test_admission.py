@@ -0,0 +1,130 @@
+# tests/test_admission.py
+
+import asyncio
+
+import app.routers.search as search_router
+import pytest
+from app.services.nlp import query_terms
+from app.utils.admission import (
+    ConcurrencyLimiter,
+    Overloaded,
+    TokenBucketLimiter,
+    is_statement_timeout,
+    statement_timeout,
+)
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+
+SLOW_QUERY = text(
+    "WITH RECURSIVE n(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM n) "
+    "SELECT count(*) FROM n"
+)
+
+
+@pytest.mark.asyncio
+async def test_concurrency_limiter_sheds_when_queue_full():
+    """Test that requests beyond the limit and queue are rejected."""
+    limiter = ConcurrencyLimiter(limit=1, max_queue=1, queue_timeout=0.05)
+    async with limiter.slot():
+        # One request may queue, and gives up after the queue timeout
+        with pytest.raises(Overloaded):
+            async with limiter.slot():
+                pass
+
+        waiter = asyncio.ensure_future(limiter.slot().__aenter__())
+        await asyncio.sleep(0)
+        with pytest.raises(Overloaded):
+            async with limiter.slot():
+                pass
+        waiter.cancel()
+
+    async with limiter.slot():
+        pass
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("error", [asyncio.TimeoutError, asyncio.CancelledError])
+async def test_concurrency_limiter_releases_slot_acquired_on_timeout(
+    monkeypatch, error
+):
+    """Test that a slot acquired as the queue timeout fires is not leaked."""
+    limiter = ConcurrencyLimiter(limit=1, max_queue=1, queue_timeout=0.05)
+
+    async def wait_for(acquire, timeout):
+        # Python < 3.12 may drop an acquire that completed as the wait ended
+        await acquire
+        raise error()
+
+    monkeypatch.setattr(asyncio, "wait_for", wait_for)
+    with pytest.raises((Overloaded, asyncio.CancelledError)):
+        async with limiter.slot():
+            pass
+    monkeypatch.undo()
+
+    assert not limiter._semaphore.locked()
+    assert limiter.waiting == 0
+
+
+def test_token_bucket_limits_per_client():
+    """Test that each client gets its own burst and refill."""
+    limiter = TokenBucketLimiter(rate=1.0, burst=2)
+    assert limiter.acquire("a")[0]
+    assert limiter.acquire("a")[0]
+    allowed, retry_after = limiter.acquire("a")
+    assert not allowed
+    assert 0 < retry_after <= 1
+    assert limiter.acquire("b")[0]
+
+
+def test_statement_timeout_interrupts_sqlite_query(engine):
+    """Test that a long-running statement is cancelled at the deadline."""
+    db = Session(bind=engine)
+    with pytest.raises(OperationalError) as excinfo:
+        with statement_timeout(db, 50):
+            db.execute(SLOW_QUERY).scalar()
+    assert is_statement_timeout(excinfo.value)
+    db.rollback()
+
+    # The progress handler is removed afterwards
+    assert db.execute(text("SELECT 1")).scalar() == 1
+    db.close()
+
+
+def test_query_terms_drops_short_duplicate_and_stop_words(monkeypatch):
+    """Test that broad queries are reduced to a bounded set of terms."""
+    monkeypatch.setattr("app.services.nlp.settings.SEARCH_MAX_TERMS", 2)
+    assert query_terms("the a of") == []
+    assert query_terms("Find find weather in Paris") == ["find", "weather"]
+
+
+def test_search_rate_limited(client):
+    """Test that a client over its rate limit gets a 429."""
+    client.app.state.rate_limiter = TokenBucketLimiter(rate=0.01, burst=1)
+    assert client.get("/api/search/", params={"query": "weather"}).status_code == 200
+
+    response = client.get("/api/search/", params={"query": "weather"})
+    assert response.status_code == 429
+    assert int(response.headers["Retry-After"]) >= 1
+
+
+def test_search_overloaded(client):
+    """Test that a full search queue is shed with a 503."""
+    client.app.state.search_limiter = ConcurrencyLimiter(
+        limit=0, max_queue=0, queue_timeout=1
+    )
+    response = client.get("/api/intents/search", params={"intent_name": "Test"})
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
+
+
+def test_search_timeout_returns_503(client, monkeypatch):
+    """Test that a statement timeout during search is reported as a 503."""
+
+    def timed_out(**kwargs):
+        raise OperationalError("SELECT ...", {}, Exception("interrupted"))
+
+    monkeypatch.setattr(search_router, "process_natural_language_query", timed_out)
+    response = client.get("/api/search/", params={"query": "weather"})
+    assert response.status_code == 503
+    assert "Retry-After" in response.headers
@@ -0,0 +1,201 @@
+# tests/test_analysis.py
+
+import pytest
+from app.crud.intent import create_intent, delete_intent, update_intent
+from app.crud.terms import backfill_intent_terms
+from app.models import Intent, intent_terms
+from app.schemas.intent import IntentUpdate
+from app.services.nlp import term_coverage
+from app.services.query_cache import search_cache
+from app.utils.analysis import (
+    detect_language,
+    document_terms,
+    get_analyzer,
+    query_stems,
+    stem_english,
+    stem_german,
+    stem_spanish,
+    tokenize,
+)
+from sqlalchemy import event
+from tests.conftest import make_intent
+
+
+def stored_terms(db_session, intent_id):
+    rows = db_session.execute(
+        intent_terms.select().where(intent_terms.c.intent_id == intent_id)
+    )
+    return {row.term for row in rows}
+
+
+def test_tokenize_folds_case_accents_and_identifiers():
+    """Test that words are split, lowercased and stripped of accents."""
+    assert tokenize("SearchProperty search_hotel") == [
+        "search",
+        "property",
+        "search",
+        "hotel",
+    ]
+    assert tokenize("Réservez un hôtel à Zürich!") == [
+        "reservez",
+        "un",
+        "hotel",
+        "a",
+        "zurich",
+    ]
+    assert tokenize("Straße") == ["strasse"]
+    assert tokenize(None) == []
+
+
+@pytest.mark.parametrize(
+    "stemmer,words",
+    [
+        (stem_english, ["search", "searches", "searching", "searched"]),
+        (stem_english, ["property", "properties"]),
+        (stem_english, ["book", "books", "booking", "booked"]),
+        (stem_english, ["hope", "hopes", "hoping", "hoped"]),
+        (stem_german, ["buchung", "buchungen"]),
+        (stem_german, ["flug", "fluge"]),
+        (stem_spanish, ["reserva", "reservas", "reservar", "reservado"]),
+        (stem_spanish, ["luz", "luces"]),
+    ],
+)
+def test_stemmers_conflate_inflections(stemmer, words):
+    """Test that inflected forms share a stem."""
+    assert len({stemmer(word) for word in words}) == 1
+
+
+def test_detect_language():
+    """Test detection from stopwords, with ties going to English."""
+    assert (
+        detect_language(tokenize("Buche einen Flug nach Berlin mit der Bahn")) == "de"
+    )
+    assert detect_language(tokenize("Réserver un vol pour Paris")) == "fr"
+    assert detect_language(tokenize("Busca vuelos baratos para el verano")) == "es"
+    assert detect_language(tokenize("Book a flight")) == "en"
+    assert detect_language(tokenize("SearchProperty")) is None
+
+
+def test_document_and_query_terms_match():
+    """Test that query words find documents stemmed in their language."""
+    terms = document_terms("Sucht Hotels und Ferienwohnungen in der Stadt", "Suche")
+    assert "und" not in terms and "der" not in terms
+    assert set(query_stems(["ferienwohnung"])) & terms
+    assert set(query_stems(["hotel"])) & terms
+
+    # A declared language stems with that language only
+    assert query_stems(["bookings"], "en") == ["book"]
+    assert len(query_stems(["bookings"])) > 1
+    with pytest.raises(ValueError):
+        get_analyzer("xx")
+
+
+def test_terms_follow_intent_writes(db_session, service):
+    """Test that the analyzed terms are kept current by the CRUD layer."""
+    intent = create_intent(
+        db_session,
+        make_intent("BookFlight", description="Books flights to any city"),
+        service.id,
+    )
+    assert stored_terms(db_session, intent.id) == {"book", "flight", "any", "citi"}
+
+    update_intent(db_session, intent, IntentUpdate(description="Cancels a booking"))
+    assert stored_terms(db_session, intent.id) == {"book", "flight", "cancel"}
+
+    intent_id = intent.id
+    delete_intent(db_session, intent)
+    assert stored_terms(db_session, intent_id) == set()
+
+
+def test_backfill_intent_terms(db_session, service):
+    """Test analyzing intents written before the table existed."""
+    intents = [
+        create_intent(
+            db_session, make_intent(name, description="Finds hotels"), service.id
+        )
+        for name in ("FindHotel", "FindRoom", "FindFlat")
+    ]
+    db_session.execute(intent_terms.delete())
+    db_session.commit()
+
+    assert backfill_intent_terms(db_session, batch_size=2) == 3
+    assert stored_terms(db_session, intents[0].id) == {"find", "hotel"}
+    assert backfill_intent_terms(db_session) == 0
+
+
+def test_search_matches_stems_in_any_language(client, db_session, service):
+    """Test that natural language search matches inflected and non-English words."""
+    create_intent(
+        db_session,
+        make_intent("SearchProperty", description="Searches residential properties"),
+        service.id,
+    )
+    create_intent(
+        db_session,
+        make_intent(
+            "ReservarVuelo", description="Reserva vuelos baratos para el verano"
+        ),
+        service.id,
+    )
+    create_intent(
+        db_session,
+        make_intent(
+            "HotelSuchen", description="Sucht Hotels und Ferienwohnungen in der Stadt"
+        ),
+        service.id,
+    )
+
+    def search(query, **params):
+        response = client.get("/api/search/", params={"query": query, **params})
+        assert response.status_code == 200
+        return [item["intent_name"] for item in response.json()]
+
+    assert search("searching for a property") == ["SearchProperty"]
+    assert search("vuelo barato") == ["ReservarVuelo"]
+    assert search("ferienwohnung") == ["HotelSuchen"]
+    assert search("hotel", lang="en") == ["HotelSuchen"]
+    assert search("reservas", lang="es") == ["ReservarVuelo"]
+
+    response = client.get("/api/search/", params={"query": "hotel", "lang": "xx"})
+    assert response.status_code == 422
+
+
+def test_search_finds_intents_without_terms(client, db_session, service):
+    """Test that intents written past the CRUD layer are matched by substring."""
+    create_intent(
+        db_session, make_intent("FindHotel", description="Finds hotels"), service.id
+    )
+    db_session.add(
+        Intent(
+            service_id=service.id,
+            intent_uid="testservice.com:FindRoom:v1",
+            intent_name="FindRoom",
+            description="Finds hotel rooms",
+            endpoint="https://testservice.com/api/execute/FindRoom",
+        )
+    )
+    db_session.commit()
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    def search(query):
+        statements.clear()
+        event.listen(engine, "before_cursor_execute", capture)
+        try:
+            response = client.get("/api/search/", params={"query": query})
+        finally:
+            event.remove(engine, "before_cursor_execute", capture)
+        search_cache.clear()
+        return sorted(item["intent_name"] for item in response.json())
+
+    engine = db_session.get_bind().engine
+    assert search("hotel") == ["FindHotel", "FindRoom"]
+    assert any("LIKE" in statement for statement in statements)
+
+    # Once every intent has terms, search only looks them up by index
+    backfill_intent_terms(db_session)
+    term_coverage.reset()
+    assert search("hotel") == ["FindHotel", "FindRoom"]
+    assert not any("LIKE" in statement for statement in statements)
@@ -0,0 +1,118 @@
+# tests/test_benchmarks.py
+
+import asyncio
+import random
+
+import benchmarks.workloads as workloads
+import pytest
+from app.models import Intent, Service, Tag
+from app.services.fuzzy import edit_distance
+from benchmarks.__main__ import compare_reports
+from benchmarks.catalog import generate_catalog, load_templates
+from benchmarks.workloads import (
+    WorkloadError,
+    misspell,
+    percentile,
+    run_fuzzy_workload,
+    run_http_workload,
+    run_ingest_workload,
+    summarize,
+)
+from fastapi import FastAPI, HTTPException
+
+
+def test_load_templates():
+    """Test that the example intents are available as templates."""
+    templates = load_templates()
+    assert templates
+    assert all("intent_uid" in t and t["domain"] for t in templates)
+
+
+def test_generate_catalog(db_session):
+    """Test generating a small synthetic catalog."""
+    catalog = generate_catalog(db_session, intents=50, services=10, seed=1)
+
+    assert db_session.query(Service).count() == 10
+    assert db_session.query(Intent).count() == 50
+    assert len(set(catalog.intent_uids)) == 50
+    assert db_session.query(Tag).count() == len(catalog.tags)
+    intent = db_session.query(Intent).filter_by(intent_uid=catalog.intent_uids[0]).one()
+    assert intent.tags
+
+
+def test_percentile_and_summary():
+    """Test latency percentiles and the workload summary."""
+    samples = [i / 1000 for i in range(1, 101)]
+    assert percentile(samples, 50) == 0.05
+    assert percentile(samples, 99) == 0.099
+    assert percentile([], 95) == 0.0
+
+    summary = summarize(samples, errors=2, duration=1.0)
+    assert summary["requests"] == 102
+    assert summary["throughput_rps"] == 100
+    assert summary["p95_ms"] == 95.0
+
+
+def test_compare_reports():
+    """Test detecting regressions against a baseline report."""
+    baseline = {
+        "workloads": {
+            "get": {"p50_ms": 1.0, "p95_ms": 2.0, "p99_ms": 3.0, "throughput_rps": 100}
+        }
+    }
+    current = {
+        "workloads": {
+            "get": {"p50_ms": 1.1, "p95_ms": 3.0, "p99_ms": 3.0, "throughput_rps": 70}
+        }
+    }
+    regressions = compare_reports(baseline, current, tolerance=0.2)
+    assert regressions == ["get.p95_ms: 2.0 -> 3.0", "get.throughput_rps: 100 -> 70"]
+
+
+def test_http_workload_fails_on_unsuccessful_responses():
+    """Test that rejected requests fail the workload instead of being timed."""
+    app = FastAPI()
+    calls = []
+
+    @app.get("/limited")
+    def limited():
+        calls.append(1)
+        if len(calls) > 3:
+            raise HTTPException(status_code=429, detail="Too many requests")
+        return {}
+
+    def make_request():
+        return {"url": "/limited"}
+
+    summary = asyncio.run(run_http_workload(app, make_request, 3, 1))
+    assert summary["requests"] == 3 and summary["errors"] == 0
+    with pytest.raises(WorkloadError, match="429"):
+        asyncio.run(run_http_workload(app, make_request, 3, 1))
+
+
+def test_ingest_workload_fails_on_write_errors(db_session, monkeypatch):
+    """Test that failed ingests fail the workload instead of being timed."""
+    summary = run_ingest_workload(db_session, 2, 3)
+    assert summary["requests"] == 2 and summary["errors"] == 0
+    assert db_session.query(Intent).count() == 6
+
+    def fail(db, agents_json):
+        raise RuntimeError("database unavailable")
+
+    monkeypatch.setattr(workloads, "ingest_agents_json", fail)
+    with pytest.raises(WorkloadError, match="database unavailable"):
+        run_ingest_workload(db_session, 2, 3)
+
+
+def test_fuzzy_workload(db_session):
+    """Test timing typo corrections against a generated catalog."""
+    rng = random.Random(0)
+    for term in ("BookFlight", "ab", "aa", "x"):
+        for _ in range(50):
+            assert edit_distance(term, misspell(term, rng), 2) == 1
+
+    catalog = generate_catalog(db_session, intents=50, services=10, seed=1)
+    summary = run_fuzzy_workload(db_session, catalog, 20)
+    assert summary["requests"] == 20 and summary["errors"] == 0
+    assert summary["p99_ms"] > 0
+    assert 0 < summary["hit_rate"] <= 1
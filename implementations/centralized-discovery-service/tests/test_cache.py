@@ -0,0 +1,71 @@
+# tests/test_cache.py
+
+import app.crud.hooks as hooks
+from app.services.query_cache import QueryResultCache
+from app.utils.cache import LRUCache, SharedCounter, SQLiteCache, TieredCache
+
+
+def test_lru_cache_is_revision_aware():
+    """Test that entries only hit under their revision and expire later."""
+    cache = LRUCache(max_size=10)
+    cache.set("a", b"12345", revision=1)
+    cache.set("b", b"123", revision=2)
+    assert cache.get("a", 1) == b"12345"
+    assert cache.get("a", 2) is None
+
+    cache.expire(2)
+    assert len(cache) == 1
+    cache.set("c", b"12345678", revision=2)
+    assert cache.get("b", 2) is None
+    assert cache.get("c", 2) == b"12345678"
+
+
+def test_sqlite_cache_is_shared_between_instances(tmp_path):
+    """Test that a value stored by one worker is visible to another."""
+    path = str(tmp_path / "shared" / "search.sqlite")
+    first, second = SQLiteCache(path), SQLiteCache(path)
+    first.set("key", b"value", revision=3)
+    assert second.get("key", 3) == b"value"
+    assert second.get("key", 4) is None
+
+    second.expire(4)
+    assert first.get("key", 3) is None
+
+
+def test_sqlite_cache_trims_oldest_entries(tmp_path):
+    """Test that the shared tier stays within its entry budget."""
+    cache = SQLiteCache(str(tmp_path / "search.sqlite"), max_entries=2)
+    cache.TRIM_EVERY = 1
+    for key in ("a", "b", "c"):
+        cache.set(key, b"x", revision=1)
+    assert cache.get("a", 1) is None
+    assert cache.get("c", 1) == b"x"
+
+
+def test_tiered_cache_fills_local_tier_from_shared(tmp_path):
+    """Test that shared hits are promoted into the local tier."""
+    shared = SQLiteCache(str(tmp_path / "search.sqlite"))
+    writer = TieredCache(LRUCache(100), shared)
+    reader = TieredCache(LRUCache(100), shared)
+    writer.set("key", b"value", revision=1)
+
+    assert reader.local.get("key", 1) is None
+    assert reader.get("key", 1) == b"value"
+    assert reader.local.get("key", 1) == b"value"
+
+
+def test_shared_revision_invalidates_other_workers(tmp_path, monkeypatch):
+    """Test that a revision bump in one process reaches every cache."""
+    path = str(tmp_path / "catalog.revision")
+    monkeypatch.setattr(hooks, "_shared_revision", SharedCounter(path))
+    other_worker = SharedCounter(path)
+
+    cache = QueryResultCache(LRUCache(100))
+    revision = hooks.catalog_revision()
+    cache.put("query", [3, 1, 2], revision)
+    assert cache.get("query") == (3, 1, 2)
+
+    assert other_worker.increment() == revision + 1
+    assert hooks.catalog_revision() == revision + 1
+    assert cache.get("query") is None
+    other_worker.close()
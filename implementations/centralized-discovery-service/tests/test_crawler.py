@@ -4,7 +4,7 @@ from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 from app.models import Intent, Service
-from app.services.crawler import Crawler
+from app.services.crawler import CrawlCheckpoint, Crawler, crawl_stream, iter_domains
 from sqlalchemy.orm import Session
 
 
@@ -113,3 +113,64 @@ def test_crawler_process_agents_json(db_session, mock_agents_json):
     )
     assert intent is not None
     assert intent.intent_name == "TestIntent"
+
+
+def test_crawler_recrawl_updates_intents(db_session, mock_agents_json):
+    """Test that crawling a service again refreshes its existing intents."""
+    crawler = Crawler(domains=[], db_session=db_session)
+    crawler.process_agents_json(mock_agents_json)
+
+    mock_agents_json["intents"][0]["description"] = "An updated test intent"
+    mock_agents_json["intents"][0]["tags"] = ["test"]
+    crawler.process_agents_json(mock_agents_json)
+
+    intents = db_session.query(Intent).all()
+    assert len(intents) == 1
+    assert intents[0].description == "An updated test intent"
+    assert [tag.name for tag in intents[0].tags] == ["test"]
+
+
+def test_iter_domains_skips_blanks_and_comments():
+    """Test that iter_domains yields only domain lines."""
+    lines = ["example.com\n", "\n", "# comment\n", "  testservice.com  \n"]
+    assert list(iter_domains(lines)) == ["example.com", "testservice.com"]
+
+
+def test_crawl_checkpoint_roundtrip(tmp_path):
+    """Test saving and loading a crawl checkpoint."""
+    path = str(tmp_path / "crawl.checkpoint")
+    checkpoint = CrawlCheckpoint(path, source="domains.txt")
+    assert checkpoint.load() == 0
+
+    checkpoint.save(42)
+    assert checkpoint.load() == 42
+    # A checkpoint for a different input is ignored
+    assert CrawlCheckpoint(path, source="other.txt").load() == 0
+
+    checkpoint.clear()
+    assert checkpoint.load() == 0
+
+
+@pytest.mark.asyncio
+async def test_crawl_stream_resumes_from_checkpoint(tmp_path):
+    """Test that crawl_stream skips processed domains and saves progress."""
+    db_session = MagicMock(spec=Session)
+    checkpoint = CrawlCheckpoint(str(tmp_path / "crawl.checkpoint"), source="test")
+    checkpoint.save(2)
+    domains = iter(f"domain{i}.com" for i in range(5))
+
+    with patch.object(
+        Crawler, "process_domain", new_callable=AsyncMock
+    ) as mock_process_domain:
+        processed = await crawl_stream(
+            domains,
+            db_session,
+            batch_size=2,
+            checkpoint=checkpoint,
+            checkpoint_interval=1,
+        )
+
+    assert processed == 5
+    crawled = [call.args[0] for call in mock_process_domain.call_args_list]
+    assert crawled == ["domain2.com", "domain3.com", "domain4.com"]
+    assert checkpoint.load() == 5
@@ -68,7 +68,9 @@ def test_create_intent(db_session, setup_data):
         intent_uid="testservice.com:NewTestIntent:v1",
         intent_name="NewTestIntent",
         description="A new test intent",
-        input_parameters=[],
+        input_parameters=[
+            {"name": "query", "type": "string", "required": True},
+        ],
         output_parameters=[],
         endpoint="https://testservice.com/api/execute/NewTestIntent",
         tags=["test", "new"],
@@ -77,6 +79,7 @@ def test_create_intent(db_session, setup_data):
     db_session.commit()
     assert intent.id is not None
     assert intent.intent_name == "NewTestIntent"
+    assert intent.input_parameters[0]["name"] == "query"
     assert len(intent.tags) == 2
     tag_names = [tag.name for tag in intent.tags]
     assert "test" in tag_names
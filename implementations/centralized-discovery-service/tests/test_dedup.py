@@ -0,0 +1,156 @@
+# tests/test_dedup.py
+
+import pytest
+from app.crud.intent import create_intent, delete_intent, update_intent, upsert_intent
+from app.crud.signature import backfill_intent_signatures
+from app.models import IntentSignature, intent_signature_bands
+from app.schemas.intent import IntentUpdate
+from app.utils.minhash import intent_shingles, minhash, similarity
+from tests.conftest import make_intent
+
+DESCRIPTION = (
+    "Search for residential properties for sale by city, price range and "
+    "number of bedrooms"
+)
+PARAMETERS = ["min_price", "max_price", "bedrooms"]
+
+
+def inputs(*names):
+    return [(name, "string") for name in names]
+
+
+@pytest.fixture
+def intents(db_session, service):
+    """Create an intent, a near-duplicate of it and an unrelated intent."""
+    return [
+        create_intent(
+            db_session,
+            make_intent(
+                "SearchProperty",
+                description=DESCRIPTION,
+                inputs=inputs("city", *PARAMETERS),
+            ),
+            service.id,
+        ),
+        create_intent(
+            db_session,
+            make_intent(
+                "SearchProperty",
+                description=DESCRIPTION,
+                inputs=inputs("location", *PARAMETERS),
+                version="v2",
+            ),
+            service.id,
+        ),
+        create_intent(
+            db_session,
+            make_intent(
+                "BookFlight",
+                description="Book a flight between two airports on a given date",
+                inputs=inputs("origin", "destination", "date"),
+            ),
+            service.id,
+        ),
+    ]
+
+
+def clusters(db_session):
+    return {row.intent_id: row.cluster_id for row in db_session.query(IntentSignature)}
+
+
+def banded(db_session):
+    return {
+        intent_id
+        for (intent_id,) in db_session.query(intent_signature_bands.c.intent_id)
+    }
+
+
+def test_signature_similarity():
+    """Test that signatures estimate the similarity of the feature sets."""
+    first = intent_shingles("SearchProperty", DESCRIPTION, ["city", "bedrooms"])
+    second = intent_shingles("SearchProperty", DESCRIPTION, ["location", "bedrooms"])
+    other = intent_shingles("BookFlight", "Book a flight", ["origin"])
+    assert "n:property" in first and "p:city" in first
+    assert similarity(minhash(first), minhash(first)) == 1.0
+    assert similarity(minhash(first), minhash(second)) >= 0.8
+    assert similarity(minhash(first), minhash(other)) < 0.2
+    assert minhash(set()) is None
+
+
+def test_near_duplicates_share_a_cluster(db_session, intents):
+    """Test clustering at ingest and hand-over of a deleted canonical intent."""
+    original, duplicate, other = intents
+    assert clusters(db_session) == {
+        original.id: original.id,
+        duplicate.id: original.id,
+        other.id: other.id,
+    }
+
+    update_intent(db_session, other, IntentUpdate(description="Cancel a hotel booking"))
+    assert clusters(db_session)[other.id] == other.id
+
+    # Only canonical intents are in the LSH buckets
+    assert banded(db_session) == {original.id, other.id}
+
+    delete_intent(db_session, original)
+    assert clusters(db_session) == {duplicate.id: duplicate.id, other.id: other.id}
+    assert banded(db_session) == {duplicate.id, other.id}
+
+    # New duplicates are found through the canonical the cluster was handed to
+    third = create_intent(
+        db_session,
+        make_intent(
+            "SearchProperty",
+            description=DESCRIPTION,
+            inputs=inputs("location", *PARAMETERS),
+            version="v3",
+        ),
+        other.service_id,
+    )
+    assert clusters(db_session)[third.id] == duplicate.id
+
+
+def test_re_signing_keeps_clusters(db_session, intents):
+    """Test that re-ingested intents keep their clusters and canonical intent."""
+    original, duplicate, other = intents
+    expected = clusters(db_session)
+    signed = {row.intent_id: row.signature for row in db_session.query(IntentSignature)}
+
+    data = make_intent(
+        "SearchProperty", description=DESCRIPTION, inputs=inputs("city", *PARAMETERS)
+    )
+    upsert_intent(db_session, data, original.service_id)
+    assert clusters(db_session) == expected
+    assert db_session.get(IntentSignature, original.id).signature == signed[original.id]
+
+    # Still similar to its duplicate: re-signed, but still the canonical intent
+    data.input_parameters = data.input_parameters[:-1]
+    upsert_intent(db_session, data, original.service_id)
+    assert clusters(db_session) == expected
+    db_session.expire_all()
+    assert db_session.get(IntentSignature, original.id).signature != signed[original.id]
+
+
+def test_search_collapses_duplicates(client, intents):
+    """Test that both search endpoints can return one intent per cluster."""
+    params = {"query": "residential properties"}
+    assert len(client.get("/api/search/", params=params).json()) == 2
+    response = client.get("/api/search/", params={**params, "collapse": "true"})
+    assert [item["intent_uid"] for item in response.json()] == [
+        "testservice.com:SearchProperty:v1"
+    ]
+
+    params = {"description": "bedrooms", "collapse": "true"}
+    response = client.get("/api/intents/search", params=params)
+    assert [item["intent_uid"] for item in response.json()] == [
+        "testservice.com:SearchProperty:v1"
+    ]
+
+
+def test_backfill_intent_signatures(db_session, intents):
+    """Test that the backfill clusters existing intents in ID order."""
+    expected = clusters(db_session)
+    db_session.query(IntentSignature).delete()
+    assert backfill_intent_signatures(db_session, batch_size=2) == 3
+    assert clusters(db_session) == expected
+    assert backfill_intent_signatures(db_session) == 0
@@ -1,10 +1,12 @@
 # tests/test_discovery.py
 
 import pytest
+from app.config import settings
 from app.crud.intent import create_intent
 from app.crud.service import create_service
 from app.schemas.intent import IntentCreate
 from app.schemas.service import ServiceCreate
+from sqlalchemy import event
 
 # Use the client fixture from conftest.py
 
@@ -80,3 +82,68 @@ def test_search_intents(client, setup_data, query_params, expected_count):
     assert response.status_code == 200
     data = response.json()
     assert len(data) == expected_count
+
+
+def test_search_intents_sparse_fields(client, engine, setup_data):
+    """Test that a fields projection limits both the SQL and the response."""
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        response = client.get(
+            "/api/intents/search",
+            params={"tags": "test", "fields": "intent_uid,intent_name"},
+        )
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+
+    assert response.status_code == 200
+    data = response.json()
+    assert len(data) == 2
+    assert all(set(item) == {"intent_uid", "intent_name"} for item in data)
+    assert statements
+    assert not any("input_parameters" in statement for statement in statements)
+
+
+def test_search_intents_unknown_field(client, setup_data):
+    """Test that unknown fields are rejected."""
+    response = client.get("/api/intents/search", params={"fields": "secret"})
+    assert response.status_code == 422
+
+
+def test_resolve_intents_batch(client, setup_data):
+    """Test resolving several intents by UID in one request."""
+    response = client.post(
+        "/api/intents/batch",
+        json={
+            "intent_uids": [
+                "testservice.com:AnotherIntent:v1",
+                "testservice.com:Missing:v1",
+                "testservice.com:TestIntent:v1",
+                "testservice.com:AnotherIntent:v1",
+            ]
+        },
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert [intent["intent_uid"] for intent in data["found"]] == [
+        "testservice.com:AnotherIntent:v1",
+        "testservice.com:TestIntent:v1",
+    ]
+    assert {tag["name"] for tag in data["found"][1]["tags"]} == {"test", "intent"}
+    assert data["missing"] == ["testservice.com:Missing:v1"]
+
+
+def test_resolve_intents_batch_limit(client, setup_data):
+    """Test that oversized batches are rejected."""
+    uids = [f"a:Intent{n}:v1" for n in range(settings.BATCH_MAX_UIDS + 1)]
+    response = client.post("/api/intents/batch", json={"intent_uids": uids})
+    assert response.status_code == 422
+    assert response.json()["detail"][0]["loc"] == ["body", "intent_uids"]
+
+    response = client.post("/api/intents/batch", json={"intent_uids": uids[:-1]})
+    assert response.status_code == 200
+    assert len(response.json()["missing"]) == settings.BATCH_MAX_UIDS
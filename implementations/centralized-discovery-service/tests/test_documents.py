@@ -0,0 +1,117 @@
+# tests/test_documents.py
+
+import json
+
+from app.crud.document import backfill_intent_documents, get_intent_document
+from app.crud.intent import create_intent, delete_intent, update_intent
+from app.crud.service import delete_service
+from app.crud.stats import add_intent_stats
+from app.models import (
+    Intent,
+    IntentDocument,
+    IntentParameter,
+    IntentSignature,
+    IntentStats,
+    IntentVersion,
+    intent_terms,
+)
+from app.schemas.intent import IntentUpdate
+from app.utils.serialization import serialize_intent
+from sqlalchemy import event
+from tests.conftest import make_intent
+
+
+def test_document_follows_intent_writes(db_session, service):
+    """Test that creates, updates and deletes maintain the read model."""
+    intent = create_intent(
+        db_session, make_intent("BookFlight", ["travel"]), service.id
+    )
+    document = db_session.get(IntentDocument, intent.id)
+    assert json.loads(document.document) == serialize_intent(intent)
+    assert document.service_name == "testservice.com"
+    assert document.tag_names == ["travel"]
+
+    update_intent(
+        db_session, intent, IntentUpdate(description="Book a flight", tags=[])
+    )
+    document = json.loads(get_intent_document(db_session, intent.intent_uid))
+    assert document["description"] == "Book a flight"
+    assert document["tags"] == []
+
+    delete_intent(db_session, intent)
+    assert db_session.query(IntentDocument).count() == 0
+
+
+def test_delete_service_removes_documents(db_session, service):
+    """Test that deleting a service drops the read models of its intents."""
+    intent = create_intent(
+        db_session, make_intent("BookFlight", ["travel"]), service.id
+    )
+    create_intent(db_session, make_intent("BookHotel", ["travel"]), service.id)
+    add_intent_stats(db_session, {intent.id: (1, 1)})
+    db_session.commit()
+    delete_service(db_session, service)
+    for model in (
+        IntentDocument,
+        IntentParameter,
+        IntentSignature,
+        IntentStats,
+        IntentVersion,
+    ):
+        assert db_session.query(model).count() == 0
+    assert db_session.query(intent_terms).count() == 0
+
+
+def test_get_intent_served_from_document(client, db_session, engine, service):
+    """Test that a single intent is read with one single-table query."""
+    intent = create_intent(
+        db_session, make_intent("BookFlight", ["travel"]), service.id
+    )
+    expected = serialize_intent(intent)
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        response = client.get("/api/intents/testservice.com:BookFlight:v1")
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+
+    assert response.status_code == 200
+    assert response.json() == expected
+    assert len(statements) == 1
+    assert "intent_documents" in statements[0]
+    assert "JOIN" not in statements[0].upper()
+
+
+def test_reads_fall_back_without_document(client, db_session, service):
+    """Test intents written outside the CRUD layer until they are backfilled."""
+    create_intent(db_session, make_intent("BookFlight", ["travel"]), service.id)
+    db_session.add(
+        Intent(
+            service_id=service.id,
+            intent_uid="testservice.com:Legacy:v1",
+            intent_name="Legacy",
+            description="Legacy intent",
+            input_parameters=[],
+            output_parameters=[],
+            endpoint="https://testservice.com/api/execute/Legacy",
+        )
+    )
+    db_session.commit()
+
+    response = client.get("/api/intents/testservice.com:Legacy:v1")
+    assert response.json()["intent_name"] == "Legacy"
+
+    uids = ["testservice.com:Legacy:v1", "testservice.com:BookFlight:v1", "x:y:v1"]
+    data = client.post("/api/intents/batch", json={"intent_uids": uids}).json()
+    assert [i["intent_name"] for i in data["found"]] == ["Legacy", "BookFlight"]
+    assert data["missing"] == ["x:y:v1"]
+
+    assert backfill_intent_documents(db_session) == 1
+    assert backfill_intent_documents(db_session) == 0
+    data = client.post("/api/intents/batch", json={"intent_uids": uids}).json()
+    assert [i["intent_name"] for i in data["found"]] == ["Legacy", "BookFlight"]
+    assert data["missing"] == ["x:y:v1"]
@@ -0,0 +1,88 @@
+# tests/test_explain.py
+
+import pytest
+from app.config import settings
+from app.crud.intent import create_intent
+from app.crud.service import create_service
+from app.schemas.intent import IntentCreate
+from app.schemas.service import ServiceCreate
+
+ADMIN = {"X-Admin-Key": "secret"}
+
+
+@pytest.fixture
+def intents(db_session, monkeypatch):
+    """Enable explaining and create two intents."""
+    monkeypatch.setattr(settings, "ADMIN_API_KEY", "secret")
+    service = create_service(
+        db_session,
+        ServiceCreate(
+            name="testservice.com",
+            description="A test service",
+            service_url="https://testservice.com",
+        ),
+    )
+    for name in ("SearchProperty", "BookViewing"):
+        create_intent(
+            db_session,
+            IntentCreate(
+                intent_uid=f"testservice.com:{name}:v1",
+                intent_name=name,
+                description=f"{name} for real estate",
+                input_parameters=[],
+                output_parameters=[],
+                endpoint=f"https://testservice.com/api/execute/{name}",
+                tags=["realestate"],
+            ),
+            service.id,
+        )
+
+
+@pytest.mark.parametrize(
+    "url, params",
+    [
+        ("/api/intents/search", {"description": "real estate"}),
+        ("/api/search/", {"query": "real estate"}),
+    ],
+)
+def test_explain_search(client, intents, url, params):
+    """Test that admins get SQL, plans and timings next to the results."""
+    response = client.get(url, params={**params, "explain": "true"}, headers=ADMIN)
+    assert response.status_code == 200
+    data = response.json()
+    assert len(data["results"]) == 2
+
+    explain = data["explain"]
+    assert explain["rows"] == 2
+    assert set(explain["timings"]) == {
+        "query_build_ms",
+        "db_ms",
+        "orm_hydration_ms",
+        "serialization_ms",
+    }
+    assert explain["timings"]["db_ms"] > 0
+    selects = [q for q in explain["queries"] if q["sql"].startswith("SELECT")]
+    assert selects
+    assert all(q["plan"] for q in selects)
+    assert any("intents" in q["sql"] for q in selects)
+
+    # The cached natural language page is not used when explaining
+    again = client.get(url, params={**params, "explain": "true"}, headers=ADMIN)
+    assert again.json()["explain"]["queries"]
+
+
+def test_explain_requires_admin_key(client, intents, monkeypatch):
+    """Test that explaining is refused without the right key."""
+    params = {"query": "real estate", "explain": "true"}
+    assert client.get("/api/search/", params=params).status_code == 403
+    response = client.get(
+        "/api/search/", params=params, headers={"X-Admin-Key": "wrong"}
+    )
+    assert response.status_code == 403
+
+    monkeypatch.setattr(settings, "ADMIN_API_KEY", "")
+    assert client.get("/api/search/", params=params, headers=ADMIN).status_code == 403
+
+    # Plain searches are unaffected
+    response = client.get("/api/search/", params={"query": "real estate"})
+    assert len(response.json()) == 2
@@ -0,0 +1,120 @@
+# tests/test_fuzzy.py
+
+import pytest
+from app.config import settings
+from app.crud import hooks
+from app.crud.intent import create_intent, delete_intent, get_intent_by_uid
+from app.services.fuzzy import SymSpellDictionary, edit_distance, fuzzy_index
+from tests.conftest import make_intent
+
+
+@pytest.mark.parametrize(
+    "a, b, expected",
+    [
+        ("flight", "flight", 0),
+        ("flight", "flght", 1),
+        ("flight", "fligth", 1),
+        ("flight", "flaghd", 2),
+        ("flight", "hotel", 3),
+        ("flight", "fl", 3),
+        ("searchproperties", "searchpropreties", 1),
+        ("searchproperties", "saerchpropertise", 2),
+        ("searchproperties", "getpropertydetails", 3),
+        ("topic-1", "topic-12", 1),
+        ("ab", "ba", 1),
+        ("", "ab", 2),
+    ],
+)
+def test_edit_distance(a, b, expected):
+    """Test the capped optimal string alignment distance."""
+    assert edit_distance(a, b, 2) == expected
+
+
+def test_dictionary_lookup_ranks_by_distance_then_count():
+    """Test lookups, including typos inside long terms."""
+    dictionary = SymSpellDictionary()
+    dictionary.load(
+        {"SearchProperty": 3, "SearchProperties": 1, "GetPropertyDetails": 2}
+    )
+    assert dictionary.lookup("searchpropertie") == [
+        ("SearchProperties", 1, 1),
+        ("SearchProperty", 2, 3),
+    ]
+    assert dictionary.lookup("GetProprtyDetails") == [("GetPropertyDetails", 1, 2)]
+    assert dictionary.lookup("serchproperty", max_distance=1) == [
+        ("SearchProperty", 1, 3)
+    ]
+    assert dictionary.lookup("booking") == []
+
+
+def test_dictionary_add_and_remove():
+    """Test that terms are counted and dropped once their count reaches zero."""
+    dictionary = SymSpellDictionary()
+    dictionary.add("BookFlight")
+    dictionary.add("bookflight")
+    dictionary.remove("BookFlight")
+    assert dictionary.lookup("bookflght") == [("BookFlight", 1, 1)]
+    dictionary.remove("BookFlight")
+    assert dictionary.lookup("bookflght") == []
+    assert len(dictionary) == 0
+    assert not dictionary._prefixes and not dictionary._suffixes
+
+
+def test_fuzzy_index_follows_crud_changes(db_session, service):
+    """Test that the index is built lazily and then kept current by hooks."""
+    create_intent(db_session, make_intent("BookFlight", ["travel"]), service.id)
+    fuzzy_index.ensure_ready(db_session)
+    create_intent(db_session, make_intent("CancelOrder", ["shopping"]), service.id)
+    delete_intent(
+        db_session, get_intent_by_uid(db_session, "testservice.com:BookFlight:v1")
+    )
+
+    names, tags = fuzzy_index.correct("cancelordr")
+    assert names == [("CancelOrder", 1, 1)]
+    assert fuzzy_index.correct("bookflght") == ([], [])
+    assert fuzzy_index.correct("shoping")[1] == [("shopping", 1, 1)]
+
+
+def test_fuzzy_index_catches_up_when_the_catalog_revision_moves(
+    db_session, service, monkeypatch
+):
+    """Test that writes of other processes are read from the change log.
+
+    Writes that move the shared catalog revision are applied on the next
+    lookup; others once INDEX_SYNC_INTERVAL has passed.
+    """
+    monkeypatch.setattr(settings, "INDEX_SYNC_INTERVAL", 3600.0)
+    create_intent(db_session, make_intent("BookFlight", ["travel"]), service.id)
+    fuzzy_index.ensure_ready(db_session)
+    monkeypatch.setattr(hooks, "_listeners", [])
+
+    create_intent(db_session, make_intent("CancelOrder", ["shopping"]), service.id)
+    fuzzy_index.ensure_ready(db_session)
+    assert fuzzy_index.correct("cancelordr")[0] == [("CancelOrder", 1, 1)]
+
+    with monkeypatch.context() as patch:
+        patch.setattr(hooks, "_bump_revision", lambda: None)
+        create_intent(db_session, make_intent("TrackOrder", []), service.id)
+    fuzzy_index.ensure_ready(db_session)
+    assert fuzzy_index.correct("trackordr")[0] == []
+    monkeypatch.setattr(settings, "INDEX_SYNC_INTERVAL", 0.0)
+    fuzzy_index.ensure_ready(db_session)
+    assert fuzzy_index.correct("trackordr")[0] == [("TrackOrder", 1, 1)]
+
+
+def test_search_falls_back_to_fuzzy_matches(client, db_session, service):
+    """Test that natural language search tolerates typos in names and tags."""
+    for name, tags in [("SearchProperty", ["realestate"]), ("BookFlight", ["travel"])]:
+        data = make_intent(name, tags, description="Does something useful")
+        create_intent(db_session, data, service.id)
+
+    response = client.get("/api/search/", params={"query": "serch property"})
+    assert response.status_code == 200
+    assert [item["intent_name"] for item in response.json()] == ["SearchProperty"]
+
+    response = client.get("/api/search/", params={"query": "travl"})
+    assert [item["intent_name"] for item in response.json()] == ["BookFlight"]
+
+    # An exact match anywhere in the text wins over fuzzy matches
+    response = client.get("/api/search/", params={"query": "useful"})
+    assert len(response.json()) == 2
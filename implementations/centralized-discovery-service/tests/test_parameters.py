@@ -0,0 +1,107 @@
+# tests/test_parameters.py
+
+from app.crud.intent import create_intent, delete_intent, update_intent
+from app.crud.parameter import backfill_intent_parameters
+from app.models import Intent, IntentParameter
+from app.schemas.intent import IntentUpdate
+from tests.conftest import make_intent
+
+
+def names(response):
+    assert response.status_code == 200
+    return [intent["intent_name"] for intent in response.json()]
+
+
+def test_search_by_parameter(client, db_session, service):
+    """Test filtering intents by input and output parameter name and type."""
+    create_intent(
+        db_session,
+        make_intent(
+            "ScheduleViewing",
+            inputs=[("property_id", "string"), ("date", "date")],
+            outputs=[("viewing_id", "string")],
+        ),
+        service.id,
+    )
+    create_intent(
+        db_session,
+        make_intent(
+            "GetProperty",
+            inputs=[("property_id", "integer")],
+            outputs=[("price", "number")],
+        ),
+        service.id,
+    )
+    create_intent(
+        db_session,
+        make_intent(
+            "SearchProperties",
+            inputs=[("city", "string")],
+            outputs=[("property_id", "string")],
+        ),
+        service.id,
+    )
+
+    search = "/api/intents/search"
+    assert names(client.get(search, params={"input_param": "Property_ID"})) == [
+        "ScheduleViewing",
+        "GetProperty",
+    ]
+    params = {"input_param": "property_id", "input_type": "integer"}
+    assert names(client.get(search, params=params)) == ["GetProperty"]
+    assert names(client.get(search, params={"output_param": "property_id"})) == [
+        "SearchProperties"
+    ]
+    params = {"input_type": "date", "output_type": "string"}
+    assert names(client.get(search, params=params)) == ["ScheduleViewing"]
+    params = {"input_param": "property_id", "intent_name": "Schedule"}
+    assert names(client.get(search, params=params)) == ["ScheduleViewing"]
+
+
+def test_parameter_index_follows_writes(db_session, service):
+    """Test that updates and deletes keep the parameter index current."""
+    intent = create_intent(
+        db_session,
+        make_intent("GetProperty", inputs=[("property_id", "string")]),
+        service.id,
+    )
+    update_intent(
+        db_session,
+        intent,
+        IntentUpdate(
+            input_parameters=[
+                {"name": "listing_id", "type": "string", "required": True}
+            ]
+        ),
+    )
+    rows = db_session.query(IntentParameter.direction, IntentParameter.name).all()
+    assert rows == [("input", "listing_id")]
+
+    delete_intent(db_session, intent)
+    assert db_session.query(IntentParameter).count() == 0
+
+
+def test_backfill_intent_parameters(db_session, service):
+    """Test indexing intents written outside the CRUD layer."""
+    db_session.add(
+        Intent(
+            service_id=service.id,
+            intent_uid="testservice.com:Legacy:v1",
+            intent_name="Legacy",
+            description="Legacy intent",
+            input_parameters=[{"name": "Query", "type": "String", "required": True}],
+            output_parameters=[],
+            endpoint="https://testservice.com/api/execute/Legacy",
+        )
+    )
+    db_session.commit()
+
+    assert backfill_intent_parameters(db_session) == 1
+    assert backfill_intent_parameters(db_session) == 0
+    row = db_session.query(IntentParameter).one()
+    assert (row.direction, row.name, row.type, row.required) == (
+        "input",
+        "query",
+        "string",
+        True,
+    )
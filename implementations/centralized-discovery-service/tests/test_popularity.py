@@ -0,0 +1,132 @@
+# tests/test_popularity.py
+
+import threading
+import time
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import app.services.nlp as nlp_module
+import app.services.popularity as popularity_module
+import pytest
+from app.crud.intent import create_intent, delete_intent, get_intent_by_uid
+from app.models import IntentStats
+from app.services.popularity import ShardedCounter, popularity
+from tests.conftest import make_intent
+
+
+@pytest.fixture
+def intents(db_session, service):
+    """Create three intents matching the same query."""
+    return [
+        create_intent(
+            db_session, make_intent(name, description="Books a trip"), service.id
+        )
+        for name in ("BookFlight", "BookHotel", "BookCar")
+    ]
+
+
+def stored_counts(db_session):
+    return {
+        row.intent_id: (row.fetch_count, row.search_hits)
+        for row in db_session.query(IntentStats)
+    }
+
+
+def test_sharded_counter_merges_threads():
+    """Test that counts from many threads add up when drained."""
+    counter = ShardedCounter(shards=4)
+
+    def work():
+        for _ in range(1000):
+            counter.add((1, 2))
+
+    threads = [threading.Thread(target=work) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert counter
+    assert counter.drain() == {1: 8000, 2: 8000}
+    assert not counter
+    assert counter.drain() == {}
+
+
+def test_flush_adds_to_stored_counts(db_session, intents):
+    """Test that flushes are additive and skip deleted intents."""
+    flight, hotel, car = intents
+    popularity.record_fetch(flight.id)
+    popularity.record_hits([flight.id, hotel.id])
+    assert popularity.flush(db_session) == 2
+
+    popularity.record_fetch(flight.id)
+    popularity.record_hits([car.id])
+    car_id = car.id
+    delete_intent(db_session, car)
+    assert popularity.flush(db_session) == 1
+    assert popularity.flush(db_session) == 0
+
+    assert stored_counts(db_session) == {flight.id: (2, 1), hotel.id: (0, 1)}
+    assert car_id not in stored_counts(db_session)
+
+
+def test_failed_flush_keeps_counts(monkeypatch):
+    """Test that counts survive a failed write."""
+    db = MagicMock()
+    monkeypatch.setattr(
+        popularity_module,
+        "add_intent_stats",
+        MagicMock(side_effect=RuntimeError("database unavailable")),
+    )
+    popularity.record_fetch(7)
+    popularity.record_hits([7, 8])
+    with pytest.raises(RuntimeError):
+        popularity.flush(db)
+    db.rollback.assert_called_once()
+    assert popularity.drain() == {7: (1, 1), 8: (0, 1)}
+
+
+def test_search_ranks_popular_intents_first(client, db_session, intents):
+    """Test that fetches are counted and boost natural language search."""
+    flight, hotel, car = intents
+    response = client.get("/api/intents/testservice.com:BookCar:v1")
+    assert response.status_code == 200
+    popularity.flush(db_session)
+    assert stored_counts(db_session) == {car.id: (1, 0)}
+
+    response = client.get("/api/search/", params={"query": "books trip"})
+    names = [item["intent_name"] for item in response.json()]
+    assert names == ["BookCar", "BookFlight", "BookHotel"]
+
+    popularity.flush(db_session)
+    assert stored_counts(db_session) == {
+        car.id: (1, 1),
+        flight.id: (0, 1),
+        hotel.id: (0, 1),
+    }
+    assert get_intent_by_uid(db_session, "testservice.com:BookCar:v1") is not None
+
+
+def test_cached_rankings_follow_flushed_counts(
+    client, db_session, intents, monkeypatch
+):
+    """Test that a cached ranking is recomputed after a flush interval."""
+    now = [1000.0]
+    monkeypatch.setattr(
+        nlp_module,
+        "time",
+        SimpleNamespace(time=lambda: now[0], monotonic=time.monotonic),
+    )
+    monkeypatch.setattr(nlp_module.settings, "POPULARITY_FLUSH_INTERVAL", 10.0)
+
+    def search():
+        response = client.get("/api/search/", params={"query": "books trip"})
+        return [item["intent_name"] for item in response.json()]
+
+    assert search() == ["BookFlight", "BookHotel", "BookCar"]
+    client.get("/api/intents/testservice.com:BookCar:v1")
+    popularity.flush(db_session)
+    assert search() == ["BookFlight", "BookHotel", "BookCar"]
+
+    now[0] += 10.0
+    assert search() == ["BookCar", "BookFlight", "BookHotel"]
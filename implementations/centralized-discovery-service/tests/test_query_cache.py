@@ -0,0 +1,72 @@
+# tests/test_query_cache.py
+
+from app.crud.hooks import catalog_revision
+from app.crud.intent import create_intent, delete_intent, get_intent_by_uid
+from app.services.query_cache import QueryResultCache, id_list_size, search_cache
+from app.utils.cache import LRUCache
+from tests.conftest import make_intent
+
+
+def test_cache_evicts_least_recently_used():
+    """Test that the cache stays within its ID budget in LRU order."""
+    cache = QueryResultCache(LRUCache(8, sizeof=id_list_size))
+    revision = catalog_revision()
+    cache.put("a", [1, 2, 3], revision)
+    cache.put("b", [4, 5], revision)
+    assert cache.get("a") == (1, 2, 3)
+
+    cache.put("c", [6, 7], revision)
+    assert cache.get("b") is None
+    assert cache.get("a") == (1, 2, 3)
+    assert cache.get("c") == (6, 7)
+
+    # Entries larger than the whole budget are not cached
+    cache.put("d", list(range(10)), revision)
+    assert cache.get("d") is None
+
+
+def test_cache_ignores_stale_results(db_session, service):
+    """Test that a revision bump drops entries and rejects stale puts."""
+    cache = QueryResultCache(LRUCache(100, sizeof=id_list_size))
+    revision = catalog_revision()
+    cache.put("a", [1], revision)
+
+    create_intent(
+        db_session, make_intent("BookFlight", description="Book a flight"), service.id
+    )
+    assert cache.get("a") is None
+    cache.put("a", [1], revision)
+    assert cache.get("a") is None
+
+    cache.put("a", [1], catalog_revision())
+    assert cache.get("a") == (1,)
+
+
+def test_search_serves_repeated_queries_from_cache(client, db_session, service):
+    """Test that repeated queries hit the cache and follow catalog changes."""
+    create_intent(
+        db_session, make_intent("BookFlight", description="Book a flight"), service.id
+    )
+
+    params = {"query": "book a flight", "fields": "intent_name"}
+    assert client.get("/api/search/", params=params).json() == [
+        {"intent_name": "BookFlight"}
+    ]
+    # Word order, case and short words do not change the cache key
+    response = client.get("/api/search/", params={**params, "query": "Flight BOOK"})
+    assert response.json() == [{"intent_name": "BookFlight"}]
+    assert (search_cache.hits, search_cache.misses) == (1, 1)
+
+    create_intent(
+        db_session,
+        make_intent("BookHotel", description="Book a hotel room"),
+        service.id,
+    )
+    names = [i["intent_name"] for i in client.get("/api/search/", params=params).json()]
+    assert names == ["BookFlight", "BookHotel"]
+
+    delete_intent(
+        db_session, get_intent_by_uid(db_session, "testservice.com:BookFlight:v1")
+    )
+    names = [i["intent_name"] for i in client.get("/api/search/", params=params).json()]
+    assert names == ["BookHotel"]
@@ -0,0 +1,264 @@
+# tests/test_registration.py
+
+import json
+import time
+from unittest.mock import MagicMock, patch
+
+import app.crud.intent as intent_crud
+import pytest
+from app.config import settings
+from app.models import Intent, Service
+from app.schemas.service import AgentsJson
+from app.services.crawler import ingest_agents_json
+from app.services.registration import (
+    MAX_ATTEMPTS,
+    PushQueue,
+    ingest_pushes,
+    push_key,
+    push_queue,
+    sign_push,
+)
+from sqlalchemy import event
+
+
+@pytest.fixture(autouse=True)
+def webhook_secret(monkeypatch):
+    monkeypatch.setattr(settings, "WEBHOOK_SECRET", "test-secret")
+
+
+def agents_json(name="pushed.com", description="A pushed intent"):
+    return {
+        "service_info": {
+            "name": name,
+            "description": "A pushed service",
+            "service_url": f"https://{name}",
+        },
+        "intents": [
+            {
+                "intent_uid": f"{name}:PushedIntent:v1",
+                "intent_name": "PushedIntent",
+                "description": description,
+                "input_parameters": [],
+                "output_parameters": [],
+                "endpoint": f"https://{name}/api/execute/PushedIntent",
+                "tags": ["pushed"],
+            }
+        ],
+    }
+
+
+def push(client, data, service=None, timestamp=None, signature=None):
+    body = json.dumps(data).encode()
+    service = service or data["service_info"]["name"]
+    timestamp = timestamp or str(int(time.time()))
+    headers = {
+        "Content-Type": "application/json",
+        "X-Push-Service": service,
+        "X-Push-Timestamp": timestamp,
+        "X-Push-Signature": signature or sign_push(service, timestamp, body),
+    }
+    return client.post("/api/services/push", content=body, headers=headers)
+
+
+def test_push_is_queued_and_ingested(client, db_session):
+    """Test that an accepted push is written by the batch worker."""
+    response = push(client, agents_json())
+    assert response.status_code == 202
+    assert response.json() == {"service": "pushed.com", "intents": 1, "queued": True}
+    assert db_session.query(Service).filter_by(name="pushed.com").first() is None
+
+    assert ingest_pushes(db_session) == 1
+    service = db_session.query(Service).filter_by(name="pushed.com").one()
+    intent = db_session.query(Intent).filter_by(service_id=service.id).one()
+    assert intent.intent_uid == "pushed.com:PushedIntent:v1"
+    assert push_queue.pending == 0
+
+
+def test_pushes_are_coalesced_per_service(client, db_session):
+    """Test that only the latest push of a service is written."""
+    assert push(client, agents_json(description="First")).status_code == 202
+    assert push(client, agents_json(description="Second")).status_code == 202
+    assert push(client, agents_json(name="other.com")).status_code == 202
+    assert push_queue.pending == 2
+
+    with patch(
+        "app.services.registration.ingest_agents_json", wraps=ingest_agents_json
+    ) as ingest:
+        assert ingest_pushes(db_session) == 2
+    assert ingest.call_count == 2
+    intent = db_session.query(Intent).filter_by(intent_uid="pushed.com:PushedIntent:v1")
+    assert intent.one().description == "Second"
+
+
+def test_push_updates_service_info(client, db_session):
+    """Test that a push brings an existing service up to date."""
+    push(client, agents_json())
+    ingest_pushes(db_session)
+    data = agents_json()
+    data["service_info"]["description"] = "Renamed"
+    push(client, data)
+    ingest_pushes(db_session)
+    service = db_session.query(Service).filter_by(name="pushed.com").one()
+    assert service.description == "Renamed"
+
+
+def test_push_rejects_bad_signatures(client):
+    """Test that unsigned, stale or cross-service pushes are rejected."""
+    data = agents_json()
+    assert push(client, data, signature="sha256=00").status_code == 401
+    stale = str(int(time.time()) - settings.PUSH_MAX_SKEW - 60)
+    assert push(client, data, timestamp=stale).status_code == 401
+    assert push(client, data, timestamp="soon").status_code == 401
+
+    # Signed with another service's key
+    body = json.dumps(data).encode()
+    timestamp = str(int(time.time()))
+    headers = {
+        "X-Push-Service": "pushed.com",
+        "X-Push-Timestamp": timestamp,
+        "X-Push-Signature": sign_push("other.com", timestamp, body),
+    }
+    response = client.post("/api/services/push", content=body, headers=headers)
+    assert response.status_code == 401
+    assert push_queue.pending == 0
+
+
+def test_push_validates_body(client):
+    """Test that invalid agents.json and foreign intents are rejected."""
+    data = agents_json()
+    del data["service_info"]["service_url"]
+    assert push(client, data).status_code == 422
+
+    assert push(client, agents_json(), service="other.com").status_code == 422
+
+    data = agents_json()
+    data["intents"][0]["intent_uid"] = "victim.com:PushedIntent:v1"
+    response = push(client, data)
+    assert response.status_code == 422
+    assert "victim.com:PushedIntent:v1" in response.json()["detail"]
+    assert push_queue.pending == 0
+
+
+def test_push_limits(client, monkeypatch):
+    """Test the body size limit and the bound on pending services."""
+    monkeypatch.setattr(settings, "PUSH_MAX_BYTES", 100)
+    assert push(client, agents_json()).status_code == 413
+    # Bodies without a Content-Length are cut off while they are read
+    chunks = iter([b"{" + b" " * 80] * 3)
+    response = client.post(
+        "/api/services/push",
+        content=chunks,
+        headers={
+            "X-Push-Service": "pushed.com",
+            "X-Push-Timestamp": str(int(time.time())),
+            "X-Push-Signature": "sha256=00",
+        },
+    )
+    assert response.status_code == 413
+
+    monkeypatch.setattr(settings, "PUSH_MAX_BYTES", 1048576)
+    monkeypatch.setattr(settings, "PUSH_QUEUE_MAX_SERVICES", 1)
+    assert push(client, agents_json()).status_code == 202
+    # The pending service may still replace its push
+    assert push(client, agents_json(description="Again")).status_code == 202
+    response = push(client, agents_json(name="other.com"))
+    assert response.status_code == 503
+    assert "Retry-After" in response.headers
+
+
+def test_push_disabled_without_secret(client, monkeypatch):
+    """Test that the endpoint is off unless WEBHOOK_SECRET is set."""
+    data = agents_json()
+    timestamp = str(int(time.time()))
+    body = json.dumps(data).encode()
+    signature = sign_push("pushed.com", timestamp, body)
+    monkeypatch.setattr(settings, "WEBHOOK_SECRET", "")
+    response = client.post(
+        "/api/services/push",
+        content=body,
+        headers={
+            "X-Push-Service": "pushed.com",
+            "X-Push-Timestamp": timestamp,
+            "X-Push-Signature": signature,
+        },
+    )
+    assert response.status_code == 404
+
+
+def test_push_keys_are_per_service(monkeypatch):
+    """Test that keys differ per service and follow the secret."""
+    assert push_key("a.com") != push_key("b.com")
+    key = push_key("a.com")
+    monkeypatch.setattr(settings, "WEBHOOK_SECRET", "rotated")
+    assert push_key("a.com") != key
+
+
+def test_intents_are_written_in_one_transaction(db_session, monkeypatch):
+    """Test that a push whose intents fail to write commits nothing."""
+    data = agents_json()
+    data["intents"].append(
+        dict(
+            data["intents"][0],
+            intent_uid="pushed.com:OtherIntent:v1",
+            intent_name="OtherIntent",
+        )
+    )
+    record_intent_change = intent_crud.record_intent_change
+    recorded = []
+
+    def fail_second(db, *snapshots):
+        recorded.append(snapshots)
+        if len(recorded) == 2:
+            raise RuntimeError("down")
+        return record_intent_change(db, *snapshots)
+
+    monkeypatch.setattr(intent_crud, "record_intent_change", fail_second)
+    commits = []
+    event.listen(db_session, "after_commit", commits.append)
+    with pytest.raises(RuntimeError):
+        ingest_agents_json(db_session, AgentsJson(**data))
+    # Neither the service info nor any intent was committed
+    assert commits == []
+
+
+def test_service_info_is_not_committed_when_intents_fail(db_session, monkeypatch):
+    """Test that a failed re-push does not commit the updated service info."""
+    ingest_agents_json(db_session, AgentsJson(**agents_json()))
+    data = agents_json(description="Updated")
+    data["service_info"]["description"] = "An updated service"
+
+    def fail(db, *snapshots):
+        raise RuntimeError("down")
+
+    monkeypatch.setattr(intent_crud, "record_intent_change", fail)
+    commits = []
+    event.listen(db_session, "after_commit", commits.append)
+    with pytest.raises(RuntimeError):
+        ingest_agents_json(db_session, AgentsJson(**data))
+    assert commits == []
+
+
+def test_failed_write_is_retried():
+    """Test that a failed write is requeued unless a newer push arrived."""
+    queue = PushQueue()
+    first = AgentsJson(**agents_json(description="First"))
+    queue.put(first)
+    db = MagicMock()
+    with patch(
+        "app.services.registration.ingest_agents_json", side_effect=Exception("down")
+    ):
+        assert ingest_pushes(db, queue) == 0
+        db.rollback.assert_called_once()
+        assert queue.pending == 1
+
+        # A push arriving before the retry wins over the failed one
+        newer = AgentsJson(**agents_json(description="Second"))
+        queue.put(newer)
+        queue.retry(first, 1)
+        assert queue.drain() == [(newer, 0)]
+
+        # Pushes failing every write are eventually dropped
+        queue.put(first)
+        for _ in range(MAX_ATTEMPTS):
+            ingest_pushes(db, queue)
+        assert queue.pending == 0
@@ -0,0 +1,47 @@
+# tests/test_replicas.py
+
+import app.database as database
+from app.config import settings
+from app.database import ReplicaPool, get_read_sessionmaker
+
+
+def test_replica_pool_round_robin(tmp_path):
+    """Test that reads rotate across healthy replicas."""
+    urls = [f"sqlite:///{tmp_path / name}" for name in ("r1.db", "r2.db")]
+    pool = ReplicaPool(urls, health_check_interval=60)
+
+    factories = [pool.session_factory() for _ in range(4)]
+    engines = [str(factory.kw["bind"].url) for factory in factories]
+    assert engines == urls + urls
+    pool.dispose()
+
+
+def test_replica_pool_skips_unhealthy_replica(tmp_path):
+    """Test that a replica failing its health check is skipped."""
+    good = f"sqlite:///{tmp_path / 'good.db'}"
+    bad = f"sqlite:///{tmp_path / 'missing' / 'bad.db'}"
+    pool = ReplicaPool([bad, good], health_check_interval=60)
+
+    for _ in range(3):
+        assert str(pool.session_factory().kw["bind"].url) == good
+    assert pool.replicas[0].healthy is False
+
+    pool.replicas[1].healthy = False
+    pool.replicas[1].checked_at = float("inf")
+    assert pool.session_factory() is None
+    pool.dispose()
+
+
+def test_read_sessionmaker_falls_back_to_primary(monkeypatch, tmp_path):
+    """Test that reads use the primary when no replica is usable."""
+    monkeypatch.setattr(database, "_replicas", None)
+    assert get_read_sessionmaker() is database.get_sessionmaker()
+
+    bad = f"sqlite:///{tmp_path / 'missing' / 'bad.db'}"
+    monkeypatch.setattr(settings, "DATABASE_REPLICA_URLS", bad)
+    try:
+        assert get_read_sessionmaker() is database.get_sessionmaker()
+        assert database.get_replica_pool().replicas[0].healthy is False
+    finally:
+        database.get_replica_pool().dispose()
+        monkeypatch.setattr(database, "_replicas", None)
@@ -0,0 +1,113 @@
+# tests/test_responses.py
+
+import gzip
+import json
+from types import SimpleNamespace
+
+import orjson
+import pytest
+from app.config import settings
+from app.utils.responses import dumps, json_response, negotiate_encoding
+from app.utils.serialization import serialize_intent
+from starlette.requests import Request
+
+
+def make_request(accept_encoding=None):
+    headers = []
+    if accept_encoding is not None:
+        headers.append((b"accept-encoding", accept_encoding.encode()))
+    return Request({"type": "http", "method": "GET", "headers": headers})
+
+
+@pytest.mark.parametrize(
+    "accept_encoding,expected",
+    [
+        (None, None),
+        ("identity", None),
+        ("gzip, deflate", "gzip"),
+        ("gzip;q=0", None),
+        ("*", "gzip"),
+        ("deflate;q=1, gzip;q=0.5", "gzip"),
+    ],
+)
+def test_negotiate_encoding(monkeypatch, accept_encoding, expected):
+    """Test content coding negotiation without brotli installed."""
+    monkeypatch.setattr("app.utils.responses.brotli", None)
+    assert negotiate_encoding(accept_encoding) == expected
+
+
+def test_json_response_compresses_above_threshold(monkeypatch):
+    """Test that only large responses are compressed."""
+    monkeypatch.setattr("app.utils.responses.brotli", None)
+    monkeypatch.setattr(settings, "COMPRESSION_MIN_SIZE", 100)
+
+    small = json_response(make_request("gzip"), {"a": 1})
+    assert "content-encoding" not in small.headers
+    assert json.loads(small.body) == {"a": 1}
+
+    content = [{"name": "x" * 20}] * 10
+    large = json_response(make_request("gzip"), content)
+    assert large.headers["content-encoding"] == "gzip"
+    assert large.headers["vary"] == "Accept-Encoding"
+    assert json.loads(gzip.decompress(large.body)) == content
+
+    plain = json_response(make_request(), content)
+    assert "content-encoding" not in plain.headers
+
+
+def test_dumps_matches_compact_json():
+    """Test that orjson output matches compact standard library JSON."""
+    content = {"name": "Café", "tags": [{"name": "ü"}], "count": 3, "ok": None}
+    body = dumps(content)
+    assert body == orjson.dumps(content)
+    assert body == json.dumps(
+        content, ensure_ascii=False, separators=(",", ":")
+    ).encode("utf-8")
+
+
+@pytest.mark.parametrize(
+    "accept_encoding,expected",
+    [
+        ("gzip, br", "br"),
+        ("*", "br"),
+        ("br;q=0.5, gzip", "gzip"),
+        ("br;q=0, gzip;q=0", None),
+    ],
+)
+def test_negotiate_encoding_with_brotli(accept_encoding, expected):
+    """Test that brotli is preferred when the extra is installed."""
+    pytest.importorskip("brotli")
+    assert negotiate_encoding(accept_encoding) == expected
+
+
+def test_json_response_compresses_with_brotli(monkeypatch):
+    """Test brotli compression of large responses."""
+    brotli = pytest.importorskip("brotli")
+    monkeypatch.setattr(settings, "COMPRESSION_MIN_SIZE", 100)
+
+    content = [{"name": "x" * 20}] * 10
+    response = json_response(make_request("gzip, br"), content)
+    assert response.headers["content-encoding"] == "br"
+    assert json.loads(brotli.decompress(response.body)) == content
+
+
+def test_serialize_intent():
+    """Test converting an intent row into a dict."""
+    intent = SimpleNamespace(
+        id=1,
+        service_id=2,
+        intent_uid="testservice.com:TestIntent:v1",
+        intent_name="TestIntent",
+        description="A test intent",
+        input_parameters=[],
+        output_parameters=[],
+        endpoint="https://testservice.com/api/execute/TestIntent",
+        tags=[SimpleNamespace(name="test")],
+    )
+    data = serialize_intent(intent)
+    assert data["intent_uid"] == "testservice.com:TestIntent:v1"
+    assert data["tags"] == [{"name": "test"}]
+    assert json.loads(dumps(data)) == data
+    assert serialize_intent(intent, ("intent_uid",)) == {
+        "intent_uid": "testservice.com:TestIntent:v1"
+    }
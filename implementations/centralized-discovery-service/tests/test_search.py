@@ -43,3 +43,14 @@ def test_search_intents_by_query(client, setup_data, query, expected_count):
     assert response.status_code == 200
     data = response.json()
     assert len(data) == expected_count
+
+
+def test_search_intents_by_query_sparse_fields(client, setup_data):
+    """Test requesting a subset of fields from natural language search."""
+    response = client.get(
+        "/api/search/", params={"query": "test intent", "fields": "intent_uid,tags"}
+    )
+    assert response.status_code == 200
+    assert response.json() == [
+        {"intent_uid": "testservice.com:TestIntent:v1", "tags": []}
+    ]
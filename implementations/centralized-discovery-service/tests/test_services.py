@@ -0,0 +1,105 @@
+# tests/test_services.py
+
+import pytest
+from app.crud.intent import create_intent
+from app.crud.service import create_service, list_services
+from app.schemas.service import ServiceCreate
+from sqlalchemy import event
+from tests.conftest import make_intent
+
+
+@pytest.fixture
+def services(db_session):
+    """Create three services with zero, one and three intents."""
+    created = []
+    for name, intents in [
+        ("empty.com", []),
+        ("flights.com", [("BookFlight", ["travel", "booking"])]),
+        (
+            "hotels.com",
+            [
+                ("BookHotel", ["travel", "booking"]),
+                ("CancelHotel", ["travel"]),
+                ("RateHotel", ["reviews"]),
+            ],
+        ),
+    ]:
+        service = create_service(
+            db_session,
+            ServiceCreate(
+                name=name,
+                description=f"{name} service",
+                service_url=f"https://{name}",
+            ),
+        )
+        for intent_name, tags in intents:
+            create_intent(
+                db_session,
+                make_intent(intent_name, tags, service_name=name),
+                service.id,
+            )
+        created.append(service)
+    return created
+
+
+def test_list_services(client, services):
+    """Test intent counts and tag summaries of listed services."""
+    response = client.get("/api/services/", params={"top_tags": 2})
+    assert response.status_code == 200
+    data = response.json()
+    assert data["next_after"] is None
+    assert [
+        (service["name"], service["intent_count"], service["tags"])
+        for service in data["services"]
+    ] == [
+        ("empty.com", 0, []),
+        (
+            "flights.com",
+            1,
+            [{"name": "booking", "count": 1}, {"name": "travel", "count": 1}],
+        ),
+        (
+            "hotels.com",
+            3,
+            [{"name": "travel", "count": 2}, {"name": "booking", "count": 1}],
+        ),
+    ]
+    assert data["services"][0]["service_url"] == "https://empty.com"
+
+
+def test_list_services_uses_the_service_id_index(db_session, services):
+    """Test that counts and tag summaries look intents up by service."""
+    plans = []
+
+    def explain(conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith("SELECT"):
+            plan = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters)
+            plans.append(" ".join(row[-1] for row in plan))
+
+    engine = db_session.get_bind().engine
+    event.listen(engine, "before_cursor_execute", explain)
+    try:
+        list_services(db_session)
+    finally:
+        event.remove(engine, "before_cursor_execute", explain)
+    assert len(plans) == 2
+    for plan in plans:
+        assert "USING COVERING INDEX ix_intents_service_id" in plan
+        assert "AUTOMATIC" not in plan
+
+
+def test_list_services_keyset_pagination(client, services):
+    """Test walking the listing page by page."""
+    names = []
+    params = {"limit": 2}
+    while True:
+        data = client.get("/api/services/", params=params).json()
+        names.extend(service["name"] for service in data["services"])
+        if data["next_after"] is None:
+            break
+        params["after"] = data["next_after"]
+    assert names == ["empty.com", "flights.com", "hotels.com"]
+
+    data = client.get("/api/services/", params={"after": services[-1].id}).json()
+    assert data == {"services": [], "next_after": None}
+    assert client.get("/api/services/", params={"limit": 0}).status_code == 422
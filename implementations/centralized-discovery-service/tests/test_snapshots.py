@@ -0,0 +1,142 @@
+# tests/test_snapshots.py
+
+import os
+
+import app.main as main
+import app.services.snapshots as snapshots
+import pytest
+from app.config import settings
+from app.crud.changes import latest_change_revision, prune_changes
+from app.crud.intent import create_intent, delete_intent, get_intent_by_uid
+from app.models import CatalogChange
+from app.services.fuzzy import fuzzy_index
+from app.services.snapshots import (
+    SEARCH_INDEXES,
+    apply_changes_since,
+    build_snapshot,
+    read_snapshot,
+    sync_indexes,
+    warm_start,
+    write_snapshot,
+)
+from app.services.tag_index import TagBitmapIndex, tag_index
+from app.services.typeahead import TypeaheadIndex, typeahead_index
+from tests.conftest import make_intent
+
+
+def index_state():
+    return (
+        typeahead_index.names.items(),
+        typeahead_index.tags.items(),
+        {name: list(bitmap) for name, bitmap in tag_index.bitmaps.items()},
+    )
+
+
+def test_snapshot_roundtrip_replays_later_changes(db_session, service, tmp_path):
+    """Test that a snapshot plus the change log equals a fresh rebuild."""
+    path = str(tmp_path / "indexes.snap")
+    create_intent(
+        db_session, make_intent("BookFlight", ["travel", "booking"]), service.id
+    )
+    create_intent(db_session, make_intent("BookHotel", ["travel", "hôtel"]), service.id)
+    revision = build_snapshot(db_session, path)
+    assert revision == latest_change_revision(db_session) == 2
+
+    # Changes after the snapshot, made while no index is loaded
+    typeahead_index.reset()
+    tag_index.reset()
+    create_intent(db_session, make_intent("FlightStatus", ["travel"]), service.id)
+    delete_intent(
+        db_session, get_intent_by_uid(db_session, "testservice.com:BookFlight:v1")
+    )
+
+    assert warm_start(db_session, path)
+    loaded = index_state()
+
+    typeahead_index.rebuild(db_session)
+    tag_index.rebuild(db_session)
+    assert loaded == index_state()
+    assert typeahead_index.suggest("hô")["tags"] == [{"name": "hôtel", "count": 1}]
+    assert fuzzy_index.correct("flightstatsu")[0] == [("FlightStatus", 1, 1)]
+    assert fuzzy_index.correct("bookflght")[0] == []
+
+
+def test_changes_are_applied_once(db_session, service, tmp_path, other_process):
+    """Test that replaying the log never applies a change twice."""
+    path = str(tmp_path / "indexes.snap")
+    create_intent(db_session, make_intent("BookFlight", ["travel"]), service.id)
+    build_snapshot(db_session, path)
+    # Snapshots are built apart from the live indexes
+    assert not (typeahead_index.ready or tag_index.ready or fuzzy_index.ready)
+
+    create_intent(db_session, make_intent("BookHotel", ["travel"]), service.id)
+    assert warm_start(db_session, path)
+    loaded = index_state()
+    assert apply_changes_since(db_session, SEARCH_INDEXES, 0) == 2
+    assert index_state() == loaded
+    assert typeahead_index.suggest("tr")["tags"] == [{"name": "travel", "count": 2}]
+
+    create_intent(db_session, make_intent("TrainTimes", ["travel"]), service.id)
+    assert sync_indexes(db_session) == 1
+    assert typeahead_index.suggest("tr")["tags"] == [{"name": "travel", "count": 3}]
+    assert fuzzy_index.correct("traintimse")[0] == [("TrainTimes", 1, 1)]
+
+
+def test_write_snapshot_cleans_up_its_temporary_file(
+    db_session, service, tmp_path, monkeypatch
+):
+    """Test that snapshots are written through a temporary file of their own."""
+    path = str(tmp_path / "indexes.snap")
+    create_intent(db_session, make_intent("BookFlight", ["travel"]), service.id)
+    typeahead, tags = TypeaheadIndex(), TagBitmapIndex()
+    typeahead.rebuild(db_session)
+    tags.rebuild(db_session)
+
+    def fail(src, dst):
+        raise OSError("disk full")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(snapshots.os, "replace", fail)
+        with pytest.raises(OSError):
+            write_snapshot(path, typeahead, tags)
+    assert os.listdir(tmp_path) == []
+
+    write_snapshot(path, typeahead, tags)
+    assert os.listdir(tmp_path) == ["indexes.snap"]
+    assert read_snapshot(path).revision == typeahead.revision
+
+
+def test_read_snapshot_rejects_missing_and_corrupt_files(tmp_path):
+    """Test that unusable snapshots are ignored."""
+    path = tmp_path / "indexes.snap"
+    assert read_snapshot(str(path)) is None
+    path.write_bytes(b"not a snapshot")
+    assert read_snapshot(str(path)) is None
+
+
+def test_prune_changes(db_session, service):
+    """Test that changes contained in a snapshot can be pruned."""
+    create_intent(db_session, make_intent("BookFlight", ["travel"]), service.id)
+    create_intent(db_session, make_intent("BookHotel", ["travel"]), service.id)
+    assert prune_changes(db_session, 1) == 1
+    assert [change.intent_id for change in db_session.query(CatalogChange)] == [2]
+
+
+def test_save_index_snapshot_prunes_saved_changes(
+    db_session, service, monkeypatch, tmp_path
+):
+    """Test that the snapshot task prunes the changes it saved."""
+    path = str(tmp_path / "indexes.snap")
+    monkeypatch.setattr(settings, "INDEX_SNAPSHOT_PATH", path)
+    monkeypatch.setattr(main, "get_sessionmaker", lambda: lambda: db_session)
+    service_id = service.id
+    create_intent(db_session, make_intent("BookFlight", ["travel"]), service.id)
+    create_intent(db_session, make_intent("BookHotel", ["travel"]), service.id)
+    revision = latest_change_revision(db_session)
+
+    main.save_index_snapshot()
+    assert read_snapshot(path).revision == revision
+    assert db_session.query(CatalogChange).count() == 0
+
+    create_intent(db_session, make_intent("BookCar", ["travel"]), service_id)
+    assert latest_change_revision(db_session) == revision + 1
@@ -0,0 +1,133 @@
+# tests/test_startup.py
+
+from unittest.mock import MagicMock
+
+import app.database as database
+import app.main as main
+from app.config import settings
+from app.database import provision_database
+from app.models import Intent, IntentDocument, IntentVersion, Service, intent_terms
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, inspect, text
+from sqlalchemy.orm import Session
+
+
+def test_create_app_does_not_touch_database(monkeypatch):
+    """Test that building the app neither connects nor creates tables."""
+    monkeypatch.setattr(database, "_engine", None)
+    monkeypatch.setattr(database, "_session_factory", None)
+    create_engine_mock = MagicMock(side_effect=AssertionError("engine created"))
+    monkeypatch.setattr(database, "create_engine", create_engine_mock)
+
+    main.create_app()
+
+    create_engine_mock.assert_not_called()
+
+
+def test_provision_database(tmp_path):
+    """Test that provisioning creates the schema and is idempotent."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'provision.db'}")
+    provision_database(engine)
+    provision_database(engine)
+
+    tables = set(inspect(engine).get_table_names())
+    assert {"services", "intents", "tags", "intent_tags"} <= tables
+
+    # Indexes added to a model are created on databases provisioned before
+    with engine.begin() as connection:
+        connection.execute(text("DROP INDEX ix_intents_service_id"))
+    provision_database(engine)
+    indexes = {index["name"] for index in inspect(engine).get_indexes("intents")}
+    assert "ix_intents_service_id" in indexes
+    engine.dispose()
+
+
+def test_provision_database_backfills_read_models(tmp_path):
+    """Test that provisioning fills the read models of existing intents."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'provision.db'}")
+    provision_database(engine)
+    with Session(engine) as db:
+        service = Service(name="testservice.com", service_url="https://testservice.com")
+        db.add(service)
+        db.flush()
+        # Written behind the CRUD layer's back, like rows from before the
+        # read model tables existed
+        db.add(
+            Intent(
+                service_id=service.id,
+                intent_uid="testservice.com:BookFlight:v1",
+                intent_name="BookFlight",
+                description="Books flights",
+                endpoint="https://testservice.com/api/execute/BookFlight",
+            )
+        )
+        db.commit()
+
+    provision_database(engine)
+    with Session(engine) as db:
+        assert db.query(IntentDocument).count() == 1
+        assert db.query(IntentVersion).count() == 1
+        assert db.query(intent_terms).count() > 0
+    engine.dispose()
+
+
+def test_lifespan_auto_provision(monkeypatch):
+    """Test that the lifespan provisions only when configured to."""
+    provision = MagicMock()
+    monkeypatch.setattr(main, "provision_database", provision)
+
+    with TestClient(main.create_app()):
+        pass
+    provision.assert_not_called()
+
+    monkeypatch.setattr(settings, "AUTO_PROVISION", True)
+    with TestClient(main.create_app()):
+        pass
+    provision.assert_called_once()
+
+
+def test_lifespan_loads_index_snapshot(monkeypatch, tmp_path):
+    """Test that the lifespan warm starts the indexes when configured to."""
+    warm_start = MagicMock(return_value=True)
+    monkeypatch.setattr(main, "warm_start", warm_start)
+
+    with TestClient(main.create_app()):
+        pass
+    warm_start.assert_not_called()
+
+    path = str(tmp_path / "indexes.snap")
+    monkeypatch.setattr(settings, "INDEX_SNAPSHOT_PATH", path)
+    with TestClient(main.create_app()):
+        pass
+    assert warm_start.call_args.args[1] == path
+
+
+def test_lifespan_flushes_popularity_on_shutdown(monkeypatch):
+    """Test that counts gathered since the last periodic flush are kept."""
+    flush = MagicMock()
+    monkeypatch.setattr(main, "flush_popularity", flush)
+
+    with TestClient(main.create_app()):
+        flush.assert_not_called()
+    flush.assert_called_once()
+
+    flush.reset_mock()
+    monkeypatch.setattr(settings, "POPULARITY_FLUSH_INTERVAL", 0)
+    with TestClient(main.create_app()):
+        pass
+    flush.assert_not_called()
+
+
+def test_lifespan_writes_pushes_on_shutdown(monkeypatch):
+    """Test that acknowledged pushes still queued are written on shutdown."""
+    flush = MagicMock()
+    monkeypatch.setattr(main, "flush_pushes", flush)
+
+    with TestClient(main.create_app()):
+        pass
+    flush.assert_not_called()
+
+    monkeypatch.setattr(settings, "WEBHOOK_SECRET", "secret")
+    with TestClient(main.create_app()):
+        flush.assert_not_called()
+    flush.assert_called_once()
@@ -0,0 +1,132 @@
+# tests/test_supervisor.py
+
+import asyncio
+import threading
+from unittest.mock import MagicMock
+
+import pytest
+from app import main
+from app.config import settings
+from app.services.supervisor import PeriodicTask, TaskSupervisor
+from app.utils.locks import single_flight
+from fastapi.testclient import TestClient
+
+
+def test_run_once_records_timings():
+    """Test that runs and failures are counted without raising."""
+    func = MagicMock(side_effect=[None, RuntimeError("boom")])
+    task = PeriodicTask("job", func, 1.0)
+
+    assert task.run_once()
+    assert task.run_once()
+
+    stats = task.snapshot()
+    assert stats["runs"] == 2
+    assert stats["failures"] == 1
+    assert stats["last_error"] == "RuntimeError: boom"
+    assert stats["last_ms"] is not None and stats["max_ms"] >= stats["last_ms"]
+    assert stats["last_started_at"] is not None
+
+
+def test_next_delay_is_jittered():
+    """Test that delays stay within the jitter around the interval."""
+    task = PeriodicTask("job", MagicMock(), 10.0, jitter=0.2)
+    delays = {task.next_delay() for _ in range(50)}
+    assert all(8.0 <= delay <= 12.0 for delay in delays)
+    assert len(delays) > 1
+    assert PeriodicTask("job", MagicMock(), 10.0).next_delay() == 10.0
+
+
+def test_single_flight_skips_when_locked(monkeypatch, tmp_path):
+    """Test that a single-flight task is skipped while its lock is held."""
+    monkeypatch.setattr(settings, "CACHE_DIR", str(tmp_path))
+    func = MagicMock()
+    task = PeriodicTask("snapshot", func, 1.0, single_flight=True)
+
+    with single_flight("task:snapshot") as acquired:
+        assert acquired
+        assert not task.run_once()
+    func.assert_not_called()
+    assert task.snapshot()["skipped"] == 1
+
+    assert task.run_once()
+    func.assert_called_once()
+    assert (tmp_path / "task:snapshot.lock").exists()
+
+
+def test_single_flight_is_exclusive_between_threads(monkeypatch):
+    """Test the process-local lock used without a cache directory."""
+    monkeypatch.setattr(settings, "CACHE_DIR", "")
+    holding, release = threading.Event(), threading.Event()
+
+    def hold():
+        with single_flight("job") as acquired:
+            assert acquired
+            holding.set()
+            release.wait(5)
+
+    thread = threading.Thread(target=hold)
+    thread.start()
+    holding.wait(5)
+    with single_flight("job") as acquired:
+        assert not acquired
+    release.set()
+    thread.join()
+    with single_flight("job") as acquired:
+        assert acquired
+
+
+@pytest.mark.asyncio
+async def test_supervisor_runs_tasks_until_stopped():
+    """Test periodic runs, graceful shutdown and the shutdown run."""
+    periodic, flush = MagicMock(), MagicMock()
+    supervisor = TaskSupervisor(shutdown_timeout=1.0)
+    supervisor.add("periodic", periodic, 0.01)
+    supervisor.add("flush", flush, 60.0, run_on_shutdown=True)
+    with pytest.raises(ValueError):
+        supervisor.add("flush", flush, 1.0)
+
+    supervisor.start()
+    await asyncio.sleep(0.1)
+    flush.assert_not_called()
+    await supervisor.stop()
+
+    assert periodic.call_count >= 2
+    calls = periodic.call_count
+    flush.assert_called_once()
+    await asyncio.sleep(0.05)
+    assert periodic.call_count == calls
+    assert supervisor.snapshot()["flush"]["runs"] == 1
+
+
+@pytest.mark.asyncio
+async def test_supervisor_waits_for_running_tasks():
+    """Test that stop lets a running job finish before returning."""
+    started, finished = threading.Event(), threading.Event()
+
+    def slow():
+        started.set()
+        threading.Event().wait(0.1)
+        finished.set()
+
+    supervisor = TaskSupervisor(shutdown_timeout=5.0)
+    supervisor.add("slow", slow, 0.01)
+    supervisor.start()
+    while not started.is_set():
+        await asyncio.sleep(0.005)
+    await supervisor.stop()
+    assert finished.is_set()
+
+
+def test_task_metrics_endpoint(monkeypatch, tmp_path):
+    """Test that the configured tasks are reported by the metrics router."""
+    monkeypatch.setattr(main, "flush_popularity", MagicMock())
+    monkeypatch.setattr(settings, "INDEX_SNAPSHOT_PATH", str(tmp_path / "i.snap"))
+    monkeypatch.setattr(settings, "SNAPSHOT_INTERVAL", 300.0)
+    monkeypatch.setattr(main, "load_index_snapshot", MagicMock())
+
+    with TestClient(main.create_app()) as client:
+        tasks = client.get("/api/metrics/tasks").json()
+    assert set(tasks) == {"popularity_flush", "index_sync", "index_snapshot"}
+    assert tasks["index_snapshot"]["single_flight"]
+    assert tasks["popularity_flush"]["runs"] == 0
@@ -0,0 +1,121 @@
+# tests/test_tag_index.py
+
+import pytest
+from app.crud.changes import latest_change_revision, prune_changes
+from app.crud.intent import create_intent, delete_intent, get_intent_by_uid
+from app.services.tag_index import Bitmap
+from tests.conftest import make_intent
+
+
+@pytest.fixture
+def catalog(db_session, service):
+    """Create intents with overlapping tags."""
+    for name, tags in [
+        ("BookFlight", ["travel", "booking"]),
+        ("BookHotel", ["travel", "booking", "hotel"]),
+        ("FlightStatus", ["travel"]),
+        ("BuyShoes", ["shopping"]),
+    ]:
+        create_intent(db_session, make_intent(name, tags), service.id)
+    return service
+
+
+def names(response):
+    assert response.status_code == 200
+    return [intent["intent_name"] for intent in response.json()]
+
+
+def test_bitmap_set_algebra_across_containers():
+    """Test set operations and paging over IDs in several containers."""
+    a = Bitmap.from_ids([1, 5, 70000, 140000])
+    b = Bitmap.from_ids([5, 70000, 9])
+    assert list(a & b) == [5, 70000]
+    assert list(a | b) == [1, 5, 9, 70000, 140000]
+    assert len(a | b) == 5
+    assert (a | b).page(2, 2) == [9, 70000]
+    assert (a | b).page(4, 10) == [140000]
+
+    a.discard(70000)
+    assert 70000 not in a
+    assert list(a.chunks) == [0, 2]
+
+
+def test_search_tags_all_and_any(client, catalog):
+    """Test AND and OR tag filters served from the index."""
+    search = "/api/intents/search"
+    params = {"tags_all": "travel,booking", "fields": "intent_name"}
+    assert names(client.get(search, params=params)) == ["BookFlight", "BookHotel"]
+    params = {"tags_any": "hotel,shopping", "fields": "intent_name"}
+    assert names(client.get(search, params=params)) == ["BookHotel", "BuyShoes"]
+    params = {"tags_all": "travel", "tags_any": "hotel,shopping", "limit": 5}
+    assert names(client.get(search, params=params)) == ["BookHotel"]
+    params = {"tags_all": "travel", "skip": 1, "limit": 1}
+    assert names(client.get(search, params=params)) == ["BookHotel"]
+    assert names(client.get(search, params={"tags_all": "travel,unknown"})) == []
+
+
+def test_search_tags_follow_crud_changes(client, db_session, catalog):
+    """Test that the index is kept current after it has been built."""
+    params = {"tags_all": "booking"}
+    assert names(client.get("/api/intents/search", params=params)) == [
+        "BookFlight",
+        "BookHotel",
+    ]
+
+    create_intent(db_session, make_intent("BookCar", ["booking"]), catalog.id)
+    delete_intent(
+        db_session, get_intent_by_uid(db_session, "testservice.com:BookFlight:v1")
+    )
+    assert names(client.get("/api/intents/search", params=params)) == [
+        "BookHotel",
+        "BookCar",
+    ]
+
+
+def test_search_tags_catch_up_with_other_processes(
+    client, db_session, catalog, other_process
+):
+    """Test that writes committed by another process reach a built index."""
+    params = {"tags_all": "booking"}
+    assert names(client.get("/api/intents/search", params=params)) == [
+        "BookFlight",
+        "BookHotel",
+    ]
+
+    create_intent(db_session, make_intent("BookCar", ["booking"]), catalog.id)
+    delete_intent(
+        db_session, get_intent_by_uid(db_session, "testservice.com:BookFlight:v1")
+    )
+    assert names(client.get("/api/intents/search", params=params)) == [
+        "BookHotel",
+        "BookCar",
+    ]
+
+
+def test_search_tags_rebuild_after_unapplied_changes_are_pruned(
+    client, db_session, catalog, other_process
+):
+    """Test that an index behind a pruned change log is rebuilt."""
+    params = {"tags_all": "booking"}
+    assert len(names(client.get("/api/intents/search", params=params))) == 2
+
+    create_intent(db_session, make_intent("BookCar", ["booking"]), catalog.id)
+    create_intent(db_session, make_intent("BookTrain", ["booking"]), catalog.id)
+    prune_changes(db_session, latest_change_revision(db_session) - 1)
+    assert names(client.get("/api/intents/search", params=params)) == [
+        "BookFlight",
+        "BookHotel",
+        "BookCar",
+        "BookTrain",
+    ]
+
+
+def test_search_tags_with_other_filters(client, catalog):
+    """Test tag filters combined with column filters, without duplicates."""
+    params = {"intent_name": "Book", "tags": "travel,booking"}
+    assert names(client.get("/api/intents/search", params=params)) == [
+        "BookFlight",
+        "BookHotel",
+    ]
+    params = {"intent_name": "Flight", "tags_all": "travel,booking"}
+    assert names(client.get("/api/intents/search", params=params)) == ["BookFlight"]
@@ -0,0 +1,69 @@
+# tests/test_timing.py
+
+import logging
+
+import pytest
+from app.config import settings
+from app.models import Intent, Service
+from app.utils.timing import route_stats
+
+
+@pytest.fixture
+def setup_data(db_session):
+    """Set up test data in the database."""
+    service = Service(
+        name="testservice.com",
+        description="A test service",
+        service_url="https://testservice.com",
+    )
+    db_session.add(service)
+    db_session.commit()
+    db_session.refresh(service)
+
+    intent = Intent(
+        service_id=service.id,
+        intent_uid="testservice.com:TestIntent:v1",
+        intent_name="TestIntent",
+        description="A test intent",
+        input_parameters=[],
+        output_parameters=[],
+        endpoint="https://testservice.com/api/execute/TestIntent",
+    )
+    db_session.add(intent)
+    db_session.commit()
+
+
+def test_server_timing_header(client, setup_data):
+    """Test that responses report database and serialization time."""
+    response = client.get("/api/intents/testservice.com:TestIntent:v1")
+    assert response.status_code == 200
+    server_timing = response.headers["Server-Timing"]
+    assert server_timing.startswith("db;dur=")
+    assert "ser;dur=" in server_timing
+    assert "total;dur=" in server_timing
+    # The intent lookup and the lazy tag load both hit the database
+    assert '"0 queries"' not in server_timing
+
+
+def test_route_aggregates(client, setup_data):
+    """Test that request timings are aggregated per route template."""
+    route_stats.reset()
+    client.get("/api/intents/testservice.com:TestIntent:v1")
+    client.get("/api/intents/unknown:Intent:v1")
+
+    stats = client.get("/api/metrics/routes").json()
+    route = stats["GET /api/intents/{intent_uid}"]
+    assert route["count"] == 2
+    assert route["avg_queries"] >= 1
+
+
+def test_slow_query_log(client, setup_data, monkeypatch, caplog):
+    """Test that queries above the threshold are logged with parameters."""
+    monkeypatch.setattr(settings, "SLOW_QUERY_THRESHOLD_MS", 0.000001)
+    with caplog.at_level(logging.WARNING, logger="app.slow_query"):
+        client.get("/api/intents/testservice.com:TestIntent:v1")
+
+    messages = [r.getMessage() for r in caplog.records if r.name == "app.slow_query"]
+    assert any(
+        "FROM intents" in m and "testservice.com:TestIntent:v1" in m for m in messages
+    )
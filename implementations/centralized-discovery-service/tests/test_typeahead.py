@@ -0,0 +1,77 @@
+# tests/test_typeahead.py
+
+from app.crud.intent import (
+    create_intent,
+    delete_intent,
+    get_intent_by_uid,
+    upsert_intent,
+)
+from app.services.typeahead import PrefixIndex
+from tests.conftest import make_intent
+
+
+def test_prefix_index_ranks_by_count():
+    """Test prefix lookups, ranking and removal."""
+    index = PrefixIndex()
+    index.load({"SearchProducts": 3, "SearchProperties": 5, "ScheduleViewing": 1})
+    assert index.search("search") == [("SearchProperties", 5), ("SearchProducts", 3)]
+    assert index.search("s", k=1) == [("SearchProperties", 5)]
+
+    index.add("SearchFlights", 10)
+    index.remove("SearchProperties", 5)
+    assert index.search("SEARCH") == [("SearchFlights", 10), ("SearchProducts", 3)]
+    assert index.search("x") == []
+
+
+def test_typeahead_endpoint(client, db_session, service):
+    """Test that the index is built lazily and follows CRUD changes."""
+    create_intent(db_session, make_intent("SearchProducts", ["search"]), service.id)
+    create_intent(
+        db_session, make_intent("SearchProducts", ["search"], version="v2"), service.id
+    )
+    create_intent(db_session, make_intent("SearchProperties", ["seasonal"]), service.id)
+
+    response = client.get("/api/intents/typeahead", params={"prefix": "sea"})
+    assert response.status_code == 200
+    data = response.json()
+    assert data["intents"] == [
+        {"name": "SearchProducts", "count": 2},
+        {"name": "SearchProperties", "count": 1},
+    ]
+    assert data["tags"] == [
+        {"name": "search", "count": 2},
+        {"name": "seasonal", "count": 1},
+    ]
+
+    create_intent(db_session, make_intent("SearchFlights", []), service.id)
+    delete_intent(
+        db_session, get_intent_by_uid(db_session, "testservice.com:SearchProperties:v1")
+    )
+
+    data = client.get("/api/intents/typeahead", params={"prefix": "search"}).json()
+    assert [item["name"] for item in data["intents"]] == [
+        "SearchProducts",
+        "SearchFlights",
+    ]
+
+
+def test_typeahead_catches_up_with_other_processes(
+    client, db_session, service, other_process
+):
+    """Test that writes committed by another process reach a built index."""
+    create_intent(db_session, make_intent("SearchProducts", ["search"]), service.id)
+    data = client.get("/api/intents/typeahead", params={"prefix": "se"}).json()
+    assert data["tags"] == [{"name": "search", "count": 1}]
+
+    create_intent(db_session, make_intent("SearchFlights", ["search"]), service.id)
+    upsert_intent(db_session, make_intent("SearchProducts", ["seasonal"]), service.id)
+
+    data = client.get("/api/intents/typeahead", params={"prefix": "se"}).json()
+    assert [item["name"] for item in data["intents"]] == [
+        "SearchFlights",
+        "SearchProducts",
+    ]
+    assert data["tags"] == [
+        {"name": "search", "count": 1},
+        {"name": "seasonal", "count": 1},
+    ]
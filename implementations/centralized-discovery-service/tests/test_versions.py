@@ -0,0 +1,117 @@
+# tests/test_versions.py
+
+import pytest
+from app.crud.intent import create_intent
+from app.crud.version import backfill_intent_versions
+from app.models import IntentDocument, IntentVersion
+from app.utils.versions import IntentUID, parse_intent_uid, version_range
+from tests.conftest import make_intent
+
+
+@pytest.fixture
+def versions(db_session, service):
+    """Create several versions of one intent, out of order."""
+    for version in ("v1", "v1.2.1", "v2.0.0-beta", "v1.10", "v2", "v0.9"):
+        create_intent(
+            db_session,
+            make_intent("SearchProperty", version=version),
+            service.id,
+        )
+
+
+def test_parse_intent_uid():
+    """Test splitting UIDs into namespace, name and version."""
+    assert parse_intent_uid("testservice.com:searchProperty:v1") == IntentUID(
+        "testservice.com", "searchProperty", (1, 0, 0)
+    )
+    assert parse_intent_uid("a:b:c:V1.2.3") == IntentUID("a:b", "c", (1, 2, 3))
+    assert parse_intent_uid("a:b:latest") is None
+    assert parse_intent_uid("a:v1") is None
+
+
+@pytest.mark.parametrize(
+    "constraint, expected",
+    [
+        (None, (None, None)),
+        ("*", (None, None)),
+        ("1.2", ((1, 2, 0), (1, 3, 0))),
+        ("=v1.2.3", ((1, 2, 3), (1, 2, 4))),
+        ("^1.2", ((1, 2, 0), (2, 0, 0))),
+        ("^0.2.3", ((0, 2, 3), (0, 3, 0))),
+        ("^0.0.3", ((0, 0, 3), (0, 0, 4))),
+        ("~1.2.3", ((1, 2, 3), (1, 3, 0))),
+        ("~1", ((1, 0, 0), (2, 0, 0))),
+        (">= 1.0, <2", ((1, 0, 0), (2, 0, 0))),
+        (">1.2 <=1.5", ((1, 3, 0), (1, 6, 0))),
+    ],
+)
+def test_version_range(constraint, expected):
+    """Test translating semver constraints into version bounds."""
+    assert version_range(constraint) == expected
+
+
+@pytest.mark.parametrize("constraint", [">=", "~>1", "1.x", "latest"])
+def test_version_range_rejects_invalid_constraints(constraint):
+    with pytest.raises(ValueError):
+        version_range(constraint)
+
+
+@pytest.mark.parametrize(
+    "version, expected",
+    [
+        (None, "v2"),
+        ("^1", "v1.10"),
+        ("~1.2", "v1.2.1"),
+        ("<1", "v0.9"),
+        ("1.0", "v1"),
+    ],
+)
+def test_resolve_endpoint(client, versions, version, expected):
+    """Test resolving the latest or a constrained version."""
+    params = {"namespace": "testservice.com", "name": "SearchProperty"}
+    if version is not None:
+        params["version"] = version
+    response = client.get("/api/intents/resolve", params=params)
+    assert response.status_code == 200
+    assert response.json()["intent_uid"] == f"testservice.com:SearchProperty:{expected}"
+
+
+def test_resolve_endpoint_errors(client, versions):
+    """Test unknown intents, unmatched ranges and invalid constraints."""
+    params = {"namespace": "testservice.com", "name": "SearchProperty"}
+    assert (
+        client.get(
+            "/api/intents/resolve", params={**params, "version": "^3"}
+        ).status_code
+        == 404
+    )
+    assert (
+        client.get(
+            "/api/intents/resolve", params={**params, "name": "BookViewing"}
+        ).status_code
+        == 404
+    )
+    assert (
+        client.get(
+            "/api/intents/resolve", params={**params, "version": "~>1"}
+        ).status_code
+        == 422
+    )
+
+
+def test_resolve_without_document(client, db_session, versions):
+    """Test that intents without a rendered document are still resolved."""
+    db_session.query(IntentDocument).delete()
+    response = client.get(
+        "/api/intents/resolve",
+        params={"namespace": "testservice.com", "name": "SearchProperty"},
+    )
+    assert response.json()["intent_uid"] == "testservice.com:SearchProperty:v2"
+
+
+def test_backfill_intent_versions(db_session, versions):
+    """Test that the backfill parses the UIDs of existing intents once."""
+    db_session.query(IntentVersion).delete()
+    # "v2.0.0-beta" does not follow the convention
+    assert backfill_intent_versions(db_session, batch_size=2) == 5
+    assert backfill_intent_versions(db_session) == 0